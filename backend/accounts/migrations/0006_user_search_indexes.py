@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:00
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_hospital_name_user_representative_contact_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-date_joined', '-id'], name='accounts_us_date_jo_d23fc9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Concat('email', models.Value(' '), 'first_name', models.Value(' '), 'last_name'), name='gin_trgm_ops'), name='accounts_user_search_trgm'),
+        ),
+    ]
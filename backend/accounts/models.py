@@ -3,10 +3,18 @@ Models for the accounts app.
 """
 
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.utils.translation import gettext_lazy as _
 
 
+def user_search_text():
+    """Email and name as one string; indexed with trigrams for admin user search."""
+    return Concat('email', Value(' '), 'first_name', Value(' '), 'last_name')
+
+
 class UserManager(BaseUserManager):
     """Custom manager for the User model."""
     
@@ -54,5 +62,11 @@ class User(AbstractUser):
     
     objects = UserManager()
     
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['-date_joined', '-id']),
+            GinIndex(OpClass(user_search_text(), name='gin_trgm_ops'), name='accounts_user_search_trgm'),
+        ]
+    
     def __str__(self):
         return self.email 
\ No newline at end of file
@@ -20,9 +20,9 @@ from .serializers import (
     EmailVerificationSerializer,
     LoginSerializer,
 )
-from profiles.models import CandidateProfile, RecruiterProfile, Hospital
+from profiles.models import CandidateProfile, RecruiterProfile
 from profiles.serializers import CandidateProfileSerializer
-from jobs.models import Job, JobApplication
+from admin_api.stats import get_rollup
 
 User = get_user_model()
 
@@ -232,17 +232,14 @@ class PublicStatisticsView(APIView):
     def get(self, request):
         """Return public statistics for display on home page"""
         try:
-            # Get basic counts (public information)
-            total_candidates = CandidateProfile.objects.filter(verification_status='verified').count()
-            total_hospitals = Hospital.objects.filter(verification_status='verified').count()
-            total_jobs = Job.objects.filter(is_active=True).count()
-            total_applications = JobApplication.objects.count()
+            # Served from the same rollup as the admin dashboard
+            stats = get_rollup('platform')['data']
             
             return Response({
-                'total_candidates': total_candidates,
-                'total_hospitals': total_hospitals,
-                'total_jobs': total_jobs,
-                'total_applications': total_applications,
+                'total_candidates': stats['candidates']['verified'],
+                'total_hospitals': stats['hospitals']['verified'],
+                'total_jobs': stats['jobs']['active'],
+                'total_applications': stats['applications']['total'],
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
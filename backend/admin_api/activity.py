@@ -0,0 +1,43 @@
+"""
+Activity event log for the admin dashboard.
+"""
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import ActivityEvent
+
+
+# Events older than this are pruned by admin_api.tasks.prune_activity_events
+ACTIVITY_RETENTION_DAYS = 90
+
+
+def record_activity(event_type, description, actor=None, hospital_id=None, **metadata):
+    """Append one event to the activity log."""
+    return ActivityEvent.objects.create(
+        event_type=event_type,
+        description=description[:500],
+        actor=actor,
+        hospital_id=hospital_id,
+        metadata=metadata,
+    )
+
+
+def prune_activity(days=ACTIVITY_RETENTION_DAYS, batch_size=5000):
+    """
+    Delete events older than ``days`` in batches, oldest first.
+
+    Returns the number of events deleted.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while True:
+        ids = list(
+            ActivityEvent.objects.filter(created_at__lt=cutoff)
+            .order_by('created_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += ActivityEvent.objects.filter(id__in=ids).delete()[0]
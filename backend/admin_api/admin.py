@@ -1,3 +1,9 @@
 from django.contrib import admin
+from .models import ActivityEvent
 
-# Register your models here.
+
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(admin.ModelAdmin):
+    list_display = ('event_type', 'description', 'hospital', 'actor', 'created_at')
+    list_filter = ('event_type', 'created_at')
+    search_fields = ('description',)
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('profiles', '0008_candidatequotausage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('job_application', 'Job Application'), ('candidate_verified', 'Candidate Verified'), ('candidate_rejected', 'Candidate Rejected'), ('hospital_verified', 'Hospital Verified'), ('hospital_rejected', 'Hospital Rejected'), ('job_posted', 'New Job Posted'), ('hire', 'Candidate Hired')], max_length=30)),
+                ('description', models.CharField(max_length=500)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_events', to=settings.AUTH_USER_MODEL)),
+                ('hospital', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_events', to='profiles.hospital')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='admin_api_a_created_783ec3_idx'), models.Index(fields=['hospital', '-created_at', '-id'], name='admin_api_a_hospita_d9e7c5_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,55 @@
+"""
+Models for the admin API app.
+"""
+
+from django.conf import settings
 from django.db import models
+from profiles.models import Hospital
+
 
-# Create your models here.
+class ActivityEvent(models.Model):
+    """
+    Append-only log of platform activity shown on the admin dashboard.
+    
+    Events are written when the activity happens (see admin_api.signals) with
+    the description already rendered, so the feed is a single indexed range
+    scan over created_at. Old events are removed by prune_activity_events.
+    """
+    
+    EVENT_TYPES = (
+        ('job_application', 'Job Application'),
+        ('candidate_verified', 'Candidate Verified'),
+        ('candidate_rejected', 'Candidate Rejected'),
+        ('hospital_verified', 'Hospital Verified'),
+        ('hospital_rejected', 'Hospital Rejected'),
+        ('job_posted', 'New Job Posted'),
+        ('hire', 'Candidate Hired'),
+    )
+    
+    event_type = models.CharField(max_length=30, choices=EVENT_TYPES)
+    description = models.CharField(max_length=500)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activity_events'
+    )
+    hospital = models.ForeignKey(
+        Hospital,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activity_events'
+    )
+    metadata = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['hospital', '-created_at', '-id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_event_type_display()}: {self.description}"
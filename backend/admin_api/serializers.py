@@ -0,0 +1,34 @@
+"""
+Serializers for the admin API app.
+"""
+
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+from .models import ActivityEvent
+
+User = get_user_model()
+
+
+class ActivityEventSerializer(serializers.ModelSerializer):
+    """Serializer for dashboard activity events."""
+    
+    action = serializers.CharField(source='get_event_type_display', read_only=True)
+    timestamp = serializers.DateTimeField(source='created_at', read_only=True)
+    
+    class Meta:
+        model = ActivityEvent
+        fields = ['id', 'event_type', 'action', 'description', 'hospital', 'timestamp', 'metadata']
+
+
+class AdminUserSerializer(serializers.ModelSerializer):
+    """Serializer for the admin user listing."""
+    
+    verification_status = serializers.CharField(read_only=True, allow_null=True)
+    
+    class Meta:
+        model = User
+        fields = [
+            'id', 'email', 'first_name', 'last_name', 'is_active',
+            'is_candidate', 'is_recruiter', 'is_staff', 'is_superuser',
+            'date_joined', 'last_login', 'verification_status',
+        ]
@@ -0,0 +1,160 @@
+"""
+Signal handlers for the admin API app.
+
+Writes never recompute statistics; they only mark the affected rollups
+stale so the next dashboard read refreshes them in the background. They
+also append dashboard activity events as things happen.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from employee_management.models import Employment
+from profiles.models import (
+    CandidateProfile, CandidateVerification, Hospital, HospitalVerification, RecruiterProfile
+)
+from jobs.models import Job, JobApplication
+from .activity import record_activity
+from .stats import mark_rollup_stale
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=CandidateProfile)
+@receiver(post_delete, sender=CandidateProfile)
+@receiver(post_save, sender=Hospital)
+@receiver(post_delete, sender=Hospital)
+@receiver(post_save, sender=HospitalVerification)
+@receiver(post_delete, sender=HospitalVerification)
+def nudge_platform_stats(sender, **kwargs):
+    mark_rollup_stale('platform')
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def nudge_job_stats(sender, instance, **kwargs):
+    mark_rollup_stale('platform')
+    mark_rollup_stale('recruiter', instance.employer_id)
+
+
+@receiver(post_save, sender=JobApplication)
+@receiver(post_delete, sender=JobApplication)
+def nudge_application_stats(sender, instance, created=True, **kwargs):
+    # Status changes do not affect any count
+    if not created:
+        return
+    mark_rollup_stale('platform')
+    mark_rollup_stale('recruiter', instance.job.employer_id)
+
+
+@receiver(post_save, sender=Employment)
+@receiver(post_delete, sender=Employment)
+def nudge_employee_stats(sender, instance, **kwargs):
+    for employer_id in RecruiterProfile.objects.filter(hospital_id=instance.hospital_id).values_list('pk', flat=True):
+        mark_rollup_stale('recruiter', employer_id)
+
+
+def _remember_previous_status(instance, field, update_fields=None):
+    """Stash the stored value of ``field`` so post_save can detect a transition."""
+    if update_fields is not None and field not in update_fields:
+        instance._previous_status = getattr(instance, field)
+        return
+    previous = None
+    if instance.pk:
+        previous = type(instance).objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+    instance._previous_status = previous
+
+
+def _status_changed_to(instance, field, values):
+    current = getattr(instance, field)
+    return current in values and getattr(instance, '_previous_status', None) != current
+
+
+@receiver(pre_save, sender=CandidateProfile)
+def remember_candidate_status(sender, instance, update_fields=None, **kwargs):
+    _remember_previous_status(instance, 'verification_status', update_fields)
+
+
+@receiver(pre_save, sender=CandidateVerification)
+@receiver(pre_save, sender=HospitalVerification)
+def remember_verification_status(sender, instance, update_fields=None, **kwargs):
+    _remember_previous_status(instance, 'status', update_fields)
+
+
+@receiver(post_save, sender=CandidateProfile)
+def log_candidate_verification(sender, instance, **kwargs):
+    if _status_changed_to(instance, 'verification_status', ('verified', 'rejected')):
+        record_activity(
+            f'candidate_{instance.verification_status}',
+            f"{instance.full_name}'s verification was {instance.verification_status}",
+            actor=instance.verified_by,
+            candidate_id=instance.pk,
+        )
+
+
+@receiver(post_save, sender=CandidateVerification)
+def log_candidate_document_review(sender, instance, **kwargs):
+    if _status_changed_to(instance, 'status', ('approved', 'rejected')):
+        outcome = 'verified' if instance.status == 'approved' else 'rejected'
+        record_activity(
+            f'candidate_{outcome}',
+            f"{instance.candidate.full_name}'s verification was {outcome}",
+            actor=instance.reviewed_by,
+            candidate_id=instance.candidate_id,
+        )
+
+
+@receiver(post_save, sender=HospitalVerification)
+def log_hospital_verification(sender, instance, **kwargs):
+    if _status_changed_to(instance, 'status', ('approved', 'rejected')):
+        outcome = 'verified' if instance.status == 'approved' else 'rejected'
+        record_activity(
+            f'hospital_{outcome}',
+            f"{instance.official_name}'s verification was {outcome}",
+            actor=instance.reviewed_by,
+            hospital_id=instance.hospital_id,
+        )
+
+
+@receiver(post_save, sender=Job)
+def log_job_posted(sender, instance, created, **kwargs):
+    if not created:
+        return
+    employer = instance.employer
+    record_activity(
+        'job_posted',
+        f"{employer.user.get_full_name() or 'A recruiter'} posted a new {instance.title} position",
+        actor=employer.user,
+        hospital_id=employer.hospital_id,
+        job_id=instance.pk,
+    )
+
+
+@receiver(post_save, sender=JobApplication)
+def log_job_application(sender, instance, created, **kwargs):
+    if not created:
+        return
+    job = instance.job
+    record_activity(
+        'job_application',
+        f"{instance.profile.full_name} applied for {job.title}",
+        actor=instance.profile.user,
+        hospital_id=job.employer.hospital_id,
+        job_id=job.pk,
+        application_id=instance.pk,
+    )
+
+
+@receiver(post_save, sender=Employment)
+def log_hire(sender, instance, created, **kwargs):
+    if not created:
+        return
+    record_activity(
+        'hire',
+        f"{instance.employee.full_name} was hired as {instance.job_title} at {instance.hospital.name}",
+        actor=instance.employer.user,
+        hospital_id=instance.hospital_id,
+        employment_id=instance.pk,
+    )
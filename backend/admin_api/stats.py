@@ -0,0 +1,128 @@
+"""
+Dashboard statistics for the admin API app.
+
+Each model's breakdown is computed with a single conditional-aggregation
+query. Results are kept in a rollup cache with stale-while-revalidate
+semantics: readers always get the cached rollup immediately, and a stale
+rollup is recomputed in the background by a Celery task. Writes only mark
+rollups stale (see admin_api.signals); the periodic task in
+carechain.celery keeps the platform rollup warm.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from profiles.models import CandidateProfile, Hospital, RecruiterProfile
+from jobs.models import Job, JobApplication
+
+
+# How long a rollup is served without triggering a refresh
+ROLLUP_FRESH_SECONDS = 5 * 60
+# How long a stale rollup may still be served while it is being refreshed
+ROLLUP_MAX_AGE_SECONDS = 24 * 60 * 60
+# Only one background refresh per rollup is queued at a time
+ROLLUP_REFRESH_LOCK_SECONDS = 60
+
+
+def _status_counts(field, statuses):
+    return {
+        label: Count('id', filter=Q(**{field: value}))
+        for label, value in statuses
+    }
+
+
+def compute_platform_stats():
+    """Site-wide counts: one aggregate query per model."""
+    User = get_user_model()
+
+    users = User.objects.aggregate(total=Count('id'))
+    candidates = CandidateProfile.objects.aggregate(
+        total=Count('id'),
+        **_status_counts('verification_status', [
+            ('pending', 'pending'), ('verified', 'verified'), ('rejected', 'rejected'),
+        ])
+    )
+    # Hospitals that have not submitted verification details yet count as pending
+    hospitals = Hospital.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(verification_record__isnull=True) | Q(verification_record__status='pending')),
+        verified=Count('id', filter=Q(verification_record__status='approved')),
+        rejected=Count('id', filter=Q(verification_record__status='rejected')),
+    )
+    jobs = Job.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    applications = JobApplication.objects.aggregate(total=Count('id'))
+
+    return {
+        'users': users,
+        'candidates': candidates,
+        'hospitals': hospitals,
+        'jobs': jobs,
+        'applications': applications,
+    }
+
+
+def compute_recruiter_stats(employer_id):
+    """Counts for one recruiter's hospital dashboard."""
+    from employee_management.models import Employment
+
+    jobs = Job.objects.filter(employer_id=employer_id).aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    applications = JobApplication.objects.filter(job__employer_id=employer_id).aggregate(total=Count('id'))
+    hospital_id = RecruiterProfile.objects.filter(pk=employer_id).values_list('hospital_id', flat=True).first()
+    employees = Employment.objects.filter(hospital_id=hospital_id, status='active').count() if hospital_id else 0
+
+    return {
+        'jobs': jobs,
+        'applications': applications,
+        'employees': employees,
+    }
+
+
+ROLLUPS = {
+    'platform': compute_platform_stats,
+    'recruiter': compute_recruiter_stats,
+}
+
+
+def rollup_key(name, *args):
+    return ':'.join(['admin:stats', name, *map(str, args)])
+
+
+def refresh_rollup(name, *args):
+    """Recompute a rollup now and store it."""
+    rollup = {'data': ROLLUPS[name](*args), 'computed_at': timezone.now().isoformat()}
+    key = rollup_key(name, *args)
+    cache.set(key, rollup, ROLLUP_MAX_AGE_SECONDS)
+    cache.set(f'{key}:fresh', True, ROLLUP_FRESH_SECONDS)
+    cache.delete(f'{key}:lock')
+    return rollup
+
+
+def get_rollup(name, *args):
+    """
+    Return ``{'data': ..., 'computed_at': ...}`` for a rollup.
+
+    A missing rollup is computed inline; a stale one is returned as is and
+    refreshed in the background.
+    """
+    key = rollup_key(name, *args)
+    rollup = cache.get(key)
+    if rollup is None:
+        return refresh_rollup(name, *args)
+
+    if not cache.get(f'{key}:fresh') and cache.add(f'{key}:lock', True, ROLLUP_REFRESH_LOCK_SECONDS):
+        from .tasks import refresh_stats_rollup
+        refresh_stats_rollup.delay(name, *args)
+    return rollup
+
+
+def mark_rollup_stale(name, *args):
+    """Make the next read of a rollup trigger a background refresh."""
+    cache.delete(f'{rollup_key(name, *args)}:fresh')
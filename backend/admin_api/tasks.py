@@ -0,0 +1,25 @@
+"""
+Celery tasks for the admin API app.
+"""
+
+from celery import shared_task
+
+
+@shared_task
+def refresh_stats_rollup(name='platform', *args):
+    """Recompute a dashboard statistics rollup."""
+    from .stats import refresh_rollup
+    
+    refresh_rollup(name, *args)
+    
+    return f"Refreshed {name} stats rollup"
+
+
+@shared_task
+def prune_activity_events():
+    """Drop activity events older than the retention window."""
+    from .activity import prune_activity, ACTIVITY_RETENTION_DAYS
+    
+    deleted = prune_activity()
+    
+    return f"Pruned {deleted} activity events older than {ACTIVITY_RETENTION_DAYS} days"
@@ -1,12 +1,21 @@
+import csv
+import itertools
+import json
 from django.shortcuts import render
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q
-from profiles.models import CandidateProfile, Hospital
-from jobs.models import Job, JobApplication
+from django.db.models import Count, Q, F
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from accounts.models import user_search_text
+from carechain.pagination import KeysetPaginationMixin, DateJoinedCursorPagination
+from .models import ActivityEvent
+from .serializers import ActivityEventSerializer, AdminUserSerializer
+from .stats import get_rollup
 
 User = get_user_model()
 
@@ -25,113 +34,86 @@ class DashboardStatsView(APIView):
     permission_classes = [IsAdminUser]
     
     def get(self, request):
-        # Get basic counts
-        total_users = User.objects.count()
-        pending_candidate_verifications = CandidateProfile.objects.filter(verification_status='pending').count()
-        pending_hospital_verifications = Hospital.objects.filter(verification_status='pending').count()
-        active_jobs = Job.objects.filter(is_active=True).count()
-        total_applications = JobApplication.objects.count()
-        
-        # Get verification stats
-        candidate_verification = {
-            'pending': CandidateProfile.objects.filter(verification_status='pending').count(),
-            'verified': CandidateProfile.objects.filter(verification_status='verified').count(),
-            'rejected': CandidateProfile.objects.filter(verification_status='rejected').count(),
-        }
-        
-        hospital_verification = {
-            'pending': Hospital.objects.filter(verification_status='pending').count(),
-            'verified': Hospital.objects.filter(verification_status='verified').count(),
-            'rejected': Hospital.objects.filter(verification_status='rejected').count(),
-        }
+        rollup = get_rollup('platform')
+        stats = rollup['data']
+        candidates = stats['candidates']
+        hospitals = stats['hospitals']
         
         return Response({
-            'total_users': total_users,
-            'pending_verifications': pending_candidate_verifications + pending_hospital_verifications,
-            'active_jobs': active_jobs,
-            'total_applications': total_applications,
-            'candidate_verification': candidate_verification,
-            'hospital_verification': hospital_verification,
+            'total_users': stats['users']['total'],
+            'pending_verifications': candidates['pending'] + hospitals['pending'],
+            'active_jobs': stats['jobs']['active'],
+            'total_applications': stats['applications']['total'],
+            'candidate_verification': {
+                'pending': candidates['pending'],
+                'verified': candidates['verified'],
+                'rejected': candidates['rejected'],
+            },
+            'hospital_verification': {
+                'pending': hospitals['pending'],
+                'verified': hospitals['verified'],
+                'rejected': hospitals['rejected'],
+            },
+            'computed_at': rollup['computed_at'],
         })
 
 
-class RecentActivityView(APIView):
+class RecentActivityView(KeysetPaginationMixin, generics.ListAPIView):
     """
     View to get recent activity for the admin dashboard
     """
     permission_classes = [IsAdminUser]
+    serializer_class = ActivityEventSerializer
+    # A plain list of the latest events unless cursor pagination is requested
+    pagination_class = None
+    recent_limit = 20
     
-    def get(self, request):
-        # Get recent activity (last 20)
-        recent_activity = []
-        
-        # Get recent job applications
-        recent_applications = JobApplication.objects.order_by('-created_at')[:5]
-        for app in recent_applications:
-            recent_activity.append({
-                'action': 'Job Application',
-                'description': f'{app.candidate.user.get_full_name()} applied for {app.job.title}',
-                'timestamp': app.created_at,
-            })
-        
-        # Get recent candidate verifications
-        recent_candidate_verifications = CandidateProfile.objects.filter(
-            verification_status__in=['verified', 'rejected'],
-            verification_date__isnull=False
-        ).order_by('-verification_date')[:5]
-        
-        for profile in recent_candidate_verifications:
-            action = 'Candidate Verified' if profile.verification_status == 'verified' else 'Candidate Rejected'
-            recent_activity.append({
-                'action': action,
-                'description': f"{profile.user.get_full_name()}'s verification was {profile.verification_status}",
-                'timestamp': profile.verification_date,
-            })
-        
-        # Get recent hospital verifications
-        recent_hospital_verifications = Hospital.objects.filter(
-            verification_status__in=['verified', 'rejected'],
-            verification_date__isnull=False
-        ).order_by('-verification_date')[:5]
-        
-        for hospital in recent_hospital_verifications:
-            action = 'Hospital Verified' if hospital.verification_status == 'verified' else 'Hospital Rejected'
-            recent_activity.append({
-                'action': action,
-                'description': f"{hospital.name}'s verification was {hospital.verification_status}",
-                'timestamp': hospital.verification_date,
-            })
-        
-        # Get recent jobs posted
-        recent_jobs = Job.objects.order_by('-created_at')[:5]
-        for job in recent_jobs:
-            recent_activity.append({
-                'action': 'New Job Posted',
-                'description': f"{job.employer.name if hasattr(job, 'employer') and job.employer else 'A recruiter'} posted a new {job.title} position",
-                'timestamp': job.created_at,
-            })
-        
-        # Sort by timestamp
-        recent_activity.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        # Take only the most recent 20
-        recent_activity = recent_activity[:20]
-        
-        return Response(recent_activity)
+    def get_queryset(self):
+        queryset = ActivityEvent.objects.order_by('-created_at', '-id')
+        
+        hospital = self.request.query_params.get('hospital')
+        if hospital:
+            if not hospital.isdigit():
+                raise ValidationError({"error": "hospital must be a numeric id"})
+            queryset = queryset.filter(hospital_id=int(hospital))
+        
+        event_type = self.request.query_params.get('event_type')
+        if event_type:
+            queryset = queryset.filter(event_type=event_type)
+        
+        if not self.use_cursor_pagination():
+            queryset = queryset[:self.recent_limit]
+        return queryset
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv rows."""
+    
+    def write(self, value):
+        return value
 
 
 class UserManagementView(generics.ListAPIView):
     """
     View to list and manage users
+    
+    Pages are keyset-paginated by sign-up date. Pass ``?export=csv`` or
+    ``?export=ndjson`` to stream every matching user instead.
     """
     permission_classes = [IsAdminUser]
+    serializer_class = AdminUserSerializer
+    pagination_class = DateJoinedCursorPagination
+    export_chunk_size = 2000
     
-    def get(self, request):
+    def get_queryset(self):
         # Get query parameters for filtering
-        role = request.query_params.get('role', None)
-        search = request.query_params.get('search', None)
+        role = self.request.query_params.get('role', None)
+        search = self.request.query_params.get('search', None)
         
-        users = User.objects.all()
+        # One LEFT JOIN instead of a profile query per candidate
+        users = User.objects.annotate(
+            verification_status=F('candidate_profile__verification_status')
+        )
         
         # Apply filters
         if role:
@@ -143,37 +125,43 @@ class UserManagementView(generics.ListAPIView):
                 users = users.filter(Q(is_staff=True) | Q(is_superuser=True))
         
         if search:
-            users = users.filter(
-                Q(email__icontains=search) | 
-                Q(first_name__icontains=search) | 
-                Q(last_name__icontains=search)
+            # Served by the trigram index on email and name
+            users = users.alias(search_text=user_search_text()).filter(
+                search_text__trigram_word_similar=search
             )
         
-        # Build the response
-        user_data = []
-        for user in users:
-            user_info = {
-                'id': user.id,
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'is_active': user.is_active,
-                'is_candidate': getattr(user, 'is_candidate', False),
-                'is_recruiter': getattr(user, 'is_recruiter', False),
-                'is_staff': user.is_staff,
-                'is_superuser': user.is_superuser,
-                'date_joined': user.date_joined,
-                'last_login': user.last_login,
-            }
-            
-            # Add profile info if candidate
-            if getattr(user, 'is_candidate', False):
-                try:
-                    profile = CandidateProfile.objects.get(user=user)
-                    user_info['verification_status'] = profile.verification_status
-                except CandidateProfile.DoesNotExist:
-                    user_info['verification_status'] = None
-            
-            user_data.append(user_info)
-        
-        return Response(user_data)
+        return users
+    
+    def list(self, request, *args, **kwargs):
+        export = request.query_params.get('export')
+        if export == 'csv':
+            return self.stream_csv()
+        if export == 'ndjson':
+            return self.stream_ndjson()
+        if export:
+            return Response(
+                {"error": "export must be 'csv' or 'ndjson'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return super().list(request, *args, **kwargs)
+    
+    def export_rows(self):
+        fields = AdminUserSerializer.Meta.fields
+        queryset = self.get_queryset().order_by('-date_joined', '-id').values(*fields)
+        return fields, queryset.iterator(chunk_size=self.export_chunk_size)
+    
+    def stream_csv(self):
+        fields, rows = self.export_rows()
+        writer = csv.writer(_Echo())
+        lines = itertools.chain(
+            [writer.writerow(fields)],
+            (writer.writerow([row[field] for field in fields]) for row in rows)
+        )
+        response = StreamingHttpResponse(lines, content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="users.csv"'
+        return response
+    
+    def stream_ndjson(self):
+        _, rows = self.export_rows()
+        lines = (json.dumps(row, cls=DjangoJSONEncoder) + '\n' for row in rows)
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
@@ -0,0 +1,153 @@
+"""
+Bulk attendance ingestion.
+
+A hospital's upload is validated row by row without touching the
+database, then checked against the database in a few set lookups: one for
+the referenced profiles, one for the jobs the uploader may record
+attendance for, and one for the records that already exist. Valid rows
+are written with a single ``bulk_create`` on the (profile, job, date)
+unique key, and the summary deltas for the whole upload are applied once
+in the same transaction.
+"""
+
+from django.db import transaction
+
+from profiles.models import CandidateProfile
+from .models import Attendance
+from .parsers import read_csv_rows
+from .serializers import AttendanceBulkRowSerializer
+from .summaries import apply_summary_deltas, new_deltas, record_delta
+
+
+BULK_MAX_ROWS = 5000
+
+UPDATE_FIELDS = ['status', 'check_in_time', 'check_out_time', 'reason']
+
+
+def _valid_ids(queryset, ids):
+    return set(queryset.filter(id__in=ids).values_list('id', flat=True))
+
+
+def ingest_attendance(rows, jobs, update_existing=False):
+    """
+    Validate and insert attendance ``rows`` (a list of dicts).
+
+    ``jobs`` is the Job queryset the uploader may record attendance for.
+    Rows for a (profile, job, date) that already has a record are skipped,
+    or overwritten when ``update_existing`` is set.
+
+    Returns ``{'created', 'updated', 'skipped', 'errors'}`` where ``errors``
+    lists ``{'row': index, 'errors': ...}`` for each rejected row; indexes
+    count from 1 in upload order.
+    """
+    errors = []
+    valid = {}
+    for index, row in enumerate(rows, start=1):
+        serializer = AttendanceBulkRowSerializer(data=row)
+        if not serializer.is_valid():
+            errors.append({'row': index, 'errors': serializer.errors})
+            continue
+        data = serializer.validated_data
+        key = (data['profile'], data['job'], data['date'])
+        if key in valid:
+            errors.append({'row': index, 'errors': {'non_field_errors': [
+                f"Duplicate of row {valid[key][0]} for the same profile, job and date."
+            ]}})
+            continue
+        valid[key] = (index, data)
+
+    profile_ids = _valid_ids(CandidateProfile.objects.all(), {key[0] for key in valid})
+    job_ids = _valid_ids(jobs, {key[1] for key in valid})
+    records = {}
+    for key, (index, data) in valid.items():
+        row_errors = {}
+        if data['profile'] not in profile_ids:
+            row_errors['profile'] = ["Candidate profile does not exist."]
+        if data['job'] not in job_ids:
+            row_errors['job'] = ["Job does not exist or is not one of yours."]
+        if row_errors:
+            errors.append({'row': index, 'errors': row_errors})
+            continue
+        records[key] = Attendance(
+            profile_id=data['profile'],
+            job_id=data['job'],
+            date=data['date'],
+            status=data['status'],
+            check_in_time=data.get('check_in_time'),
+            check_out_time=data.get('check_out_time'),
+            reason=data.get('reason'),
+        )
+    errors.sort(key=lambda error: error['row'])
+
+    report = {'created': 0, 'updated': 0, 'skipped': 0, 'errors': errors}
+    if not records:
+        return report
+
+    with transaction.atomic():
+        # Lock the rows this upload collides with so their status cannot
+        # change under the summary deltas computed from it
+        existing = {
+            (profile_id, job_id, date): status
+            for profile_id, job_id, date, status in Attendance.objects.select_for_update().filter(
+                profile_id__in={key[0] for key in records},
+                job_id__in={key[1] for key in records},
+                date__in={key[2] for key in records},
+            ).values_list('profile_id', 'job_id', 'date', 'status')
+            if (profile_id, job_id, date) in records
+        }
+
+        deltas = new_deltas()
+        if update_existing:
+            to_write = list(records.values())
+            for key, status in existing.items():
+                record_delta(deltas, *key, status, sign=-1)
+        else:
+            to_write = [record for key, record in records.items() if key not in existing]
+        for record in to_write:
+            record_delta(deltas, record.profile_id, record.job_id, record.date, record.status, sign=1)
+
+        if update_existing:
+            Attendance.objects.bulk_create(
+                to_write,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['profile', 'job', 'date'],
+                update_fields=UPDATE_FIELDS,
+            )
+        else:
+            # A record inserted concurrently since the lookup above is left
+            # alone; verify_attendance_summaries reports the rare drift
+            Attendance.objects.bulk_create(to_write, batch_size=1000, ignore_conflicts=True)
+        apply_summary_deltas(deltas)
+
+    report['created'] = len(records) - len(existing)
+    report['updated'] = len(existing) if update_existing else 0
+    report['skipped'] = 0 if update_existing else len(existing)
+    return report
+
+
+def rows_from_request(request):
+    """
+    Return the upload's rows from a JSON array (bare or under ``records``),
+    a ``text/csv`` body, or a CSV file uploaded as ``file``.
+
+    Raises ValueError describing what is wrong with the upload as a whole.
+    """
+    data = request.data
+    upload = data.get('file') if hasattr(data, 'get') else None
+    if upload is not None and hasattr(upload, 'read'):
+        rows = read_csv_rows(upload)
+    elif isinstance(data, list):
+        rows = data
+    elif hasattr(data, 'get') and isinstance(data.get('records'), list):
+        rows = data['records']
+    else:
+        raise ValueError("Send a JSON array of records, CSV text or a CSV file.")
+
+    if not rows:
+        raise ValueError("No records to import.")
+    if len(rows) > BULK_MAX_ROWS:
+        raise ValueError(f"At most {BULK_MAX_ROWS} records can be imported at once.")
+    if not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Each record must be an object.")
+    return rows
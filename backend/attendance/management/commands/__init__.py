@@ -0,0 +1 @@
+# This makes the directory a Python package
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from attendance.partitions import (
+    ATTENDANCE_RETENTION_MONTHS, archive_month, months_to_archive, retention_cutoff
+)
+
+
+class Command(BaseCommand):
+    help = 'Move attendance older than the retention window into compressed archive files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-months', type=int, default=ATTENDANCE_RETENTION_MONTHS,
+            help='Months kept in the live table, counting the current month'
+        )
+        parser.add_argument(
+            '--directory', default=settings.ATTENDANCE_ARCHIVE_DIR,
+            help='Directory the gzipped CSV archives are written to'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='List the months that would be archived')
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options['retention_months'])
+        months = months_to_archive(cutoff)
+        if not months:
+            self.stdout.write(self.style.SUCCESS(f"Nothing to archive before {cutoff:%Y-%m}"))
+            return
+
+        for month in months:
+            if options['dry_run']:
+                self.stdout.write(f"Would archive {month:%Y-%m}")
+                continue
+            archive = archive_month(month, options['directory'])
+            self.stdout.write(f"Archived {archive.row_count} records for {month:%Y-%m} to {archive.file_path}")
+
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Archived {len(months)} months before {cutoff:%Y-%m}"))
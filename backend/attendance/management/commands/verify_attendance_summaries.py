@@ -0,0 +1,55 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from attendance.models import AttendanceArchive, AttendanceSummary
+from attendance.summaries import COUNT_FIELDS, apply_summary_deltas, recompute_summaries
+
+
+class Command(BaseCommand):
+    help = 'Compare attendance summaries with a fresh recount of attendance records and report drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Correct drifted summaries by applying the difference')
+        parser.add_argument('--limit', type=int, default=50, help='Maximum number of drifted summaries to print')
+
+    def handle(self, *args, **options):
+        self.stdout.write("Recounting attendance...")
+        expected = recompute_summaries()
+        stored = {
+            (row['profile_id'], row['job_id'], row['year'], row['month']): {
+                field: row[field] for field in COUNT_FIELDS
+            }
+            for row in AttendanceSummary.objects.values(
+                'profile_id', 'job_id', 'year', 'month', *COUNT_FIELDS
+            ).iterator()
+        }
+
+        # Archived months keep their summaries without the attendance rows
+        archived = set(AttendanceArchive.objects.values_list('month', flat=True))
+        zero = dict.fromkeys(COUNT_FIELDS, 0)
+        drift = {}
+        for key in expected.keys() | stored.keys():
+            if date(key[2], key[3], 1) in archived:
+                continue
+            want = expected.get(key, zero)
+            have = stored.get(key, zero)
+            difference = {field: want[field] - have[field] for field in COUNT_FIELDS}
+            if any(difference.values()):
+                drift[key] = difference
+
+        for (profile_id, job_id, year, month), difference in sorted(drift.items())[:options['limit']]:
+            changes = ', '.join(f"{field} {delta:+d}" for field, delta in difference.items() if delta)
+            self.stdout.write(f"profile {profile_id} job {job_id} {month}/{year}: {changes}")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS(f"All {len(stored)} summaries match"))
+            return
+
+        if options['fix']:
+            with transaction.atomic():
+                apply_summary_deltas(drift)
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(drift)} drifted summaries"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} summaries drifted; rerun with --fix to correct them"))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['job', '-date', '-id'], name='attendance__job_id_ec1ea7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['profile', '-date', '-id'], name='attendance__profile_72985b_idx'),
+        ),
+    ]
@@ -0,0 +1,122 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:10
+
+from datetime import date
+
+from django.db import migrations, models
+
+
+TABLE = 'attendance_attendance'
+
+COLUMNS = """
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    date date NOT NULL,
+    status varchar(10) NOT NULL,
+    check_in_time time NULL,
+    check_out_time time NULL,
+    reason text NULL,
+    job_id bigint NOT NULL
+        REFERENCES jobs_job (id) DEFERRABLE INITIALLY DEFERRED,
+    profile_id bigint NOT NULL
+        REFERENCES profiles_candidateprofile (id) DEFERRABLE INITIALLY DEFERRED
+"""
+
+INDEXES = [
+    f'CREATE INDEX attendance__job_id_ec1ea7_idx ON {TABLE} (job_id, date DESC, id DESC)',
+    f'CREATE INDEX attendance__profile_72985b_idx ON {TABLE} (profile_id, date DESC, id DESC)',
+]
+
+# Partitions are created this far ahead; attendance.partitions keeps it up
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _rebuild(schema_editor, create_sql, after_create=()):
+    """Swap the attendance table for a new one built by ``create_sql``, keeping rows and ids."""
+    execute = schema_editor.execute
+    execute(f'ALTER TABLE {TABLE} RENAME TO {TABLE}_old')
+    for statement in INDEXES:
+        execute(f"DROP INDEX {statement.split()[2]}")
+    execute(create_sql)
+    for statement in after_create:
+        execute(statement)
+    execute(
+        f'INSERT INTO {TABLE} (id, date, status, check_in_time, check_out_time, reason, job_id, profile_id) '
+        f'SELECT id, date, status, check_in_time, check_out_time, reason, job_id, profile_id FROM {TABLE}_old'
+    )
+    execute(f'DROP TABLE {TABLE}_old')
+    execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+        f"COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)"
+    )
+    for statement in INDEXES:
+        execute(statement)
+
+
+def partition_attendance(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN(date) FROM {TABLE}')
+        first_day = cursor.fetchone()[0]
+    current = date.today().replace(day=1)
+    month = first_day.replace(day=1) if first_day and first_day < current else current
+    last = _add_months(current, MONTHS_AHEAD)
+
+    partitions = [f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT']
+    while month <= last:
+        partitions.append(
+            f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+        )
+        month = _add_months(month, 1)
+
+    # The partition key has to be part of the primary key and unique constraints
+    _rebuild(schema_editor, f"""
+        CREATE TABLE {TABLE} (
+            {COLUMNS},
+            PRIMARY KEY (id, date),
+            UNIQUE (profile_id, job_id, date)
+        ) PARTITION BY RANGE (date)
+    """, partitions)
+
+
+def unpartition_attendance(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    _rebuild(schema_editor, f"""
+        CREATE TABLE {TABLE} (
+            {COLUMNS},
+            PRIMARY KEY (id),
+            UNIQUE (profile_id, job_id, date)
+        )
+    """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(db_index=True)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('file_path', models.CharField(max_length=500)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-month', '-archived_at'],
+            },
+        ),
+        migrations.RunPython(partition_attendance, unpartition_attendance),
+    ]
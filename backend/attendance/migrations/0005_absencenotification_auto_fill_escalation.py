@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_partition_attendance_by_month'),
+        ('profiles', '0008_candidatequotausage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='absencenotification',
+            name='auto_fill_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='absencenotification',
+            name='auto_fill_waves',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='absencenotification',
+            name='first_accepted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='absencenotification',
+            name='filled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='absencenotification',
+            name='filled_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='filled_absences', to='profiles.candidateprofile'),
+        ),
+    ]
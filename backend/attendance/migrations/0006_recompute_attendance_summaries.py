@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:45
+
+from decimal import Decimal
+
+from django.db import migrations
+
+
+def recompute(apps, schema_editor):
+    """
+    Bring every summary in line with the attendance rows, so the deltas
+    applied by Attendance.save() and delete() start from correct counts.
+    Months with no live rows (archived ones) are left alone.
+    """
+    from attendance.summaries import COUNT_FIELDS, recompute_summaries
+
+    Attendance = apps.get_model('attendance', 'Attendance')
+    AttendanceSummary = apps.get_model('attendance', 'AttendanceSummary')
+
+    summaries = []
+    for (profile_id, job_id, year, month), counts in recompute_summaries(Attendance.objects.all()).items():
+        total, present = counts['total_days'], counts['present_days']
+        percentage = Decimal(present * 100) / total if total else Decimal('0')
+        summaries.append(AttendanceSummary(
+            profile_id=profile_id, job_id=job_id, year=year, month=month,
+            attendance_percentage=percentage.quantize(Decimal('0.01')),
+            **counts,
+        ))
+
+    AttendanceSummary.objects.bulk_create(
+        summaries,
+        batch_size=2000,
+        update_conflicts=True,
+        unique_fields=['profile', 'job', 'month', 'year'],
+        update_fields=[*COUNT_FIELDS, 'attendance_percentage'],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_absencenotification_auto_fill_escalation'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute, migrations.RunPython.noop),
+    ]
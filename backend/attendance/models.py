@@ -2,11 +2,15 @@
 Models for the attendance app.
 """
 
-from django.db import models
+from django.db import models, transaction
 from profiles.models import CandidateProfile
 from jobs.models import Job, ActiveJob
 
 
+# Attendance fields that decide which AttendanceSummary counters a row adds to
+SUMMARY_STATE_FIELDS = ('profile_id', 'job_id', 'date', 'status')
+
+
 class Attendance(models.Model):
     """Model for storing attendance information."""
     
@@ -35,10 +39,58 @@ class Attendance(models.Model):
     
     class Meta:
         unique_together = ('profile', 'job', 'date')
+        indexes = [
+            models.Index(fields=['job', '-date', '-id']),
+            models.Index(fields=['profile', '-date', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.profile} - {self.job.title} - {self.date}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the summary currently counts for this row
+        if all(name in field_names for name in SUMMARY_STATE_FIELDS):
+            instance._summary_state = tuple(getattr(instance, name) for name in SUMMARY_STATE_FIELDS)
+        return instance
+
+    def _stored_summary_state(self):
+        if self._state.adding or self.pk is None:
+            return None
+        state = getattr(self, '_summary_state', None)
+        if state is None:
+            state = Attendance.objects.filter(pk=self.pk).values_list(*SUMMARY_STATE_FIELDS).first()
+        return state
+
+    def save(self, *args, **kwargs):
+        from .summaries import apply_summary_deltas, new_deltas, record_delta
+
+        with transaction.atomic():
+            previous = self._stored_summary_state()
+            super().save(*args, **kwargs)
+            current = tuple(getattr(self, name) for name in SUMMARY_STATE_FIELDS)
+            if current != previous:
+                deltas = new_deltas()
+                if previous is not None:
+                    record_delta(deltas, *previous, sign=-1)
+                record_delta(deltas, *current, sign=1)
+                apply_summary_deltas(deltas)
+        self._summary_state = current
+
+    def delete(self, *args, **kwargs):
+        from .summaries import apply_summary_deltas, new_deltas, record_delta
+
+        with transaction.atomic():
+            previous = self._stored_summary_state()
+            result = super().delete(*args, **kwargs)
+            if previous is not None:
+                deltas = new_deltas()
+                record_delta(deltas, *previous, sign=-1)
+                apply_summary_deltas(deltas)
+        self._summary_state = None
+        return result
+
 
 class AbsenceNotification(models.Model):
     """Model for storing absence notification information."""
@@ -53,8 +105,35 @@ class AbsenceNotification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     auto_fill_triggered = models.BooleanField(default=False)
     
+    # Auto-fill escalation progress and latency (see jobs.escalation)
+    auto_fill_started_at = models.DateTimeField(null=True, blank=True)
+    auto_fill_waves = models.PositiveSmallIntegerField(default=0)
+    first_accepted_at = models.DateTimeField(null=True, blank=True)
+    filled_at = models.DateTimeField(null=True, blank=True)
+    filled_by = models.ForeignKey(
+        CandidateProfile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='filled_absences'
+    )
+    
     def __str__(self):
         return f"{self.active_job.profile} - {self.active_job.job.title} - {self.date}"
+    
+    @property
+    def time_to_first_accept(self):
+        """Seconds from the first auto-fill wave to the first acceptance."""
+        if self.auto_fill_started_at and self.first_accepted_at:
+            return (self.first_accepted_at - self.auto_fill_started_at).total_seconds()
+        return None
+    
+    @property
+    def time_to_fill(self):
+        """Seconds from the first auto-fill wave to the shift being filled."""
+        if self.auto_fill_started_at and self.filled_at:
+            return (self.filled_at - self.auto_fill_started_at).total_seconds()
+        return None
 
 
 class AttendanceSummary(models.Model):
@@ -82,4 +161,19 @@ class AttendanceSummary(models.Model):
         unique_together = ('profile', 'job', 'month', 'year')
     
     def __str__(self):
-        return f"{self.profile} - {self.job.title} - {self.month}/{self.year}" 
\ No newline at end of file
+        return f"{self.profile} - {self.job.title} - {self.month}/{self.year}"
+
+
+class AttendanceArchive(models.Model):
+    """Record of attendance rows moved out of the live table into an archive file."""
+    
+    month = models.DateField(db_index=True)  # First day of the archived month
+    row_count = models.PositiveIntegerField(default=0)
+    file_path = models.CharField(max_length=500)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-month', '-archived_at']
+    
+    def __str__(self):
+        return f"Attendance archive {self.month:%Y-%m} ({self.row_count} rows)"
@@ -0,0 +1,41 @@
+"""
+Request parsers for the attendance app.
+"""
+
+import codecs
+import csv
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+def read_csv_rows(stream, encoding='utf-8'):
+    """
+    Read CSV with a header row into a list of dicts.
+
+    Empty cells become None so optional fields validate as missing values.
+    """
+    # utf-8-sig drops the byte order mark spreadsheet exports often add
+    if encoding.lower().replace('_', '-') == 'utf-8':
+        encoding = 'utf-8-sig'
+    try:
+        reader = csv.DictReader(codecs.iterdecode(stream, encoding))
+        return [
+            {key.strip(): (value.strip() or None) if value is not None else None
+             for key, value in row.items() if key}
+            for row in reader
+        ]
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise ParseError(f'CSV parse error - {exc}')
+
+
+class CSVParser(BaseParser):
+    """Parses a ``text/csv`` body into a list of row dicts."""
+
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        return read_csv_rows(stream, encoding)
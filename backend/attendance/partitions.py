@@ -0,0 +1,197 @@
+"""
+Month partitioning and archival for the attendance table.
+
+On PostgreSQL ``attendance_attendance`` is range-partitioned by ``date``
+with one partition per month (see migration 0004). A periodic task keeps
+partitions created a few months ahead; rows outside every partition land
+in a default partition. Other backends keep a plain table and every
+function here falls back to ordinary queries.
+
+Months older than the retention window are archived: their rows are
+written to a gzipped CSV file, recorded in AttendanceArchive, and removed
+by dropping the month's partition (or deleting the rows on other
+backends). Monthly AttendanceSummary rows are kept as the history of
+archived months.
+"""
+
+import csv
+import gzip
+import os
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Attendance, AttendanceArchive
+
+
+TABLE = Attendance._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+# Partitions are created this many months past the current one
+PARTITION_MONTHS_AHEAD = 3
+# Months kept in the live table, counting the current month
+ATTENDANCE_RETENTION_MONTHS = 24
+
+ARCHIVE_FIELDS = ['id', 'profile_id', 'job_id', 'date', 'status', 'check_in_time', 'check_out_time', 'reason']
+
+
+def is_partitioned():
+    return connection.vendor == 'postgresql'
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y%m}'
+
+
+def create_partition(cursor, month):
+    """Create the partition for ``month`` unless it exists. Returns True if created."""
+    name = partition_name(month)
+    cursor.execute('SELECT to_regclass(%s)', [name])
+    if cursor.fetchone()[0] is not None:
+        return False
+    quote = connection.ops.quote_name
+    lower, upper = month, add_months(month, 1)
+    # Rows for this month may have landed in the default partition; move them
+    # into the new partition, since attaching would fail while they are there
+    cursor.execute(f'CREATE TABLE {quote(name)} (LIKE {quote(TABLE)} INCLUDING DEFAULTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} WHERE date >= %s AND date < %s RETURNING *) '
+        f'INSERT INTO {quote(name)} SELECT * FROM moved',
+        [lower, upper],
+    )
+    cursor.execute(
+        f'ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(name)} FOR VALUES FROM (%s) TO (%s)',
+        [lower, upper],
+    )
+    return True
+
+
+def ensure_partitions(months_ahead=PARTITION_MONTHS_AHEAD):
+    """Create partitions from the current month to ``months_ahead`` months on. Returns the number created."""
+    if not is_partitioned():
+        return 0
+    current = month_start(timezone.localdate())
+    created = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            created += create_partition(cursor, add_months(current, offset))
+    return created
+
+
+def retention_cutoff(retention_months=ATTENDANCE_RETENTION_MONTHS):
+    """First month that is kept; everything before it can be archived."""
+    return add_months(month_start(timezone.localdate()), 1 - retention_months)
+
+
+def months_to_archive(cutoff):
+    """Months before ``cutoff`` that still have attendance rows, oldest first."""
+    dates = Attendance.objects.filter(date__lt=cutoff).dates('date', 'month')
+    return list(dates)
+
+
+def archive_month(month, directory):
+    """
+    Write one month of attendance to ``directory`` as gzipped CSV and
+    remove it from the live table. Returns the new AttendanceArchive row.
+
+    Everything happens in one transaction, so no row written or edited
+    while the month is exported is lost: the month's partition is detached
+    before it is read and dropped afterwards, and without a partition the
+    month's rows are locked, exported and deleted by id.
+    """
+    os.makedirs(directory, exist_ok=True)
+    # Late rows for an archived month are archived again into a separate file
+    path = os.path.join(directory, f'attendance-{month:%Y-%m}-{timezone.now():%Y%m%d%H%M%S}.csv.gz')
+
+    try:
+        with transaction.atomic():
+            name = _detach_partition(month)
+            if name is not None:
+                row_count = _archive_partition(name, path)
+            else:
+                row_count = _archive_rows(month, path)
+            archive = AttendanceArchive.objects.create(month=month, row_count=row_count, file_path=path)
+    except Exception:
+        # Nothing was removed; don't leave a file the archive table doesn't know about
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return archive
+
+
+def _write_archive(path, rows):
+    row_count = 0
+    with gzip.open(path, 'wt', newline='') as archive_file:
+        writer = csv.writer(archive_file)
+        writer.writerow(ARCHIVE_FIELDS)
+        for row in rows:
+            writer.writerow(row)
+            row_count += 1
+    return row_count
+
+
+def _detach_partition(month):
+    """Detach the month's partition, if it has one. Returns its name, or None."""
+    if not is_partitioned():
+        return None
+    name = partition_name(month)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [name])
+        if cursor.fetchone()[0] is None:
+            return None
+        quote = connection.ops.quote_name
+        cursor.execute(f'ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}')
+    return name
+
+
+def _archive_partition(name, path):
+    """Export a detached partition to ``path`` and drop it."""
+    quote = connection.ops.quote_name
+
+    def rows(cursor):
+        while True:
+            chunk = cursor.fetchmany(5000)
+            if not chunk:
+                return
+            yield from chunk
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {", ".join(quote(field) for field in ARCHIVE_FIELDS)} FROM {quote(name)} ORDER BY date, id'
+        )
+        row_count = _write_archive(path, rows(cursor))
+        cursor.execute(f'DROP TABLE {quote(name)}')
+    return row_count
+
+
+def _archive_rows(month, path):
+    """
+    Export the month's rows to ``path`` and delete them, for months without
+    a partition of their own (other backends, or rows in the default partition).
+    """
+    rows = Attendance.objects.select_for_update().filter(
+        date__gte=month, date__lt=add_months(month, 1)
+    ).order_by('date', 'id').values_list(*ARCHIVE_FIELDS)
+
+    exported = []
+
+    def locked_rows():
+        for row in rows.iterator(chunk_size=5000):
+            exported.append(row[0])
+            yield row
+
+    row_count = _write_archive(path, locked_rows())
+    # Only the exported rows: anything inserted since was not written out
+    for offset in range(0, len(exported), 5000):
+        Attendance.objects.filter(id__in=exported[offset:offset + 5000]).delete()
+    return row_count
@@ -26,14 +26,21 @@ class AbsenceNotificationSerializer(serializers.ModelSerializer):
     
     candidate_name = serializers.CharField(source='active_job.profile.full_name', read_only=True)
     job_title = serializers.CharField(source='active_job.job.title', read_only=True)
+    time_to_first_accept = serializers.FloatField(read_only=True)
+    time_to_fill = serializers.FloatField(read_only=True)
     
     class Meta:
         model = AbsenceNotification
         fields = [
             'id', 'active_job', 'candidate_name', 'job_title',
-            'date', 'reason', 'created_at', 'auto_fill_triggered'
+            'date', 'reason', 'created_at', 'auto_fill_triggered',
+            'auto_fill_started_at', 'auto_fill_waves', 'first_accepted_at', 'filled_at',
+            'filled_by', 'time_to_first_accept', 'time_to_fill'
+        ]
+        read_only_fields = [
+            'created_at', 'auto_fill_triggered', 'auto_fill_started_at', 'auto_fill_waves',
+            'first_accepted_at', 'filled_at', 'filled_by'
         ]
-        read_only_fields = ['created_at', 'auto_fill_triggered']
 
 
 class AttendanceSummarySerializer(serializers.ModelSerializer):
@@ -57,4 +64,20 @@ class AttendanceSummarySerializer(serializers.ModelSerializer):
             'January', 'February', 'March', 'April', 'May', 'June',
             'July', 'August', 'September', 'October', 'November', 'December'
         ]
-        return months[obj.month - 1] 
\ No newline at end of file
+        return months[obj.month - 1] 
+
+class AttendanceBulkRowSerializer(serializers.Serializer):
+    """
+    Validates one row of a bulk attendance upload.
+
+    References are plain ids here; the bulk ingest checks them for the
+    whole upload with set lookups instead of a query per row.
+    """
+    
+    profile = serializers.IntegerField(min_value=1)
+    job = serializers.IntegerField(min_value=1)
+    date = serializers.DateField()
+    status = serializers.ChoiceField(choices=Attendance.STATUS_CHOICES)
+    check_in_time = serializers.TimeField(required=False, allow_null=True)
+    check_out_time = serializers.TimeField(required=False, allow_null=True)
+    reason = serializers.CharField(required=False, allow_null=True, allow_blank=True)
@@ -0,0 +1,116 @@
+"""
+Incremental maintenance of AttendanceSummary.
+
+Every attendance write is translated into a delta against the summary row
+for (profile, job, year, month): one more or one fewer day, and one more or
+one fewer day in the status' bucket. Deltas are applied with atomic
+``x = x + delta`` updates in the caller's transaction, so summaries never
+need a rescan of Attendance. ``recompute_summaries`` does that rescan in
+one grouped query for the verify_attendance_summaries command.
+
+Attendance.save() and delete() apply their own deltas. QuerySet.update(),
+QuerySet.delete() and bulk_create() bypass them; callers using those must
+apply the deltas themselves.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Case, Count, DecimalField, F, Q, Value, When
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.db.models.lookups import GreaterThan
+
+from .models import Attendance, AttendanceSummary
+
+
+COUNT_FIELDS = ('total_days', 'present_days', 'absent_days', 'late_days')
+
+# Which summary counters a record with each status adds to. Late and
+# half-day records still count as days present.
+STATUS_COUNTERS = {
+    'present': ('present_days',),
+    'late': ('present_days', 'late_days'),
+    'half_day': ('present_days',),
+    'absent': ('absent_days',),
+}
+
+
+def summary_key(profile_id, job_id, date):
+    return (profile_id, job_id, date.year, date.month)
+
+
+def record_delta(deltas, profile_id, job_id, date, status, sign):
+    """Add the effect of one record (sign=1) or of removing it (sign=-1) to ``deltas``."""
+    counts = deltas[summary_key(profile_id, job_id, date)]
+    counts['total_days'] += sign
+    for field in STATUS_COUNTERS.get(status, ()):
+        counts[field] += sign
+
+
+def new_deltas():
+    return defaultdict(lambda: dict.fromkeys(COUNT_FIELDS, 0))
+
+
+def apply_summary_deltas(deltas):
+    """
+    Apply ``{(profile_id, job_id, year, month): {field: delta}}`` to the summaries.
+
+    Missing summary rows are created first (zeroed, ignoring conflicts with
+    concurrent writers), then each row is adjusted with one atomic F()
+    update that also recomputes the percentage. Call inside the transaction
+    that wrote the attendance rows.
+    """
+    deltas = {key: counts for key, counts in deltas.items() if any(counts.values())}
+    if not deltas:
+        return
+
+    AttendanceSummary.objects.bulk_create(
+        [
+            AttendanceSummary(profile_id=profile_id, job_id=job_id, year=year, month=month, total_days=0)
+            for (profile_id, job_id, year, month), counts in deltas.items()
+            if counts['total_days'] > 0
+        ],
+        ignore_conflicts=True,
+    )
+
+    for (profile_id, job_id, year, month), counts in deltas.items():
+        # SET expressions see the old row, so the percentage uses the new counts explicitly
+        total = F('total_days') + counts['total_days']
+        present = F('present_days') + counts['present_days']
+        AttendanceSummary.objects.filter(
+            profile_id=profile_id, job_id=job_id, year=year, month=month
+        ).update(
+            attendance_percentage=Case(
+                When(GreaterThan(total, 0), then=present * Value(Decimal('100')) / total),
+                default=Value(Decimal('0')),
+                output_field=DecimalField(max_digits=5, decimal_places=2),
+            ),
+            **{field: F(field) + counts[field] for field in COUNT_FIELDS}
+        )
+
+
+def recompute_summaries(queryset=None):
+    """
+    Recompute summaries from Attendance in one grouped query.
+
+    Returns ``{(profile_id, job_id, year, month): {field: value}}``.
+    """
+    queryset = Attendance.objects.all() if queryset is None else queryset
+    rows = (
+        queryset
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values('profile_id', 'job_id', 'year', 'month')
+        .annotate(
+            total_days=Count('id'),
+            present_days=Count('id', filter=Q(status__in=['present', 'late', 'half_day'])),
+            absent_days=Count('id', filter=Q(status='absent')),
+            late_days=Count('id', filter=Q(status='late')),
+        )
+        .order_by()
+    )
+    return {
+        (row['profile_id'], row['job_id'], row['year'], row['month']): {
+            field: row[field] for field in COUNT_FIELDS
+        }
+        for row in rows.iterator()
+    }
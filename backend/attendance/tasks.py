@@ -0,0 +1,45 @@
+"""
+Celery tasks for the attendance app.
+"""
+
+from celery import shared_task
+
+
+@shared_task
+def create_attendance_partitions():
+    """Keep monthly attendance partitions created ahead of time."""
+    from .partitions import ensure_partitions, PARTITION_MONTHS_AHEAD
+    
+    created = ensure_partitions()
+    
+    return f"Created {created} attendance partitions up to {PARTITION_MONTHS_AHEAD} months ahead"
+
+
+@shared_task
+def compute_hospital_timesheets(period=None):
+    """
+    Compute and cache every hospital's timesheet for a month (``YYYY-MM``),
+    by default the month that just ended, ready for payroll.
+    """
+    from datetime import date
+    from django.utils import timezone
+    from profiles.models import Hospital
+    from .partitions import add_months
+    from .timesheets import get_timesheet, month_period
+    
+    if period:
+        year, month = map(int, period.split('-'))
+        start, end = month_period(date(year, month, 1))
+    else:
+        start, end = month_period(add_months(timezone.localdate().replace(day=1), -1))
+    
+    hospital_ids = Hospital.objects.filter(
+        recruiters__jobs__attendances__date__gte=start,
+        recruiters__jobs__attendances__date__lte=end,
+    ).values_list('id', flat=True).distinct()
+    computed = 0
+    for hospital_id in hospital_ids:
+        get_timesheet(hospital_id, start, end, refresh=True)
+        computed += 1
+    
+    return f"Computed timesheets for {computed} hospitals from {start} to {end}"
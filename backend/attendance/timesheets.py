@@ -0,0 +1,146 @@
+"""
+Timesheets computed from attendance check-in and check-out times.
+
+A hospital's timesheet for a pay period comes from one query over its
+attendance rows, loaded into NumPy arrays and reduced per worker (a
+profile on a job) with ``bincount``:
+
+* hours worked are ``(check_out - check_in) mod 24h``, so shifts that cross
+  midnight count correctly;
+* overtime is the time worked beyond the job's scheduled shift length
+  (``shift_end_time - shift_start_time``, also mod 24h), or beyond
+  STANDARD_SHIFT_MINUTES when the job has no shift times;
+* late minutes are how long after ``shift_start_time`` the worker checked
+  in. A check-in more than half a day after the start is an early arrival
+  for the shift and counts as on time.
+
+Timesheets are cached per hospital and period: closed periods for a day,
+the current one for a few minutes.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from profiles.models import CandidateProfile
+from .models import Attendance
+from .partitions import add_months
+
+
+MINUTES_PER_DAY = 24 * 60
+STANDARD_SHIFT_MINUTES = 8 * 60
+
+OPEN_PERIOD_CACHE_SECONDS = 5 * 60
+CLOSED_PERIOD_CACHE_SECONDS = 24 * 60 * 60
+
+TIMESHEET_FIELDS = [
+    'profile_id', 'candidate_name', 'job_id', 'job_title', 'days_worked', 'absent_days',
+    'late_days', 'missing_punches', 'hours_worked', 'overtime_hours', 'late_minutes',
+]
+
+
+def month_period(month=None):
+    """Return the ``(start, end)`` dates of the month containing ``month`` (default: this month)."""
+    start = (month or timezone.localdate()).replace(day=1)
+    return start, add_months(start, 1) - timedelta(days=1)
+
+
+def _minutes(times):
+    """Minutes past midnight for each time, NaN where the time is missing."""
+    return np.array(
+        [t.hour * 60 + t.minute + t.second / 60 if t is not None else np.nan for t in times],
+        dtype=float,
+    )
+
+
+def compute_timesheet(hospital_id, start, end):
+    """Timesheet rows for every worker with attendance at the hospital between ``start`` and ``end``."""
+    rows = list(
+        Attendance.objects.filter(
+            job__employer__hospital_id=hospital_id, date__gte=start, date__lte=end
+        ).values_list(
+            'profile_id', 'job_id', 'status', 'check_in_time', 'check_out_time',
+            'job__shift_start_time', 'job__shift_end_time', 'job__title',
+        ).order_by()
+    )
+    if not rows:
+        return []
+
+    profile_ids, job_ids, statuses, check_in, check_out, shift_start, shift_end, titles = zip(*rows)
+    workers, worker_index = np.unique(
+        np.array([profile_ids, job_ids], dtype=np.int64).T, axis=0, return_inverse=True
+    )
+    worker_index = worker_index.ravel()
+    count = len(workers)
+
+    statuses = np.array(statuses)
+    attended = statuses != 'absent'
+    check_in = _minutes(check_in)
+    check_out = _minutes(check_out)
+    shift_start = _minutes(shift_start)
+    shift_end = _minutes(shift_end)
+
+    punched = attended & ~np.isnan(check_in) & ~np.isnan(check_out)
+    worked = np.where(punched, np.mod(check_out - check_in, MINUTES_PER_DAY), 0)
+    scheduled = np.where(
+        np.isnan(shift_start) | np.isnan(shift_end),
+        STANDARD_SHIFT_MINUTES,
+        np.mod(shift_end - shift_start, MINUTES_PER_DAY),
+    )
+    overtime = np.clip(worked - scheduled, 0, None)
+    late = np.mod(check_in - shift_start, MINUTES_PER_DAY)
+    late = np.where(attended & ~np.isnan(late) & (late < MINUTES_PER_DAY / 2), late, 0)
+
+    def per_worker(values):
+        return np.bincount(worker_index, weights=values, minlength=count)
+
+    days_worked = per_worker(attended)
+    absent_days = per_worker(~attended)
+    late_days = per_worker(statuses == 'late')
+    missing_punches = per_worker(attended & ~punched)
+    hours_worked = per_worker(worked) / 60
+    overtime_hours = per_worker(overtime) / 60
+    late_minutes = per_worker(late)
+
+    job_titles = dict(zip(job_ids, titles))
+    names = {
+        profile_id: f"{first_name} {last_name}"
+        for profile_id, first_name, last_name in CandidateProfile.objects.filter(
+            id__in=set(profile_ids)
+        ).values_list('id', 'first_name', 'last_name')
+    }
+
+    timesheet = []
+    for i, (profile_id, job_id) in enumerate(workers.tolist()):
+        timesheet.append({
+            'profile_id': profile_id,
+            'candidate_name': names.get(profile_id, ''),
+            'job_id': job_id,
+            'job_title': job_titles[job_id],
+            'days_worked': int(days_worked[i]),
+            'absent_days': int(absent_days[i]),
+            'late_days': int(late_days[i]),
+            'missing_punches': int(missing_punches[i]),
+            'hours_worked': round(float(hours_worked[i]), 2),
+            'overtime_hours': round(float(overtime_hours[i]), 2),
+            'late_minutes': int(round(late_minutes[i])),
+        })
+    timesheet.sort(key=lambda row: (row['candidate_name'], row['job_title']))
+    return timesheet
+
+
+def timesheet_key(hospital_id, start, end):
+    return f'attendance:timesheet:{hospital_id}:{start}:{end}'
+
+
+def get_timesheet(hospital_id, start, end, refresh=False):
+    """Return the cached timesheet for a period, computing it if needed."""
+    key = timesheet_key(hospital_id, start, end)
+    timesheet = None if refresh else cache.get(key)
+    if timesheet is None:
+        timesheet = compute_timesheet(hospital_id, start, end)
+        closed = end < timezone.localdate()
+        cache.set(key, timesheet, CLOSED_PERIOD_CACHE_SECONDS if closed else OPEN_PERIOD_CACHE_SECONDS)
+    return timesheet
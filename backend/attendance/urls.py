@@ -5,10 +5,12 @@ URL patterns for the attendance app.
 from django.urls import path
 from .views import (
     AttendanceListCreateView,
+    AttendanceBulkCreateView,
     AttendanceDetailView,
     AbsenceNotificationListCreateView,
     AbsenceNotificationDetailView,
     AttendanceSummaryListView,
+    TimesheetView,
 )
 
 app_name = 'attendance'
@@ -16,6 +18,7 @@ app_name = 'attendance'
 urlpatterns = [
     # Attendance
     path('', AttendanceListCreateView.as_view(), name='attendance-list'),
+    path('bulk/', AttendanceBulkCreateView.as_view(), name='attendance-bulk-create'),
     path('<int:pk>/', AttendanceDetailView.as_view(), name='attendance-detail'),
     
     # Absence Notifications
@@ -24,4 +27,7 @@ urlpatterns = [
     
     # Attendance Summaries
     path('summaries/', AttendanceSummaryListView.as_view(), name='attendance-summary-list'),
-] 
\ No newline at end of file
+    
+    # Timesheets
+    path('timesheets/', TimesheetView.as_view(), name='timesheet'),
+]
\ No newline at end of file
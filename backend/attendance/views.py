@@ -2,10 +2,20 @@
 Views for the attendance app.
 """
 
+import csv
+import itertools
+from datetime import timedelta
+
 from rest_framework import generics, permissions, status, filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Attendance, AbsenceNotification, AttendanceSummary
 from .serializers import (
@@ -13,19 +23,25 @@ from .serializers import (
     AbsenceNotificationSerializer,
     AttendanceSummarySerializer
 )
-from profiles.models import CandidateProfile
-from jobs.models import ActiveJob
-from profiles.permissions import IsOwnerOrAdmin
+from profiles.models import CandidateProfile, RecruiterProfile
+from jobs.models import ActiveJob, Job
+from profiles.permissions import IsOwnerOrAdmin, IsRecruiterOrAdmin
+from .ingest import ingest_attendance, rows_from_request
+from .parsers import CSVParser
+from .timesheets import TIMESHEET_FIELDS, get_timesheet, month_period
+from carechain.pagination import KeysetPaginationMixin, AttendanceDateCursorPagination
 
 
-class AttendanceListCreateView(generics.ListCreateAPIView):
+class AttendanceListCreateView(KeysetPaginationMixin, generics.ListCreateAPIView):
     """View for listing and creating attendance records."""
     
     serializer_class = AttendanceSerializer
+    cursor_pagination_class = AttendanceDateCursorPagination
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['date', 'status']
     ordering_fields = ['date']
+    default_window_days = 90
     
     def get_queryset(self):
         """Return attendance records based on user type."""
@@ -33,13 +49,47 @@ class AttendanceListCreateView(generics.ListCreateAPIView):
         
         if user.is_recruiter:
             # Recruiters see attendance for their jobs
-            return Attendance.objects.filter(job__employer__user=user)
+            queryset = Attendance.objects.filter(job__employer__user=user)
         elif user.is_candidate:
             # Candidates see their own attendance
-            return Attendance.objects.filter(profile__user=user)
+            queryset = Attendance.objects.filter(profile__user=user)
         else:
             # Admins see all attendance
-            return Attendance.objects.all()
+            queryset = Attendance.objects.all()
+        
+        if self.request.method == 'GET':
+            queryset = self.filter_date_window(queryset)
+        return queryset
+    
+    def filter_date_window(self, queryset):
+        """
+        Bound listings by date so they only touch recent monthly partitions.
+        
+        ``?date_from=`` and ``?date_to=`` set the window; without them (or
+        ``?date=``) the last ``default_window_days`` days are listed.
+        """
+        params = self.request.query_params
+        if params.get('date'):
+            return queryset
+        
+        bounds = {}
+        for name in ('date_from', 'date_to'):
+            value = params.get(name)
+            try:
+                bounds[name] = parse_date(value) if value else None
+            except ValueError:
+                bounds[name] = None
+            if value and bounds[name] is None:
+                raise ValidationError({"error": f"{name} must be a valid YYYY-MM-DD date"})
+        date_from, date_to = bounds['date_from'], bounds['date_to']
+        
+        if date_from is None and date_to is None:
+            date_from = timezone.localdate() - timedelta(days=self.default_window_days)
+        if date_from is not None:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to is not None:
+            queryset = queryset.filter(date__lte=date_to)
+        return queryset
     
     def perform_create(self, serializer):
         """Save the attendance record with the candidate profile."""
@@ -47,6 +97,46 @@ class AttendanceListCreateView(generics.ListCreateAPIView):
         serializer.save(profile=candidate_profile)
 
 
+class AttendanceBulkCreateView(APIView):
+    """
+    View for importing a shift's or day's attendance in one request.
+    
+    Accepts a JSON array of records (bare or under ``records``), a
+    ``text/csv`` body, or a CSV file uploaded as ``file``. Existing records
+    for the same profile, job and date are skipped unless
+    ``?on_conflict=update`` is passed. Invalid rows are reported and the
+    rest are imported.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated, IsRecruiterOrAdmin]
+    parser_classes = [JSONParser, CSVParser, MultiPartParser]
+    
+    def post(self, request):
+        on_conflict = request.query_params.get('on_conflict', 'skip')
+        if on_conflict not in ('skip', 'update'):
+            return Response(
+                {"error": "on_conflict must be 'skip' or 'update'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            rows = rows_from_request(request)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if request.user.is_recruiter and not request.user.is_staff:
+            # Recruiters record attendance for their own jobs only
+            jobs = Job.objects.filter(employer__user=request.user)
+        else:
+            jobs = Job.objects.all()
+        
+        report = ingest_attendance(rows, jobs, update_existing=on_conflict == 'update')
+        written = report['created'] + report['updated']
+        if report['errors'] and not written:
+            return Response(report, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_201_CREATED if written else status.HTTP_200_OK)
+
+
 class AttendanceDetailView(generics.RetrieveUpdateAPIView):
     """View for retrieving and updating an attendance record."""
     
@@ -92,7 +182,11 @@ class AbsenceNotificationListCreateView(generics.ListCreateAPIView):
         """Save the absence notification with the active job."""
         active_job_id = self.request.data.get('active_job')
         active_job = get_object_or_404(ActiveJob, id=active_job_id, profile__user=self.request.user)
-        serializer.save(active_job=active_job)
+        absence = serializer.save(active_job=active_job)
+        
+        if active_job.job.auto_fill_enabled:
+            from jobs.tasks import trigger_auto_fill
+            transaction.on_commit(lambda: trigger_auto_fill.delay(absence.id))
 
 
 class AbsenceNotificationDetailView(generics.RetrieveAPIView):
@@ -136,4 +230,81 @@ class AttendanceSummaryListView(generics.ListAPIView):
             return AttendanceSummary.objects.filter(profile__user=user)
         else:
             # Admins see all attendance summaries
-            return AttendanceSummary.objects.all() 
\ No newline at end of file
+            return AttendanceSummary.objects.all()
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv rows."""
+    
+    def write(self, value):
+        return value
+
+
+class TimesheetView(APIView):
+    """
+    View for a hospital's timesheet over a pay period.
+    
+    The period is ``?period=YYYY-MM`` or ``?start=``/``?end=`` dates and
+    defaults to the current month. Recruiters get their own hospital;
+    admins pass ``?hospital=<id>``. ``?export=csv`` streams the timesheet
+    as CSV and ``?refresh=1`` recomputes it instead of using the cache.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated, IsRecruiterOrAdmin]
+    max_period_days = 62
+    
+    def get(self, request):
+        params = request.query_params
+        
+        if request.user.is_recruiter and not request.user.is_staff:
+            hospital_id = RecruiterProfile.objects.filter(
+                user=request.user
+            ).values_list('hospital_id', flat=True).first()
+        else:
+            hospital_id = params.get('hospital')
+        if not hospital_id:
+            return Response({"error": "No hospital selected"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            hospital_id = int(hospital_id)
+            start, end = self.get_period(params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        timesheet = get_timesheet(hospital_id, start, end, refresh=params.get('refresh') == '1')
+        
+        if params.get('export') == 'csv':
+            writer = csv.writer(_Echo())
+            lines = itertools.chain(
+                [writer.writerow(TIMESHEET_FIELDS)],
+                (writer.writerow([row[field] for field in TIMESHEET_FIELDS]) for row in timesheet)
+            )
+            response = StreamingHttpResponse(lines, content_type='text/csv')
+            response['Content-Disposition'] = f'attachment; filename="timesheet-{start}-{end}.csv"'
+            return response
+        
+        return Response({
+            'hospital': hospital_id,
+            'start': start,
+            'end': end,
+            'workers': timesheet,
+        })
+    
+    def get_period(self, params):
+        """Return the ``(start, end)`` dates of the requested pay period."""
+        if params.get('period'):
+            month = parse_date(f"{params['period']}-01") if len(params['period']) == 7 else None
+            if month is None:
+                raise ValueError("period must be YYYY-MM")
+            return month_period(month)
+        
+        if params.get('start') or params.get('end'):
+            start = parse_date(params.get('start') or '')
+            end = parse_date(params.get('end') or '')
+            if start is None or end is None or start > end:
+                raise ValueError("start and end must be YYYY-MM-DD dates with start <= end")
+            if (end - start).days > self.max_period_days:
+                raise ValueError(f"Pay periods are limited to {self.max_period_days} days")
+            return start, end
+        
+        return month_period()
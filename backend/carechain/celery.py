@@ -20,9 +20,49 @@ app.autodiscover_tasks()
 
 # Define the beat schedule
 app.conf.beat_schedule = {
-    'reset-monthly-quotas': {
-        'task': 'jobs.tasks.reset_monthly_quotas',
-        'schedule': crontab(0, 0, day_of_month='1'),  # Run at midnight on the first day of each month
+    'flush-job-view-counters': {
+        'task': 'jobs.tasks.flush_job_view_counters',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+    },
+    'flush-application-quota-counters': {
+        'task': 'jobs.tasks.flush_application_quota_counters',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+    },
+    'refresh-platform-stats': {
+        'task': 'admin_api.tasks.refresh_stats_rollup',
+        'schedule': crontab(minute='*/5'),  # Keep the dashboard rollup warm
+    },
+    'flush-recommendation-interactions': {
+        'task': 'matching.tasks.flush_recommendation_interactions',
+        'schedule': 30.0,  # Every 30 seconds
+    },
+    'persist-search-events': {
+        'task': 'matching.tasks.persist_search_events',
+        'schedule': 30.0,  # Every 30 seconds
+    },
+    'compact-search-events': {
+        'task': 'matching.tasks.compact_search_events',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+    },
+    'prune-activity-events': {
+        'task': 'admin_api.tasks.prune_activity_events',
+        'schedule': crontab(hour=3, minute=30),  # Daily, off-peak
+    },
+    'create-attendance-partitions': {
+        'task': 'attendance.tasks.create_attendance_partitions',
+        'schedule': crontab(hour=2, minute=15),  # Daily; partitions exist months ahead
+    },
+    'compute-hospital-timesheets': {
+        'task': 'attendance.tasks.compute_hospital_timesheets',
+        'schedule': crontab(day_of_month=1, hour=1, minute=0),  # Last month's timesheets for payroll
+    },
+    'rebuild-autocomplete-index': {
+        'task': 'jobs.tasks.rebuild_autocomplete_index',
+        'schedule': crontab(minute=0),  # Hourly safety net for missed incremental updates
+    },
+    'rebuild-on-call-pools': {
+        'task': 'jobs.tasks.rebuild_on_call_pools',
+        'schedule': crontab(minute='*/15'),  # Pools are cached for an hour
     },
 }
 
@@ -0,0 +1,135 @@
+"""
+Atomic Redis counters shared across apps.
+"""
+
+import time
+from datetime import date
+
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+
+# Counters outlive their period by a few days so late flushes still see them
+PERIOD_KEY_TTL = 60 * 60 * 24 * 40
+
+
+# Increment KEYS[1] only while it is below ARGV[1]; always refresh the TTL.
+# Returns {value, incremented}.
+INCREMENT_WITH_LIMIT_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local incremented = 0
+if current < tonumber(ARGV[1]) then
+    current = redis.call('INCR', KEYS[1])
+    incremented = 1
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return {current, incremented}
+"""
+
+
+# Decrement KEYS[1] without going below zero. Returns the new value.
+DECREMENT_TO_ZERO_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current > 0 then
+    current = redis.call('DECR', KEYS[1])
+end
+return current
+"""
+
+
+# Raise KEYS[1] to at least ARGV[1], keeping a higher value; refresh the
+# TTL (ARGV[2]). Returns the resulting value.
+RAISE_TO_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current < tonumber(ARGV[1]) then
+    current = tonumber(ARGV[1])
+    redis.call('SET', KEYS[1], current)
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return current
+"""
+
+
+# Token bucket stored as a hash {tokens, ts}. ARGV: capacity, refill rate in
+# tokens per second, current time in seconds. Returns {allowed, tokens_left}
+# with tokens_left as a string so Redis keeps the fraction.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+def get_connection():
+    """Return the raw Redis client behind the default cache."""
+    return get_redis_connection('default')
+
+
+def current_period(now=None):
+    """Return the YYYYMM key of the calendar month containing ``now``."""
+    now = now or timezone.now()
+    return now.strftime('%Y%m')
+
+
+def period_start(period):
+    """Return the first day of the month for a YYYYMM period key."""
+    return date(int(period[:4]), int(period[4:]), 1)
+
+
+def increment_with_limit(key, limit, ttl, seed=None):
+    """
+    Atomically increment ``key`` unless it has already reached ``limit``.
+
+    ``seed`` initialises a missing key (for example from a value already
+    stored in Postgres) before the increment is attempted. It may be a
+    callable, which is only called when the key does not exist yet.
+
+    Returns a ``(value, incremented)`` tuple.
+    """
+    conn = get_connection()
+    if seed is not None and not conn.exists(key):
+        conn.set(key, seed() if callable(seed) else seed, ex=ttl, nx=True)
+    value, incremented = conn.eval(INCREMENT_WITH_LIMIT_SCRIPT, 1, key, limit, ttl)
+    return int(value), bool(incremented)
+
+
+def decrement_counter(key):
+    """Atomically decrement ``key``, stopping at zero. Returns the new value."""
+    return int(get_connection().eval(DECREMENT_TO_ZERO_SCRIPT, 1, key))
+
+
+def raise_counter(key, value, ttl):
+    """Atomically raise ``key`` to at least ``value``. Returns the resulting value."""
+    return int(get_connection().eval(RAISE_TO_SCRIPT, 1, key, value, ttl))
+
+
+def take_token(key, capacity, refill_rate):
+    """
+    Take one token from the bucket stored at ``key``.
+
+    The bucket holds at most ``capacity`` tokens and refills continuously at
+    ``refill_rate`` tokens per second. Returns an ``(allowed, tokens_left)``
+    tuple.
+    """
+    allowed, tokens = get_connection().eval(
+        TOKEN_BUCKET_SCRIPT, 1, key, capacity, refill_rate, time.time()
+    )
+    return bool(allowed), float(tokens)
+
+
+def read_counter(key, default=0):
+    """Read an integer counter, returning ``default`` when it does not exist."""
+    value = get_connection().get(key)
+    return int(value) if value is not None else default
@@ -0,0 +1,172 @@
+"""
+Shared pagination classes for the carechain project.
+"""
+
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination positioned on every ordering field.
+
+    DRF's CursorPagination seeks on the first ordering field only and steps
+    through ties with an OFFSET capped at ``offset_cutoff``, so long runs of
+    equal dates or scores repeat or skip rows. Here the cursor carries the
+    whole ordering key of the boundary row (the primary key is appended
+    when the ordering does not end with it) and the next page is a plain
+    ``WHERE (a, b) < (x, y)`` seek.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self._unique_ordering(self.get_ordering(request, queryset, view), queryset)
+        self.cursor = self.decode_cursor(request)
+        reverse, position = (False, None) if self.cursor is None else self.cursor[1:]
+        if position is not None:
+            try:
+                position = json.loads(position)
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+
+        ordering = [self._flip(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        if self.page:
+            self.next_position = self._position(self.page[-1])
+            self.previous_position = self._position(self.page[0])
+        else:
+            # Nothing past the cursor; keep it so the opposite link still works
+            self.next_position = self.previous_position = json.dumps(position)
+
+        if self.has_next or self.has_previous:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.previous_position))
+
+    def _unique_ordering(self, ordering, queryset):
+        pk_name = queryset.model._meta.pk.name
+        names = {field.lstrip('-') for field in ordering}
+        if names & {'pk', 'id', pk_name}:
+            return tuple(ordering)
+        descending = ordering[-1].startswith('-')
+        return (*ordering, f'-{pk_name}' if descending else pk_name)
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _seek(ordering, position):
+        """Rows strictly after ``position`` in ``ordering``, compared field by field."""
+        seek = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            seek |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return seek
+
+    def _position(self, instance):
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        # Anything else JSON can't hold (e.g. Decimal) round-trips as a string
+        return json.dumps(values, default=str)
+
+
+class CreatedAtCursorPagination(KeysetCursorPagination):
+    """Keyset pagination over a stable (created_at, id) ordering."""
+
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+class AppliedOnCursorPagination(CreatedAtCursorPagination):
+    """Keyset pagination for job applications, newest first."""
+
+    ordering = ('-applied_on', '-id')
+
+
+class MatchScoreCursorPagination(CreatedAtCursorPagination):
+    """Keyset pagination for job matches, best score first."""
+
+    ordering = ('-match_score', '-id')
+
+
+class AttendanceDateCursorPagination(CreatedAtCursorPagination):
+    """Keyset pagination for attendance records, most recent day first."""
+
+    ordering = ('-date', '-id')
+
+
+class JobCardCursorPagination(CreatedAtCursorPagination):
+    """Keyset pagination for job cards, whose primary key is the job id."""
+
+    ordering = ('-created_at', '-job_id')
+
+
+class DateJoinedCursorPagination(CreatedAtCursorPagination):
+    """Keyset pagination for users, newest sign-ups first."""
+
+    ordering = ('-date_joined', '-id')
+
+
+class KeysetPaginationMixin:
+    """
+    Let list views opt into cursor pagination per request.
+
+    Clients that send ``?cursor=...`` or ``?pagination=cursor`` get keyset
+    pagination, which seeks straight to the next row instead of running a
+    COUNT(*) and a deep OFFSET. Everyone else keeps the default page-number
+    pagination so existing consumers are unaffected.
+    """
+
+    cursor_pagination_class = CreatedAtCursorPagination
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return 'cursor' in params or params.get('pagination') == 'cursor'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                return super().paginator
+        return self._paginator
@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party apps
     'rest_framework',
@@ -156,6 +157,13 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Attendance months past retention are archived here (see attendance.partitions)
+ATTENDANCE_ARCHIVE_DIR = os.path.join(BASE_DIR, 'archives', 'attendance')
+
+# 'rows' stores one EmployeeAvailability row per shift; 'bitmap' stores only
+# the per-month AvailabilityBitmap rows (see employee_management.bitmaps)
+EMPLOYEE_AVAILABILITY_STORAGE = 'rows'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -176,6 +184,12 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
 }
 
+# Token buckets for expensive endpoints (see carechain.throttling)
+TOKEN_BUCKET_THROTTLES = {
+    'search': {'capacity': 30, 'refill_per_minute': 30},
+    'recommendations': {'capacity': 10, 'refill_per_minute': 6},
+}
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -0,0 +1,57 @@
+"""
+Token-bucket request throttling shared across apps.
+"""
+
+from django.conf import settings
+from redis.exceptions import RedisError
+from rest_framework.throttling import BaseThrottle
+
+from .counters import take_token
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Per-user token bucket for expensive endpoints.
+
+    Each scope reads ``capacity`` (burst size) and ``refill_per_minute`` from
+    ``settings.TOKEN_BUCKET_THROTTLES``. Buckets live in Redis and are updated
+    by a single script, so concurrent requests from the same user across
+    workers cannot overdraw them. Anonymous requests are bucketed by client
+    IP. If Redis is unavailable requests are let through.
+    """
+
+    scope = None
+
+    def __init__(self):
+        config = settings.TOKEN_BUCKET_THROTTLES[self.scope]
+        self.capacity = config['capacity']
+        self.refill_rate = config['refill_per_minute'] / 60.0
+        self.tokens_left = self.capacity
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return f'throttle:{self.scope}:{ident}'
+
+    def allow_request(self, request, view):
+        try:
+            allowed, self.tokens_left = take_token(
+                self.get_cache_key(request, view), self.capacity, self.refill_rate
+            )
+        except RedisError:
+            return True
+        return allowed
+
+    def wait(self):
+        """Seconds until the next token is available."""
+        return max(0.0, (1 - self.tokens_left) / self.refill_rate)
+
+
+class SearchThrottle(TokenBucketThrottle):
+    scope = 'search'
+
+
+class RecommendationsThrottle(TokenBucketThrottle):
+    scope = 'recommendations'
@@ -17,5 +17,6 @@ urlpatterns = [
     path('api/admin/', include('admin_api.urls')),
     path('api/employee-management/', include('employee_management.urls')),
     path('api/matching/', include('matching.urls')),
+    path('api/attendance/', include('attendance.urls')),
     # path('api/chat/', include('chat.urls')),  # Commented out until chat app is created
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
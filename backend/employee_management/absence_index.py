@@ -0,0 +1,234 @@
+"""
+Interval index over a hospital's absences.
+
+Approved and pending AbsenceRequests are loaded once per hospital into
+IntervalIndex structures (sorted start and end dates plus a max-end
+segment tree), per department and for the whole hospital. On those:
+
+* how many absences cover a date, or overlap a range, is two bisections;
+* listing the absences that overlap a range costs O((k + 1) log n) for k
+  results;
+* the peak number of concurrent absences in a range is a sweep over only
+  the endpoints inside it.
+
+Indexes are cached per hospital and rebuilt after any AbsenceRequest
+change (see employee_management.signals).
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import AbsenceRequest, Employment
+
+
+INDEX_CACHE_SECONDS = 60 * 60
+
+# Share of a department's headcount that has to be present
+DEFAULT_COVERAGE_THRESHOLD = 0.75
+
+TRACKED_STATUSES = ('approved', 'pending')
+
+
+class IntervalIndex:
+    """Static index over closed date intervals ``(start, end, payload)``."""
+
+    def __init__(self, intervals):
+        self.intervals = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+        self.starts = [interval[0] for interval in self.intervals]
+        self.ends = sorted(interval[1] for interval in self.intervals)
+        # Segment tree over self.intervals holding the latest end in each node
+        size = 1
+        while size < len(self.intervals):
+            size *= 2
+        self.size = size
+        self.max_end = [None] * (2 * size)
+        for position, interval in enumerate(self.intervals):
+            self.max_end[size + position] = interval[1]
+        for node in range(size - 1, 0, -1):
+            children = [end for end in self.max_end[2 * node:2 * node + 2] if end is not None]
+            self.max_end[node] = max(children) if children else None
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def count_on(self, day):
+        """Number of intervals covering ``day``."""
+        return bisect_right(self.starts, day) - bisect_left(self.ends, day)
+
+    def count_overlapping(self, start, end):
+        """Number of intervals sharing at least one day with ``start``..``end``."""
+        return bisect_right(self.starts, end) - bisect_left(self.ends, start)
+
+    def overlapping(self, start, end):
+        """The intervals sharing at least one day with ``start``..``end``."""
+        limit = bisect_right(self.starts, end)
+        found = []
+        if limit:
+            self._collect(1, 0, self.size, limit, start, found)
+        return found
+
+    def _collect(self, node, low, high, limit, start, found):
+        # Only intervals starting by ``end`` (positions < limit) ending on or after ``start``
+        if low >= limit or self.max_end[node] is None or self.max_end[node] < start:
+            return
+        if high - low == 1:
+            found.append(self.intervals[low])
+            return
+        middle = (low + high) // 2
+        self._collect(2 * node, low, middle, limit, start, found)
+        self._collect(2 * node + 1, middle, high, limit, start, found)
+
+    def peak(self, start, end):
+        """Highest number of intervals covering any single day in ``start``..``end``."""
+        active = self.count_on(start)
+        best = active
+        # Coverage only changes where an interval starts, or the day after one ends
+        first_start = bisect_right(self.starts, start)
+        last_start = bisect_right(self.starts, end)
+        first_end = bisect_left(self.ends, start)
+        last_end = bisect_left(self.ends, end)
+        changes = defaultdict(int)
+        for day in self.starts[first_start:last_start]:
+            changes[day] += 1
+        for day in self.ends[first_end:last_end]:
+            changes[day + timedelta(days=1)] -= 1
+        for day in sorted(changes):
+            active += changes[day]
+            best = max(best, active)
+        return best
+
+
+class AbsenceIndex:
+    """IntervalIndexes over one hospital's absences, by status and department."""
+
+    def __init__(self, hospital_id, absences):
+        self.hospital_id = hospital_id
+        grouped = defaultdict(list)
+        for absence_id, employment_id, department, start, end, status in absences:
+            interval = (start, end, (absence_id, employment_id))
+            grouped[(status, department)].append(interval)
+            grouped[(status, None)].append(interval)
+        self.indexes = {key: IntervalIndex(intervals) for key, intervals in grouped.items()}
+
+    def index(self, status='approved', department=None):
+        return self.indexes.get((status, department)) or IntervalIndex([])
+
+    def overlapping(self, start, end, employment_id=None, statuses=TRACKED_STATUSES, exclude_id=None):
+        """``(absence_id, employment_id, status)`` of absences overlapping the range."""
+        found = []
+        for status in statuses:
+            for _, _, (absence_id, absence_employment_id) in self.index(status).overlapping(start, end):
+                if absence_id == exclude_id:
+                    continue
+                if employment_id is None or absence_employment_id == employment_id:
+                    found.append((absence_id, absence_employment_id, status))
+        return found
+
+    def absent_on(self, day, department=None, status='approved'):
+        return self.index(status, department).count_on(day)
+
+    def peak_absent(self, start, end, department=None, status='approved'):
+        return self.index(status, department).peak(start, end)
+
+
+def index_key(hospital_id):
+    return f'employee_management:absence_index:{hospital_id}'
+
+
+def get_absence_index(hospital_id):
+    """The cached AbsenceIndex for a hospital, built with one query when missing."""
+    key = index_key(hospital_id)
+    index = cache.get(key)
+    if index is None:
+        absences = list(
+            AbsenceRequest.objects.filter(
+                employment__hospital_id=hospital_id, status__in=TRACKED_STATUSES
+            ).values_list(
+                'id', 'employment_id', 'employment__department', 'start_date', 'end_date', 'status'
+            )
+        )
+        index = AbsenceIndex(hospital_id, absences)
+        cache.set(key, index, INDEX_CACHE_SECONDS)
+    return index
+
+
+def invalidate_absence_index(hospital_id):
+    cache.delete(index_key(hospital_id))
+
+
+def department_headcounts(hospital_id, start, end):
+    """Active employments per department during ``start``..``end``."""
+    return dict(
+        Employment.objects.filter(
+            hospital_id=hospital_id, status='active', start_date__lte=end
+        ).exclude(end_date__lt=start).values_list('department').annotate(count=Count('id')).order_by()
+    )
+
+
+def approval_warnings(absence_request, threshold=DEFAULT_COVERAGE_THRESHOLD):
+    """
+    Warnings to show before approving ``absence_request``: overlaps with the
+    employee's other absences, and days its department would fall below
+    ``threshold`` coverage.
+    """
+    employment = absence_request.employment
+    start, end = absence_request.start_date, absence_request.end_date
+    index = get_absence_index(employment.hospital_id)
+    warnings = []
+
+    overlaps = index.overlapping(start, end, employment_id=employment.id, exclude_id=absence_request.id)
+    if overlaps:
+        warnings.append({
+            "type": "overlap",
+            "message": f"Overlaps {len(overlaps)} other absence request(s) by this employee",
+            "absence_requests": [absence_id for absence_id, _, _ in overlaps],
+        })
+
+    department = employment.department
+    headcount = department_headcounts(employment.hospital_id, start, end).get(department, 0)
+    if headcount:
+        already_approved = absence_request.status == 'approved'
+        peak = index.peak_absent(start, end, department) + (0 if already_approved else 1)
+        coverage = (headcount - peak) / headcount
+        if coverage < threshold:
+            warnings.append({
+                "type": "coverage",
+                "message": (
+                    f"{department} would have {headcount - peak} of {headcount} staff present "
+                    f"({coverage:.0%}), below the {threshold:.0%} threshold"
+                ),
+                "department": department,
+                "headcount": headcount,
+                "peak_absent": peak,
+            })
+    return warnings
+
+
+def coverage_report(hospital_id, start, end, threshold=DEFAULT_COVERAGE_THRESHOLD, department=None):
+    """Daily headcount, approved and pending absences and coverage per department."""
+    index = get_absence_index(hospital_id)
+    headcounts = department_headcounts(hospital_id, start, end)
+    if department:
+        headcounts = {name: count for name, count in headcounts.items() if name == department}
+
+    report = []
+    for name, headcount in sorted(headcounts.items()):
+        days = []
+        day = start
+        while day <= end:
+            absent = index.absent_on(day, name)
+            coverage = (headcount - absent) / headcount if headcount else 1.0
+            days.append({
+                "date": day,
+                "absent": absent,
+                "pending": index.absent_on(day, name, status='pending'),
+                "coverage": round(coverage, 3),
+                "below_threshold": coverage < threshold,
+            })
+            day += timedelta(days=1)
+        report.append({"department": name, "headcount": headcount, "days": days})
+    return report
@@ -1,6 +1,6 @@
 # Django admin integration for employee management models
 from django.contrib import admin
-from .models import Employment, EmployeeAvailability, EmployeePerformance, AbsenceRequest
+from .models import Employment, EmployeeAvailability, EmployeePerformance, AbsenceRequest, AvailabilityBitmap
 
 
 @admin.register(Employment)
@@ -18,6 +18,13 @@ class EmployeeAvailabilityAdmin(admin.ModelAdmin):
     search_fields = ['employment__employee__first_name', 'employment__employee__last_name']
 
 
+@admin.register(AvailabilityBitmap)
+class AvailabilityBitmapAdmin(admin.ModelAdmin):
+    list_display = ['employment', 'month', 'shift']
+    list_filter = ['shift', 'month']
+    search_fields = ['employment__employee__first_name', 'employment__employee__last_name']
+
+
 @admin.register(EmployeePerformance)
 class EmployeePerformanceAdmin(admin.ModelAdmin):
     list_display = ['employment', 'review_date', 'review_type', 'overall_rating']
@@ -5,3 +5,6 @@ class EmployeeManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employee_management'
     verbose_name = 'Employee Management'
+
+    def ready(self):
+        import employee_management.signals  # noqa
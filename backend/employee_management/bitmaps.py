@@ -0,0 +1,208 @@
+"""
+Bitmap storage for employee availability.
+
+AvailabilityBitmap keeps one row per (employment, month, shift) with a
+31-bit day mask per status, instead of one EmployeeAvailability row per
+(employment, date, shift). Status changes are single atomic UPDATEs that
+clear the day's bit in every mask and set it in one.
+
+``settings.EMPLOYEE_AVAILABILITY_STORAGE`` picks the source of truth:
+
+* ``'rows'`` (default): EmployeeAvailability rows are stored as before and
+  mirrored into the bitmaps by employee_management.signals;
+* ``'bitmap'``: the availability API writes bitmaps only and lists rows
+  expanded from them (``notes`` are not kept in this mode).
+
+Either way the bitmaps answer roster and "who is free" queries.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef, Q
+
+from .models import AbsenceRequest, AvailabilityBitmap, Employment, EmployeeAvailability
+
+
+STATUS_FIELDS = {
+    'available': 'available_days',
+    'unavailable': 'unavailable_days',
+    'busy': 'busy_days',
+    'on_leave': 'on_leave_days',
+}
+BLOCKING_FIELDS = ['unavailable_days', 'busy_days', 'on_leave_days']
+
+
+def bitmap_storage():
+    """True when bitmaps, not EmployeeAvailability rows, are the source of truth."""
+    return getattr(settings, 'EMPLOYEE_AVAILABILITY_STORAGE', 'rows') == 'bitmap'
+
+
+def day_bit(day):
+    return 1 << (day.day - 1)
+
+
+def month_masks(dates):
+    """Group dates into ``{first_of_month: day_mask}``."""
+    masks = defaultdict(int)
+    for day in dates:
+        masks[day.replace(day=1)] |= day_bit(day)
+    return dict(masks)
+
+
+def iter_days(month, mask):
+    """Yield the dates of ``month`` whose bits are set in ``mask``."""
+    day_number = 1
+    while mask:
+        if mask & 1:
+            yield month.replace(day=day_number)
+        mask >>= 1
+        day_number += 1
+
+
+def set_status(employment_id, day, shift, status):
+    """Record ``status`` for one (employment, date, shift) cell."""
+    _update_cell(employment_id, day, shift, STATUS_FIELDS[status])
+
+
+def clear_status(employment_id, day, shift):
+    """Forget whatever was recorded for one cell."""
+    _update_cell(employment_id, day, shift, None)
+
+
+def _update_cell(employment_id, day, shift, field):
+    month = day.replace(day=1)
+    bit = day_bit(day)
+    if field is not None:
+        AvailabilityBitmap.objects.bulk_create(
+            [AvailabilityBitmap(employment_id=employment_id, month=month, shift=shift)],
+            ignore_conflicts=True,
+        )
+    updates = {name: F(name).bitand(~bit) for name in STATUS_FIELDS.values()}
+    if field is not None:
+        updates[field] = F(field).bitand(~bit).bitor(bit)
+    AvailabilityBitmap.objects.filter(
+        employment_id=employment_id, month=month, shift=shift
+    ).update(**updates)
+
+
+def cell_status(employment_id, day, shift):
+    """The status recorded for one cell, or None when nothing is recorded."""
+    masks = AvailabilityBitmap.objects.filter(
+        employment_id=employment_id, month=day.replace(day=1), shift=shift
+    ).values_list(*STATUS_FIELDS.values()).first()
+    for status, mask in zip(STATUS_FIELDS, masks or ()):
+        if mask & day_bit(day):
+            return status
+    return None
+
+
+def iter_records(employment_ids, start, end):
+    """
+    Yield ``(employment_id, date, shift, status)`` for every recorded cell
+    between ``start`` and ``end``, like EmployeeAvailability rows.
+    """
+    bitmaps = AvailabilityBitmap.objects.filter(
+        employment_id__in=employment_ids, month__gte=start.replace(day=1), month__lte=end
+    ).values_list('employment_id', 'month', 'shift', *STATUS_FIELDS.values())
+    for employment_id, month, shift, *masks in bitmaps.iterator(chunk_size=2000):
+        for status, mask in zip(STATUS_FIELDS, masks):
+            for day in iter_days(month, mask):
+                if start <= day <= end:
+                    yield employment_id, day, shift, status
+
+
+def free_for_shift(employment_ids, shift, dates):
+    """
+    Return the ids among ``employment_ids`` with nothing blocking ``shift``
+    on any of ``dates``.
+
+    A cell is blocked when its shift is marked unavailable, busy or on
+    leave, or when the whole day is and the shift itself is not marked
+    available, matching how the roster resolves full-day records. An
+    approved AbsenceRequest covering any of the dates blocks every shift,
+    as it does on the roster.
+    """
+    masks = month_masks(dates)
+    shifts = {shift, 'full_day'}
+    rows = AvailabilityBitmap.objects.filter(
+        employment_id__in=employment_ids, month__in=masks, shift__in=shifts
+    ).values_list('employment_id', 'month', 'shift', 'available_days', *BLOCKING_FIELDS)
+
+    cells = defaultdict(dict)
+    for employment_id, month, row_shift, available, *blocking in rows:
+        blocked = 0
+        for mask in blocking:
+            blocked |= mask
+        cells[(employment_id, month)][row_shift] = (available, blocked)
+
+    blocked_ids = set()
+    for (employment_id, month), by_shift in cells.items():
+        own_available, own_blocked = by_shift.get(shift, (0, 0))
+        _, day_blocked = by_shift.get('full_day', (0, 0))
+        if shift == 'full_day':
+            blocked = own_blocked
+        else:
+            blocked = own_blocked | (day_blocked & ~own_available)
+        if blocked & masks[month]:
+            blocked_ids.add(employment_id)
+
+    covering = Q()
+    for day in dates:
+        covering |= Q(start_date__lte=day, end_date__gte=day)
+    blocked_ids.update(
+        Employment.objects.filter(id__in=employment_ids).filter(
+            Exists(AbsenceRequest.objects.filter(employment=OuterRef('pk'), status='approved').filter(covering))
+        ).values_list('id', flat=True)
+    )
+    return [employment_id for employment_id in employment_ids if employment_id not in blocked_ids]
+
+
+def rebuild_bitmaps(employments=None):
+    """
+    Rebuild bitmaps from EmployeeAvailability rows, for all employments or
+    the given queryset. Returns the number of bitmaps written.
+
+    Only meaningful while rows are the source of truth; in bitmap mode the
+    bitmaps hold availability the rows do not have.
+    """
+    rows = EmployeeAvailability.objects.all()
+    bitmaps = AvailabilityBitmap.objects.all()
+    if employments is not None:
+        rows = rows.filter(employment__in=employments)
+        bitmaps = bitmaps.filter(employment__in=employments)
+
+    masks = defaultdict(lambda: dict.fromkeys(STATUS_FIELDS.values(), 0))
+    for employment_id, day, shift, status in rows.values_list(
+        'employment_id', 'date', 'shift', 'status'
+    ).iterator(chunk_size=5000):
+        masks[(employment_id, day.replace(day=1), shift)][STATUS_FIELDS[status]] |= day_bit(day)
+
+    bitmaps.delete()
+    AvailabilityBitmap.objects.bulk_create(
+        [
+            AvailabilityBitmap(employment_id=employment_id, month=month, shift=shift, **fields)
+            for (employment_id, month, shift), fields in masks.items()
+        ],
+        batch_size=2000,
+    )
+    return len(masks)
+
+
+def expand_rows(bitmaps, start=None, end=None):
+    """
+    Expand AvailabilityBitmap instances (with ``employment`` loaded) into
+    unsaved EmployeeAvailability instances, so the row API and its
+    serializer keep working in bitmap mode.
+    """
+    rows = []
+    for bitmap in bitmaps:
+        for status, field in STATUS_FIELDS.items():
+            for day in iter_days(bitmap.month, getattr(bitmap, field)):
+                if (start and day < start) or (end and day > end):
+                    continue
+                rows.append(EmployeeAvailability(
+                    employment=bitmap.employment, date=day, shift=bitmap.shift, status=status
+                ))
+    rows.sort(key=lambda row: (row.date, row.employment_id, row.shift), reverse=True)
+    return rows
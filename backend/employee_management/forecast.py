@@ -0,0 +1,136 @@
+"""
+Staffing coverage forecast per department and shift.
+
+The hospital's roster (see employee_management.roster) is turned into an
+employees x days x shifts NumPy grid of status codes and summed per
+department, giving available headcount for every (date, shift). Required
+headcount is the share of the department's staff that has to be present
+(the coverage threshold shared with the absence checks). Open jobs, i.e.
+active and unfilled ones running on a date, are placed on the same grid
+by shift start time.
+
+A shift is flagged as needing auto-fill when it is short of staff and no
+open ``auto_fill_enabled`` job is there to cover the gap. Forecasts are
+cached per hospital and parameters for a few minutes.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Q
+
+from jobs.models import Job
+from .absence_index import DEFAULT_COVERAGE_THRESHOLD
+from .roster import AVAILABLE, NOT_EMPLOYED, SHIFTS, build_roster
+
+
+FORECAST_SHIFTS = ['morning', 'evening', 'night']
+FORECAST_CACHE_SECONDS = 15 * 60
+MAX_FORECAST_WEEKS = 12
+
+
+def job_shifts(shift_start_time):
+    """Forecast shifts a job covers, judged by when it starts."""
+    if shift_start_time is None:
+        return FORECAST_SHIFTS
+    if 5 <= shift_start_time.hour < 12:
+        return ['morning']
+    if 12 <= shift_start_time.hour < 20:
+        return ['evening']
+    return ['night']
+
+
+def compute_forecast(hospital_id, start, weeks, threshold=DEFAULT_COVERAGE_THRESHOLD):
+    """
+    Required, available and open-job headcount per department for every
+    (date, shift) of ``weeks`` weeks from ``start``, with the shifts that
+    need auto-fill. Grids are indexed ``[date][shift]`` in ``FORECAST_SHIFTS`` order.
+    """
+    day_count = weeks * 7
+    end = start + timedelta(days=day_count - 1)
+    dates = [start + timedelta(days=offset) for offset in range(day_count)]
+    shift_columns = [SHIFTS.index(shift) for shift in FORECAST_SHIFTS]
+
+    employments, _, matrix = build_roster(hospital_id, start, end)
+    open_jobs = list(
+        Job.objects.filter(
+            employer__hospital_id=hospital_id, is_active=True, is_filled=False, start_date__lte=end
+        ).filter(Q(end_date__isnull=True) | Q(end_date__gte=start)).values_list(
+            'department', 'shift_start_time', 'start_date', 'end_date', 'auto_fill_enabled'
+        )
+    )
+
+    departments = sorted(
+        {employment['department'] for employment in employments} | {job[0] for job in open_jobs}
+    )
+    department_index = {name: index for index, name in enumerate(departments)}
+    grid_shape = (len(departments), day_count, len(FORECAST_SHIFTS))
+
+    available = np.zeros(grid_shape, dtype=np.int32)
+    employed = np.zeros(grid_shape[:2], dtype=np.int32)
+    if employments:
+        codes = np.frombuffer(''.join(matrix).encode('ascii'), dtype=np.uint8)
+        codes = codes.reshape(len(employments), day_count, len(SHIFTS))[:, :, shift_columns]
+        rows = np.array([department_index[employment['department']] for employment in employments])
+        np.add.at(available, rows, (codes == ord(AVAILABLE)).astype(np.int32))
+        np.add.at(employed, rows, (codes[:, :, 0] != ord(NOT_EMPLOYED)).astype(np.int32))
+
+    open_positions = np.zeros(grid_shape, dtype=np.int32)
+    auto_fill_positions = np.zeros(grid_shape, dtype=np.int32)
+    for department, shift_start_time, job_start, job_end, auto_fill_enabled in open_jobs:
+        first = max((job_start - start).days, 0)
+        last = day_count if job_end is None else min((job_end - start).days + 1, day_count)
+        columns = [FORECAST_SHIFTS.index(shift) for shift in job_shifts(shift_start_time)]
+        open_positions[department_index[department], first:last, columns] += 1
+        if auto_fill_enabled:
+            auto_fill_positions[department_index[department], first:last, columns] += 1
+
+    required = np.ceil(employed[:, :, None] * threshold).astype(np.int32)
+    required = np.broadcast_to(required, grid_shape)
+    gap = np.clip(required - available, 0, None)
+    needs_auto_fill = gap > auto_fill_positions
+
+    forecast = []
+    for index, department in enumerate(departments):
+        flagged = np.argwhere(needs_auto_fill[index])
+        forecast.append({
+            "department": department,
+            "headcount": employed[index].tolist(),
+            "required": required[index].tolist(),
+            "available": available[index].tolist(),
+            "gap": gap[index].tolist(),
+            "open_jobs": open_positions[index].tolist(),
+            "auto_fill_jobs": auto_fill_positions[index].tolist(),
+            "needs_auto_fill": [
+                {
+                    "date": dates[day],
+                    "shift": FORECAST_SHIFTS[shift],
+                    "gap": int(gap[index, day, shift] - auto_fill_positions[index, day, shift]),
+                }
+                for day, shift in flagged.tolist()
+            ],
+        })
+
+    return {
+        "start": start,
+        "end": end,
+        "dates": dates,
+        "shifts": FORECAST_SHIFTS,
+        "threshold": threshold,
+        "departments": forecast,
+    }
+
+
+def forecast_key(hospital_id, start, weeks, threshold):
+    return f'employee_management:forecast:{hospital_id}:{start}:{weeks}:{threshold}'
+
+
+def get_forecast(hospital_id, start, weeks, threshold=DEFAULT_COVERAGE_THRESHOLD, refresh=False):
+    """The cached forecast for a hospital, computed when missing."""
+    key = forecast_key(hospital_id, start, weeks, threshold)
+    forecast = None if refresh else cache.get(key)
+    if forecast is None:
+        forecast = compute_forecast(hospital_id, start, weeks, threshold)
+        cache.set(key, forecast, FORECAST_CACHE_SECONDS)
+    return forecast
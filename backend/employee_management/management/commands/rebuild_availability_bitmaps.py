@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from employee_management.bitmaps import bitmap_storage, rebuild_bitmaps
+from employee_management.models import EmployeeAvailability
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the availability bitmaps from EmployeeAvailability rows, or, once '
+        'EMPLOYEE_AVAILABILITY_STORAGE is "bitmap", delete the rows they replaced'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete-rows', action='store_true',
+            help='In bitmap storage mode, delete the EmployeeAvailability rows kept from row mode'
+        )
+
+    def handle(self, *args, **options):
+        if not bitmap_storage():
+            if options['delete_rows']:
+                raise CommandError("Rows are the source of truth; switch to bitmap storage before deleting them")
+            self.stdout.write("Rebuilding availability bitmaps...")
+            with transaction.atomic():
+                written = rebuild_bitmaps()
+            self.stdout.write(self.style.SUCCESS(f"Wrote {written} availability bitmaps"))
+            return
+
+        if not options['delete_rows']:
+            raise CommandError("Bitmaps are the source of truth; there is nothing to rebuild them from")
+        # Deleted directly: the post_delete signal would clear the bitmaps too
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {connection.ops.quote_name(EmployeeAvailability._meta.db_table)}')
+            deleted = cursor.rowcount
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} availability rows now held in bitmaps"))
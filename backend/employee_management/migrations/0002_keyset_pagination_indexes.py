@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_management', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employment',
+            index=models.Index(fields=['hospital', '-created_at', '-id'], name='employee_ma_hospita_379f3c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employment',
+            index=models.Index(fields=['employee', '-created_at', '-id'], name='employee_ma_employe_e85ccd_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:40
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+STATUS_FIELDS = {
+    'available': 'available_days',
+    'unavailable': 'unavailable_days',
+    'busy': 'busy_days',
+    'on_leave': 'on_leave_days',
+}
+
+
+def build_bitmaps(apps, schema_editor):
+    EmployeeAvailability = apps.get_model('employee_management', 'EmployeeAvailability')
+    AvailabilityBitmap = apps.get_model('employee_management', 'AvailabilityBitmap')
+
+    masks = defaultdict(lambda: dict.fromkeys(STATUS_FIELDS.values(), 0))
+    rows = EmployeeAvailability.objects.values_list('employment_id', 'date', 'shift', 'status')
+    for employment_id, day, shift, status in rows.iterator(chunk_size=5000):
+        masks[(employment_id, day.replace(day=1), shift)][STATUS_FIELDS[status]] |= 1 << (day.day - 1)
+
+    AvailabilityBitmap.objects.bulk_create(
+        [
+            AvailabilityBitmap(employment_id=employment_id, month=month, shift=shift, **fields)
+            for (employment_id, month, shift), fields in masks.items()
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_management', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvailabilityBitmap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('shift', models.CharField(choices=[('morning', 'Morning Shift'), ('evening', 'Evening Shift'), ('night', 'Night Shift'), ('full_day', 'Full Day')], max_length=20)),
+                ('available_days', models.IntegerField(default=0)),
+                ('unavailable_days', models.IntegerField(default=0)),
+                ('busy_days', models.IntegerField(default=0)),
+                ('on_leave_days', models.IntegerField(default=0)),
+                ('employment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_bitmaps', to='employee_management.employment')),
+            ],
+            options={
+                'unique_together': {('employment', 'month', 'shift')},
+            },
+        ),
+        migrations.RunPython(build_bitmaps, migrations.RunPython.noop),
+    ]
@@ -52,6 +52,10 @@ class Employment(models.Model):
     
     class Meta:
         unique_together = ('employee', 'employer', 'job_title', 'start_date')
+        indexes = [
+            models.Index(fields=['hospital', '-created_at', '-id']),
+            models.Index(fields=['employee', '-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.employee.full_name} - {self.job_title} at {self.hospital.name}"
@@ -92,6 +96,42 @@ class EmployeeAvailability(models.Model):
     
     def __str__(self):
         return f"{self.employment.employee.full_name} - {self.date} {self.shift}: {self.status}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the cell this row occupies so moves can be mirrored into the bitmaps
+        if all(name in field_names for name in ('employment_id', 'date', 'shift')):
+            instance._loaded_cell = (instance.employment_id, instance.date, instance.shift)
+        return instance
+
+
+class AvailabilityBitmap(models.Model):
+    """
+    One employment's availability for one shift over one month.
+    
+    Each status has a bitmask of days: bit ``d - 1`` is set when the status
+    applies on day ``d`` of ``month``. Days without any bit set have no
+    record and count as available.
+    """
+    
+    employment = models.ForeignKey(
+        Employment,
+        on_delete=models.CASCADE,
+        related_name='availability_bitmaps'
+    )
+    month = models.DateField()  # First day of the month
+    shift = models.CharField(max_length=20, choices=EmployeeAvailability.SHIFT_CHOICES)
+    available_days = models.IntegerField(default=0)
+    unavailable_days = models.IntegerField(default=0)
+    busy_days = models.IntegerField(default=0)
+    on_leave_days = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ('employment', 'month', 'shift')
+    
+    def __str__(self):
+        return f"{self.employment_id} - {self.month:%Y-%m} {self.shift}"
 
 
 class EmployeePerformance(models.Model):
@@ -0,0 +1,114 @@
+"""
+Hospital-wide availability roster.
+
+A roster is an employees x dates x shifts matrix built from three queries:
+active employments, their availability in the range (EmployeeAvailability
+rows, or AvailabilityBitmap rows in bitmap storage mode), and their
+approved AbsenceRequests overlapping it. Each employee's row is
+encoded as one string with a status code per (date, shift) cell, in date
+order and then shift order, so cell ``(d, s)`` is at ``d * len(SHIFTS) + s``.
+
+A ``full_day`` availability record applies to every shift of its date
+unless that shift has its own record. An approved absence overrides
+availability, and dates outside the employment are marked as such.
+Dates without any record are available, as in CheckEmployeeAvailabilityView.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Q
+
+from .bitmaps import bitmap_storage, iter_records
+from .models import AbsenceRequest, EmployeeAvailability, Employment
+
+
+SHIFTS = [shift for shift, _ in EmployeeAvailability.SHIFT_CHOICES]
+
+AVAILABLE = 'A'
+ABSENT = 'X'
+NOT_EMPLOYED = '-'
+STATUS_CODES = {
+    'available': AVAILABLE,
+    'unavailable': 'U',
+    'busy': 'B',
+    'on_leave': 'L',
+}
+CODES = {
+    **{code: status for status, code in STATUS_CODES.items()},
+    ABSENT: 'approved_absence',
+    NOT_EMPLOYED: 'not_employed',
+}
+
+MAX_ROSTER_DAYS = 62
+
+
+def build_roster(hospital_id, start, end, department=None):
+    """
+    Return ``(employments, dates, matrix)`` for a hospital between ``start``
+    and ``end`` inclusive, where ``matrix[i]`` is the encoded row of
+    ``employments[i]``.
+    """
+    day_count = (end - start).days + 1
+    dates = [start + timedelta(days=offset) for offset in range(day_count)]
+    width = len(SHIFTS)
+    shift_index = {shift: index for index, shift in enumerate(SHIFTS)}
+    full_day = shift_index['full_day']
+
+    employments = Employment.objects.filter(
+        hospital_id=hospital_id, status='active', start_date__lte=end
+    ).filter(Q(end_date__isnull=True) | Q(end_date__gte=start))
+    if department:
+        employments = employments.filter(department__iexact=department)
+    employments = list(
+        employments.order_by('department', 'employee__first_name', 'employee__last_name', 'id').values(
+            'id', 'employee_id', 'employee__first_name', 'employee__last_name',
+            'department', 'job_title', 'start_date', 'end_date',
+        )
+    )
+    row_of = {employment['id']: row for row, employment in enumerate(employments)}
+
+    # Everyone starts available; dates outside an employment are blanked out
+    cells = []
+    for employment in employments:
+        row = bytearray(AVAILABLE * (day_count * width), 'ascii')
+        first = max((employment['start_date'] - start).days, 0)
+        last = day_count - 1 if employment['end_date'] is None else min((employment['end_date'] - start).days, day_count - 1)
+        row[:first * width] = NOT_EMPLOYED.encode() * (first * width)
+        row[(last + 1) * width:] = NOT_EMPLOYED.encode() * ((day_count - last - 1) * width)
+        cells.append(row)
+
+    if not employments:
+        return employments, dates, []
+
+    # Full-day records first, so shift-specific records override them
+    if bitmap_storage():
+        availability = iter_records(list(row_of), start, end)
+    else:
+        availability = EmployeeAvailability.objects.filter(
+            employment_id__in=list(row_of), date__gte=start, date__lte=end
+        ).values_list('employment_id', 'date', 'shift', 'status')
+    ordered = sorted(availability, key=lambda record: record[2] != 'full_day')
+    for employment_id, day, shift, availability_status in ordered:
+        row = cells[row_of[employment_id]]
+        offset = (day - start).days * width
+        if row[offset] == ord(NOT_EMPLOYED):
+            continue
+        code = ord(STATUS_CODES.get(availability_status, AVAILABLE))
+        index = shift_index.get(shift, full_day)
+        if index == full_day:
+            row[offset:offset + width] = bytes([code]) * width
+        else:
+            row[offset + index] = code
+
+    absences = AbsenceRequest.objects.filter(
+        employment_id__in=list(row_of), status='approved', start_date__lte=end, end_date__gte=start
+    ).values_list('employment_id', 'start_date', 'end_date')
+    for employment_id, absence_start, absence_end in absences:
+        row = cells[row_of[employment_id]]
+        first = max((absence_start - start).days, 0)
+        last = min((absence_end - start).days, day_count - 1)
+        for offset in range(first * width, (last + 1) * width):
+            if row[offset] != ord(NOT_EMPLOYED):
+                row[offset] = ord(ABSENT)
+
+    return employments, dates, [row.decode('ascii') for row in cells]
@@ -0,0 +1,33 @@
+"""
+Signal handlers for the employee management app.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import AbsenceRequest, EmployeeAvailability, Employment
+from . import bitmaps
+from .absence_index import invalidate_absence_index
+
+
+@receiver(post_save, sender=EmployeeAvailability)
+def mirror_availability_into_bitmap(sender, instance, **kwargs):
+    """Keep the availability bitmaps in step with the row store."""
+    cell = (instance.employment_id, instance.date, instance.shift)
+    previous = getattr(instance, '_loaded_cell', None)
+    if previous is not None and previous != cell:
+        bitmaps.clear_status(*previous)
+    bitmaps.set_status(*cell, instance.status)
+    instance._loaded_cell = cell
+
+
+@receiver(post_delete, sender=EmployeeAvailability)
+def clear_availability_from_bitmap(sender, instance, **kwargs):
+    bitmaps.clear_status(instance.employment_id, instance.date, instance.shift)
+
+
+@receiver(post_save, sender=AbsenceRequest)
+@receiver(post_delete, sender=AbsenceRequest)
+def invalidate_absence_index_for_request(sender, instance, **kwargs):
+    hospital_id = Employment.objects.filter(pk=instance.employment_id).values_list('hospital_id', flat=True).first()
+    if hospital_id is not None:
+        invalidate_absence_index(hospital_id)
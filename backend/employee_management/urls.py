@@ -8,9 +8,13 @@ from .views import (
     EmploymentDetailView,
     EmployeeAvailabilityListCreateView,
     CheckEmployeeAvailabilityView,
+    RosterView,
+    FreeForShiftView,
     EmployeePerformanceListCreateView,
     AbsenceRequestListCreateView,
     AbsenceApprovalView,
+    AbsenceCoverageReportView,
+    StaffingForecastView,
 )
 
 app_name = 'employee_management'
@@ -23,6 +27,8 @@ urlpatterns = [
     # Employee availability
     path('availability/', EmployeeAvailabilityListCreateView.as_view(), name='availability-list-create'),
     path('availability/check/', CheckEmployeeAvailabilityView.as_view(), name='check-availability'),
+    path('availability/roster/', RosterView.as_view(), name='availability-roster'),
+    path('availability/free/', FreeForShiftView.as_view(), name='availability-free'),
     
     # Performance reviews
     path('performance/', EmployeePerformanceListCreateView.as_view(), name='performance-list-create'),
@@ -30,4 +36,8 @@ urlpatterns = [
     # Absence requests
     path('absence-requests/', AbsenceRequestListCreateView.as_view(), name='absence-list-create'),
     path('absence-requests/<int:pk>/approve/', AbsenceApprovalView.as_view(), name='absence-approval'),
+    path('absence-requests/coverage/', AbsenceCoverageReportView.as_view(), name='absence-coverage'),
+    
+    # Staffing forecast
+    path('staffing/forecast/', StaffingForecastView.as_view(), name='staffing-forecast'),
 ]
\ No newline at end of file
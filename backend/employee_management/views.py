@@ -2,6 +2,8 @@
 Views for employee management.
 """
 
+from datetime import timedelta
+
 from rest_framework import generics, permissions, status, filters
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -9,18 +11,24 @@ from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Avg
 from django.utils import timezone
-from .models import Employment, EmployeeAvailability, EmployeePerformance, AbsenceRequest
+from django.utils.dateparse import parse_date
+from .models import Employment, EmployeeAvailability, EmployeePerformance, AbsenceRequest, AvailabilityBitmap
 from profiles.models import CandidateProfile, RecruiterProfile, Hospital
 from jobs.models import CompletedJob
+from carechain.pagination import KeysetPaginationMixin
 from .serializers import (
     EmploymentSerializer,
     EmployeeAvailabilitySerializer,
     EmployeePerformanceSerializer,
     AbsenceRequestSerializer,
 )
+from .absence_index import DEFAULT_COVERAGE_THRESHOLD, approval_warnings, coverage_report
+from .forecast import MAX_FORECAST_WEEKS, get_forecast
+from .bitmaps import bitmap_storage, cell_status, expand_rows, free_for_shift, set_status
+from .roster import CODES, MAX_ROSTER_DAYS, SHIFTS, build_roster
 
 
-class EmploymentListCreateView(generics.ListCreateAPIView):
+class EmploymentListCreateView(KeysetPaginationMixin, generics.ListCreateAPIView):
     """View for listing and creating employment records."""
     
     serializer_class = EmploymentSerializer
@@ -131,7 +139,14 @@ class EmploymentDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 class EmployeeAvailabilityListCreateView(generics.ListCreateAPIView):
-    """View for listing and creating employee availability."""
+    """
+    View for listing and creating employee availability.
+    
+    In bitmap storage mode (``EMPLOYEE_AVAILABILITY_STORAGE = 'bitmap'``)
+    records are written to the availability bitmaps and listed as rows
+    expanded from them; ``?month=YYYY-MM`` (default: this month) or
+    ``?date=`` bounds the listing.
+    """
     
     serializer_class = EmployeeAvailabilitySerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -154,6 +169,60 @@ class EmployeeAvailabilityListCreateView(generics.ListCreateAPIView):
             ).order_by('-date')
         else:
             return EmployeeAvailability.objects.all().order_by('-date')
+    
+    def list(self, request, *args, **kwargs):
+        if not bitmap_storage():
+            return super().list(request, *args, **kwargs)
+        
+        params = request.query_params
+        try:
+            if params.get('date'):
+                start = end = parse_date(params['date'])
+            else:
+                month = parse_date(f"{params['month']}-01") if params.get('month') else timezone.localdate()
+                start = end = None
+                if month is not None:
+                    start = month.replace(day=1)
+                    end = (start + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+        except ValueError:
+            start = end = None
+        if start is None:
+            return Response(
+                {"error": "date must be YYYY-MM-DD and month YYYY-MM"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Same visibility as the row store, applied to the bitmaps
+        user = request.user
+        if user.is_recruiter:
+            employments = Employment.objects.filter(hospital__recruiters__user=user)
+        elif user.is_candidate:
+            employments = Employment.objects.filter(employee__user=user)
+        else:
+            employments = Employment.objects.all()
+        bitmaps = AvailabilityBitmap.objects.filter(
+            employment__in=employments, month=start.replace(day=1)
+        ).select_related('employment__employee', 'employment__hospital')
+        
+        rows = [
+            row for row in expand_rows(bitmaps, start, end)
+            if all(not params.get(field) or getattr(row, field) == params[field] for field in ('status', 'shift'))
+        ]
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(rows, many=True).data)
+    
+    def perform_create(self, serializer):
+        if not bitmap_storage():
+            serializer.save()
+            return
+        data = serializer.validated_data
+        set_status(data['employment'].id, data['date'], data['shift'], data['status'])
+        # Nothing is saved as a row; respond with the record as it now reads back
+        serializer.instance = EmployeeAvailability(
+            employment=data['employment'], date=data['date'], shift=data['shift'], status=data['status']
+        )
 
 
 class CheckEmployeeAvailabilityView(APIView):
@@ -197,11 +266,16 @@ class CheckEmployeeAvailabilityView(APIView):
                 )
             
             # Check availability
-            availability = EmployeeAvailability.objects.filter(
-                employment=employment,
-                date=date,
-                shift=shift
-            ).first()
+            if bitmap_storage():
+                day = parse_date(date)
+                recorded = cell_status(employment.id, day, shift) if day else None
+                availability = EmployeeAvailability(status=recorded) if recorded else None
+            else:
+                availability = EmployeeAvailability.objects.filter(
+                    employment=employment,
+                    date=date,
+                    shift=shift
+                ).first()
             
             if availability:
                 available = availability.status == 'available'
@@ -229,6 +303,134 @@ class CheckEmployeeAvailabilityView(APIView):
             )
 
 
+class FreeForShiftView(APIView):
+    """
+    View listing the hospital's active employees free for a shift on every
+    given date, answered with bitwise tests on the availability bitmaps.
+    
+    Query with ``?shift=night&dates=2026-11-01,2026-11-02`` and optionally
+    ``?department=``.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        if not request.user.is_recruiter:
+            return Response(
+                {"error": "Only recruiters can check availability"}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        shift = request.query_params.get('shift', 'full_day')
+        try:
+            dates = [parse_date(value) for value in request.query_params.get('dates', '').split(',') if value]
+        except ValueError:
+            dates = [None]
+        if shift not in dict(EmployeeAvailability.SHIFT_CHOICES) or not dates or None in dates:
+            return Response(
+                {"error": "A valid shift and comma-separated YYYY-MM-DD dates are required"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        employments = Employment.objects.filter(
+            hospital__recruiters__user=request.user,
+            status='active',
+            start_date__lte=min(dates),
+        ).filter(Q(end_date__isnull=True) | Q(end_date__gte=max(dates)))
+        if request.query_params.get('department'):
+            employments = employments.filter(department__iexact=request.query_params['department'])
+        employments = {
+            employment['id']: employment
+            for employment in employments.values(
+                'id', 'employee_id', 'employee__first_name', 'employee__last_name', 'department', 'job_title'
+            )
+        }
+        
+        free_ids = free_for_shift(list(employments), shift, dates)
+        
+        return Response({
+            "shift": shift,
+            "dates": sorted(dates),
+            "employees": [
+                {
+                    "employment_id": employment_id,
+                    "employee_id": employments[employment_id]['employee_id'],
+                    "name": f"{employments[employment_id]['employee__first_name']} {employments[employment_id]['employee__last_name']}",
+                    "department": employments[employment_id]['department'],
+                    "job_title": employments[employment_id]['job_title'],
+                }
+                for employment_id in free_ids
+            ],
+        }, status=status.HTTP_200_OK)
+
+
+class RosterView(APIView):
+    """
+    View for a hospital's availability roster over a date range.
+    
+    Returns an employees x dates x shifts matrix: ``matrix[i]`` is a string
+    of status codes for ``employees[i]``, one per (date, shift) cell in date
+    order and then ``shifts`` order. ``codes`` maps each code to its status.
+    Filter with ``?start=``, ``?end=`` (default: the week from today) and
+    ``?department=``; admins pass ``?hospital=<id>``.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        params = request.query_params
+        
+        if request.user.is_recruiter:
+            hospital_id = RecruiterProfile.objects.filter(
+                user=request.user
+            ).values_list('hospital_id', flat=True).first()
+        elif request.user.is_staff or request.user.is_superuser:
+            hospital_id = params.get('hospital')
+        else:
+            return Response(
+                {"error": "Only recruiters can view the roster"}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        try:
+            start = parse_date(params['start']) if params.get('start') else timezone.localdate()
+            end = parse_date(params['end']) if params.get('end') else start + timedelta(days=6)
+            hospital_id = int(hospital_id) if hospital_id else None
+        except ValueError:
+            start = end = None
+        if not hospital_id or start is None or end is None or start > end:
+            return Response(
+                {"error": "A hospital and valid start <= end dates are required"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (end - start).days + 1 > MAX_ROSTER_DAYS:
+            return Response(
+                {"error": f"Rosters are limited to {MAX_ROSTER_DAYS} days"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        employments, dates, matrix = build_roster(hospital_id, start, end, params.get('department'))
+        
+        return Response({
+            "start": start,
+            "end": end,
+            "dates": dates,
+            "shifts": SHIFTS,
+            "codes": CODES,
+            "employees": [
+                {
+                    "employment_id": employment['id'],
+                    "employee_id": employment['employee_id'],
+                    "name": f"{employment['employee__first_name']} {employment['employee__last_name']}",
+                    "department": employment['department'],
+                    "job_title": employment['job_title'],
+                }
+                for employment in employments
+            ],
+            "matrix": matrix,
+        }, status=status.HTTP_200_OK)
+
+
 class EmployeePerformanceListCreateView(generics.ListCreateAPIView):
     """View for listing and creating performance reviews."""
     
@@ -314,16 +516,17 @@ class AbsenceApprovalView(APIView):
         action = request.data.get('action')  # 'approve' or 'reject'
         notes = request.data.get('notes', '')
         
-        if action == 'approve':
-            absence_request.status = 'approved'
-        elif action == 'reject':
-            absence_request.status = 'rejected'
-        else:
+        if action not in ('approve', 'reject'):
             return Response(
                 {"error": "Action must be 'approve' or 'reject'"}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Overlap and coverage warnings, checked against the request's current
+        # status so a pending request being approved counts towards the peak
+        warnings = approval_warnings(absence_request) if action == 'approve' else []
+        absence_request.status = 'approved' if action == 'approve' else 'rejected'
+        
         absence_request.approved_by = request.user
         absence_request.approval_date = timezone.now()
         absence_request.approval_notes = notes
@@ -332,5 +535,111 @@ class AbsenceApprovalView(APIView):
         serializer = AbsenceRequestSerializer(absence_request)
         return Response({
             "absence_request": serializer.data,
-            "message": f"Absence request {action}d successfully"
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+            "message": f"Absence request {action}d successfully",
+            "warnings": warnings,
+        }, status=status.HTTP_200_OK)
+
+
+class AbsenceCoverageReportView(APIView):
+    """
+    View reporting daily staffing coverage per department against approved
+    and pending absences.
+    
+    Query with ``?start=``, ``?end=`` (default: the next four weeks),
+    ``?department=`` and ``?threshold=`` (share of staff that must be
+    present, default 0.75).
+    """
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        if not request.user.is_recruiter:
+            return Response(
+                {"error": "Only recruiters can view coverage"}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        params = request.query_params
+        try:
+            start = parse_date(params['start']) if params.get('start') else timezone.localdate()
+            end = parse_date(params['end']) if params.get('end') else start + timedelta(days=27)
+            threshold = float(params.get('threshold', DEFAULT_COVERAGE_THRESHOLD))
+        except ValueError:
+            start = end = None
+            threshold = DEFAULT_COVERAGE_THRESHOLD
+        if start is None or end is None or start > end or not 0 <= threshold <= 1:
+            return Response(
+                {"error": "start <= end must be YYYY-MM-DD dates and threshold between 0 and 1"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (end - start).days + 1 > MAX_ROSTER_DAYS:
+            return Response(
+                {"error": f"Reports are limited to {MAX_ROSTER_DAYS} days"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        recruiter_profile = RecruiterProfile.objects.get(user=request.user)
+        report = coverage_report(
+            recruiter_profile.hospital_id, start, end, threshold, params.get('department')
+        )
+        
+        return Response({
+            "start": start,
+            "end": end,
+            "threshold": threshold,
+            "departments": report,
+        }, status=status.HTTP_200_OK)
+
+
+class StaffingForecastView(APIView):
+    """
+    View forecasting required versus available headcount per department and
+    shift over the coming weeks, flagging shifts that need auto-fill jobs.
+    
+    Query with ``?weeks=`` (default 4), ``?start=`` (default today),
+    ``?department=``, ``?threshold=`` (share of staff that must be present,
+    default 0.75) and ``?refresh=1`` to bypass the cache.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        if not request.user.is_recruiter:
+            return Response(
+                {"error": "Only recruiters can view staffing forecasts"}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        params = request.query_params
+        try:
+            start = parse_date(params['start']) if params.get('start') else timezone.localdate()
+            weeks = int(params.get('weeks', 4))
+            threshold = float(params.get('threshold', DEFAULT_COVERAGE_THRESHOLD))
+        except ValueError:
+            start = None
+            weeks, threshold = 4, DEFAULT_COVERAGE_THRESHOLD
+        if start is None or not 1 <= weeks <= MAX_FORECAST_WEEKS or not 0 <= threshold <= 1:
+            return Response(
+                {"error": (
+                    f"start must be a YYYY-MM-DD date, weeks between 1 and {MAX_FORECAST_WEEKS} "
+                    "and threshold between 0 and 1"
+                )}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        recruiter_profile = RecruiterProfile.objects.get(user=request.user)
+        forecast = get_forecast(
+            recruiter_profile.hospital_id, start, weeks, threshold,
+            refresh=params.get('refresh') == '1',
+        )
+        department = params.get('department')
+        if department:
+            forecast = {
+                **forecast,
+                "departments": [
+                    row for row in forecast["departments"]
+                    if row["department"].lower() == department.lower()
+                ],
+            }
+        
+        return Response(forecast, status=status.HTTP_200_OK)
@@ -0,0 +1,19 @@
+"""
+Application configuration for the jobs app.
+"""
+
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    """Configuration for the jobs app."""
+    
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+    
+    def ready(self):
+        """
+        Initialize app when it's ready.
+        Import signals here to avoid AppRegistryNotReady exception.
+        """
+        import jobs.signals  # noqa
@@ -0,0 +1,168 @@
+"""
+Candidate selection for auto-fill.
+
+Candidates for an urgent fill come from the on-call pool of the job's
+job_type and location: the best-scoring matches to any active job of that
+kind, precomputed into the cache by jobs.tasks.rebuild_on_call_pools.
+When the pool cannot supply enough people, the job's own JobMatch rows
+are used instead.
+
+Either way one query drops candidates who cannot take the shift on the
+day, with NOT EXISTS subqueries for:
+
+* a current ActiveJob on that date whose shift times overlap the job's
+  (shifts crossing midnight are split at midnight; a job without shift
+  times overlaps everything);
+* an availability bitmap marking the job's shift, or the whole day,
+  unavailable, busy or on leave, unless the shift itself is marked
+  available, as the roster resolves it;
+* an approved AbsenceRequest covering the date;
+* an application to the job already.
+"""
+
+from datetime import time
+
+from django.core.cache import cache
+from django.db.models import Exists, F, Max, OuterRef, Q
+
+from employee_management.bitmaps import BLOCKING_FIELDS, day_bit
+from employee_management.forecast import FORECAST_SHIFTS, job_shifts
+from employee_management.models import AbsenceRequest, AvailabilityBitmap
+from profiles.models import CandidateProfile
+from .models import ActiveJob, JobApplication, JobMatch
+
+
+AUTO_FILL_MIN_SCORE = 60
+AUTO_FILL_BATCH_SIZE = 5
+
+ON_CALL_POOL_SIZE = 50
+ON_CALL_POOL_CACHE_SECONDS = 60 * 60
+
+
+def on_call_pool_key(job_type, location):
+    return f'jobs:on_call_pool:{job_type}:{location.strip().lower()}'
+
+
+def _pool_matches():
+    return JobMatch.objects.filter(
+        job__is_active=True, matching_score__gte=AUTO_FILL_MIN_SCORE
+    ).values('job__job_type', 'job__location', 'candidate_id').annotate(
+        best_score=Max('matching_score')
+    ).order_by('-best_score', 'candidate_id')
+
+
+def _store_pools(rows):
+    pools = {}
+    for row in rows:
+        key = on_call_pool_key(row['job__job_type'], row['job__location'])
+        pool = pools.setdefault(key, [])
+        if len(pool) < ON_CALL_POOL_SIZE and row['candidate_id'] not in pool:
+            pool.append(row['candidate_id'])
+    cache.set_many(pools, ON_CALL_POOL_CACHE_SECONDS)
+    return pools
+
+
+def rebuild_on_call_pools():
+    """Precompute every on-call pool. Returns the number of pools stored."""
+    return len(_store_pools(_pool_matches().iterator(chunk_size=5000)))
+
+
+def get_on_call_pool(job_type, location):
+    """Candidate ids on call for a job_type and location, best first."""
+    key = on_call_pool_key(job_type, location)
+    pool = cache.get(key)
+    if pool is None:
+        rows = _pool_matches().filter(job__job_type=job_type, job__location__iexact=location.strip())
+        pool = _store_pools(rows).get(key, [])
+        if not pool:
+            cache.set(key, pool, ON_CALL_POOL_CACHE_SECONDS)
+    return pool
+
+
+def _shift_overlap(start, end, prefix='job__'):
+    """Q matching jobs (through ``prefix``) whose shift overlaps ``start``..``end``."""
+    if start is None or end is None:
+        return Q()
+    their_start, their_end = f'{prefix}shift_start_time', f'{prefix}shift_end_time'
+    segments = [(start, end)] if start < end else [(start, time.max), (time.min, end)]
+
+    overlap = Q(**{f'{their_start}__isnull': True}) | Q(**{f'{their_end}__isnull': True})
+    for segment_start, segment_end in segments:
+        overlap |= Q(**{f'{their_start}__lt': F(their_end)}) & Q(**{
+            f'{their_start}__lt': segment_end,
+            f'{their_end}__gt': segment_start,
+        })
+        overlap |= Q(**{f'{their_start}__gte': F(their_end)}) & (
+            Q(**{f'{their_start}__lt': segment_end}) | Q(**{f'{their_end}__gt': segment_start})
+        )
+    return overlap
+
+
+def _bitmaps(candidate, day, shifts, fields):
+    """Exists() for a bitmap of the candidate on ``day`` with any of ``fields`` set."""
+    bit = day_bit(day)
+    marked = Q()
+    for field in fields:
+        marked |= Q(**{f'{field}_bit__gt': 0})
+    bitmaps = AvailabilityBitmap.objects.filter(
+        employment__employee=candidate, employment__status='active',
+        month=day.replace(day=1), shift__in=shifts,
+    ).annotate(**{f'{field}_bit': F(field).bitand(bit) for field in fields})
+    return Exists(bitmaps.filter(marked))
+
+
+def unavailable(job, day, candidate=OuterRef('pk')):
+    """Q matching candidates who cannot work ``job``'s shift on ``day``."""
+    shifts = job_shifts(job.shift_start_time)
+    if shifts == FORECAST_SHIFTS:
+        # No shift times: anything recorded against the day blocks it
+        blocked = _bitmaps(candidate, day, shifts + ['full_day'], BLOCKING_FIELDS)
+    else:
+        blocked = _bitmaps(candidate, day, shifts, BLOCKING_FIELDS) | (
+            _bitmaps(candidate, day, ['full_day'], BLOCKING_FIELDS)
+            & ~_bitmaps(candidate, day, shifts, ['available_days'])
+        )
+
+    working = Exists(
+        ActiveJob.objects.filter(
+            profile=candidate, is_current=True, start_date__lte=day
+        ).filter(
+            Q(end_date__isnull=True) | Q(end_date__gte=day)
+        ).filter(_shift_overlap(job.shift_start_time, job.shift_end_time))
+    )
+    absent = Exists(
+        AbsenceRequest.objects.filter(
+            employment__employee=candidate, status='approved', start_date__lte=day, end_date__gte=day
+        )
+    )
+    applied = Exists(JobApplication.objects.filter(profile=candidate, job=job))
+    return blocked | working | absent | applied
+
+
+def select_auto_fill_candidates(job, day, exclude_ids=(), limit=AUTO_FILL_BATCH_SIZE):
+    """
+    Up to ``limit`` CandidateProfiles (with ``user`` loaded) free to cover
+    ``job`` on ``day``: on-call candidates first, then the job's own matches.
+    """
+    pool = get_on_call_pool(job.job_type, job.location)
+    rank = {candidate_id: position for position, candidate_id in enumerate(pool)}
+    selected = list(
+        CandidateProfile.objects.filter(id__in=pool).exclude(id__in=exclude_ids).exclude(
+            unavailable(job, day)
+        ).select_related('user')
+    )
+    selected.sort(key=lambda candidate: rank[candidate.id])
+    selected = selected[:limit]
+
+    if len(selected) < limit:
+        matches = JobMatch.objects.filter(
+            job=job,
+            matching_score__gte=AUTO_FILL_MIN_SCORE,
+            candidate__job_applications__isnull=True,
+        ).exclude(
+            candidate_id__in=[*exclude_ids, *(candidate.id for candidate in selected)]
+        ).exclude(
+            unavailable(job, day, OuterRef('candidate'))
+        ).select_related('candidate__user').order_by('-matching_score')
+        selected += [match.candidate for match in matches[:limit - len(selected)]]
+    return selected
@@ -0,0 +1,170 @@
+"""
+In-memory typeahead index for job titles, skills, qualifications,
+departments and locations.
+
+Each category is a pair of parallel sorted lists (lower-cased keys and the
+labels they point to), searched with bisect. Every word start of a label is
+indexed, so "nur" finds both "Nurse Practitioner" and "Staff Nurse".
+
+Workers share one copy of the index through a zlib-compressed JSON
+snapshot in the cache. A small version key lets each worker notice a new
+snapshot with a single cache read instead of re-querying the database.
+"""
+
+import json
+import time
+import zlib
+from bisect import bisect_left
+from threading import Lock
+
+from django.core.cache import cache
+
+
+SNAPSHOT_KEY = 'jobs:autocomplete:snapshot'
+VERSION_KEY = 'jobs:autocomplete:version'
+
+CATEGORIES = ('titles', 'skills', 'qualifications', 'departments', 'locations')
+
+
+def _category_terms(category):
+    """Load the distinct labels for one category from the database."""
+    from documents.models import QualificationMaster, SkillMaster
+    from .models import Job
+
+    active_jobs = Job.objects.filter(is_active=True, is_filled=False)
+    if category == 'titles':
+        values = active_jobs.values_list('title', flat=True)
+    elif category == 'departments':
+        values = active_jobs.values_list('department', flat=True)
+    elif category == 'locations':
+        values = active_jobs.values_list('location', flat=True)
+    elif category == 'skills':
+        values = SkillMaster.objects.values_list('name', flat=True)
+    elif category == 'qualifications':
+        values = QualificationMaster.objects.values_list('name', flat=True)
+    else:
+        raise ValueError(f"Unknown autocomplete category: {category}")
+    return values.order_by().distinct()
+
+
+def _index_entries(label):
+    """Yield (key, label) for the label and every later word start in it."""
+    words = label.strip().lower().split()
+    for position in range(len(words)):
+        yield ' '.join(words[position:]), label.strip()
+
+
+def _build_category(labels):
+    entries = set()
+    for label in labels:
+        if label and label.strip():
+            entries.update(_index_entries(label))
+    entries = sorted(entries)
+    return {
+        'keys': [key for key, _ in entries],
+        'labels': [label for _, label in entries],
+    }
+
+
+class AutocompleteIndex:
+    """Per-process view of the shared autocomplete snapshot."""
+
+    # How long a worker trusts its local copy before checking the version key
+    refresh_interval = 5  # seconds
+
+    def __init__(self):
+        self._categories = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = Lock()
+
+    def search(self, prefix, categories=CATEGORIES, limit=10):
+        """Return up to ``limit`` labels per category that start with ``prefix``."""
+        self._ensure_fresh()
+        prefix = ' '.join(prefix.lower().split())
+        results = {}
+        for category in categories:
+            data = self._categories.get(category, {'keys': [], 'labels': []})
+            keys, labels = data['keys'], data['labels']
+            matches = []
+            seen = set()
+            position = bisect_left(keys, prefix)
+            while position < len(keys) and keys[position].startswith(prefix):
+                label = labels[position]
+                if label not in seen:
+                    seen.add(label)
+                    matches.append(label)
+                    if len(matches) >= limit:
+                        break
+                position += 1
+            results[category] = matches
+        return results
+
+    def rebuild(self, categories=CATEGORIES):
+        """Reload the given categories from the database and publish a new snapshot."""
+        with self._lock:
+            current = self._load_snapshot() or {}
+            for category in categories:
+                current[category] = _build_category(_category_terms(category))
+            self._publish(current)
+
+    def add_terms(self, category, labels):
+        """Insert new labels into one category without touching the database."""
+        with self._lock:
+            current = self._load_snapshot()
+            if current is None:
+                # Nothing published yet; the next search builds everything
+                return
+            data = current.setdefault(category, {'keys': [], 'labels': []})
+            keys, stored_labels = data['keys'], data['labels']
+            changed = False
+            for label in labels:
+                if not label or not label.strip():
+                    continue
+                for key, clean_label in _index_entries(label):
+                    position = bisect_left(keys, key)
+                    while (position < len(keys) and keys[position] == key
+                           and stored_labels[position] < clean_label):
+                        position += 1
+                    if (position < len(keys) and keys[position] == key
+                            and stored_labels[position] == clean_label):
+                        continue
+                    keys.insert(position, key)
+                    stored_labels.insert(position, clean_label)
+                    changed = True
+            if changed:
+                self._publish(current)
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = now
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            self.rebuild()
+        elif version != self._version:
+            with self._lock:
+                self._load_snapshot()
+
+    def _load_snapshot(self):
+        blob = cache.get(SNAPSHOT_KEY)
+        if blob is None:
+            return None
+        payload = json.loads(zlib.decompress(blob).decode('utf-8'))
+        self._categories = payload['categories']
+        self._version = payload['version']
+        return self._categories
+
+    def _publish(self, categories):
+        version = time.time_ns()
+        payload = {'version': version, 'categories': categories}
+        blob = zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+        cache.set(SNAPSHOT_KEY, blob, None)
+        cache.set(VERSION_KEY, version, None)
+        self._categories = categories
+        self._version = version
+        self._checked_at = time.monotonic()
+
+
+autocomplete_index = AutocompleteIndex()
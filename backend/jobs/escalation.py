@@ -0,0 +1,197 @@
+"""
+Wave-based auto-fill escalation.
+
+When a worker reports an absence on an auto-fill job, notifications go out
+in waves of growing size (WAVE_SIZES), WAVE_INTERVAL_SECONDS apart, each
+wave scheduled as a Celery task with a countdown. Every wave asks
+jobs.auto_fill for candidates free to cover the shift who have not been
+notified yet. Waves stop as soon as someone accepts, or once the absence
+date has passed.
+
+Escalation state lives in Redis so accepting is atomic across workers:
+
+* ``autofill:<absence_id>`` is a hash with ``status`` (open, accepted,
+  filled or closed), ``started_at``, ``first_accept_at`` and
+  ``accepted_by``, plus a ``wave:<n>`` field per wave sent;
+* ``autofill:<absence_id>:notified`` is the set of candidate ids offered
+  the shift.
+
+An acceptance claims the shift with a Lua script, then records a selected
+JobApplication for the accepting candidate. The first acceptance and the
+fill are persisted on the AbsenceNotification, which keeps the latency
+metrics (``time_to_first_accept``, ``time_to_fill``) once the Redis state
+has expired.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from attendance.models import AbsenceNotification
+from carechain.counters import get_connection
+from .auto_fill import select_auto_fill_candidates
+from .models import JobApplication
+
+
+WAVE_SIZES = (5, 10, 20, 40)
+WAVE_INTERVAL_SECONDS = 10 * 60
+
+ESCALATION_STATE_TTL = 60 * 60 * 24 * 7
+
+OPEN = 'open'
+ACCEPTED = 'accepted'
+FILLED = 'filled'
+CLOSED = 'closed'
+
+# Acceptance results
+NOT_OFFERED = 'not_offered'
+NO_LONGER_OPEN = 'no_longer_open'
+UNAVAILABLE = 'unavailable'
+
+
+# KEYS: state hash, notified set. ARGV: candidate id, now (epoch seconds).
+# Returns -1 when no escalation is running, -2 when the candidate was not
+# notified, 0 when the shift is no longer open and 1 when it is claimed.
+# The first acceptance is timestamped either way.
+ACCEPT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+if redis.call('SISMEMBER', KEYS[2], ARGV[1]) == 0 then
+    return -2
+end
+redis.call('HSETNX', KEYS[1], 'first_accept_at', ARGV[2])
+if redis.call('HGET', KEYS[1], 'status') ~= 'open' then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', 'accepted', 'accepted_by', ARGV[1])
+return 1
+"""
+
+# Give a claim back when recording the fill failed. KEYS: state hash.
+# ARGV: candidate id. Returns 1 when the shift was reopened.
+RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'status') == 'accepted'
+        and redis.call('HGET', KEYS[1], 'accepted_by') == ARGV[1] then
+    redis.call('HSET', KEYS[1], 'status', 'open')
+    redis.call('HDEL', KEYS[1], 'accepted_by')
+    return 1
+end
+return 0
+"""
+
+
+def state_key(absence_id):
+    return f'autofill:{absence_id}'
+
+
+def notified_key(absence_id):
+    return f'autofill:{absence_id}:notified'
+
+
+def _from_epoch(value):
+    return datetime.fromtimestamp(float(value), tz=dt_timezone.utc)
+
+
+def start_escalation(absence):
+    """Open the escalation state for ``absence`` and record when it started."""
+    now = timezone.now()
+    pipe = get_connection().pipeline()
+    pipe.hsetnx(state_key(absence.id), 'status', OPEN)
+    pipe.hsetnx(state_key(absence.id), 'started_at', now.timestamp())
+    pipe.expire(state_key(absence.id), ESCALATION_STATE_TTL)
+    pipe.execute()
+    AbsenceNotification.objects.filter(
+        id=absence.id, auto_fill_started_at__isnull=True
+    ).update(auto_fill_started_at=now)
+
+
+def send_wave(absence, wave, notify):
+    """
+    Send wave ``wave`` of offers for ``absence`` through ``notify(user, job, date)``.
+
+    Returns the number of candidates notified, or None when the escalation
+    is over or this wave was already sent.
+    """
+    conn = get_connection()
+    key = state_key(absence.id)
+    if conn.hget(key, 'status') != OPEN.encode():
+        return None
+    if absence.date < timezone.localdate():
+        conn.hset(key, 'status', CLOSED)
+        return None
+    if not conn.hsetnx(key, f'wave:{wave}', timezone.now().timestamp()):
+        return None
+
+    notified = [int(candidate_id) for candidate_id in conn.smembers(notified_key(absence.id))]
+    job = absence.active_job.job
+    candidates = select_auto_fill_candidates(
+        job, absence.date,
+        exclude_ids=[absence.active_job.profile_id, *notified],
+        limit=WAVE_SIZES[wave],
+    )
+    if candidates:
+        pipe = conn.pipeline()
+        pipe.sadd(notified_key(absence.id), *[candidate.id for candidate in candidates])
+        pipe.expire(notified_key(absence.id), ESCALATION_STATE_TTL)
+        pipe.execute()
+    for candidate in candidates:
+        notify(candidate.user, job, absence.date)
+
+    AbsenceNotification.objects.filter(id=absence.id).update(auto_fill_waves=wave + 1)
+    return len(candidates)
+
+
+def accept_offer(absence, candidate):
+    """
+    Accept the auto-fill offer for ``absence`` on behalf of ``candidate``.
+
+    Returns FILLED when the candidate got the shift, NOT_OFFERED when they
+    were never notified (or no escalation is running), NO_LONGER_OPEN
+    when someone else accepted first or the escalation closed, and
+    UNAVAILABLE when Redis cannot be reached. Without Redis there is no
+    record of who was offered the shift, so nothing is claimed.
+    """
+    conn = get_connection()
+    key = state_key(absence.id)
+    try:
+        claimed = conn.eval(
+            ACCEPT_SCRIPT, 2, key, notified_key(absence.id), candidate.id, timezone.now().timestamp()
+        )
+        first_accept_at = conn.hget(key, 'first_accept_at') if claimed >= 0 else None
+    except RedisError:
+        return UNAVAILABLE
+    if claimed < 0:
+        return NOT_OFFERED
+
+    if first_accept_at is not None:
+        AbsenceNotification.objects.filter(
+            id=absence.id, first_accepted_at__isnull=True
+        ).update(first_accepted_at=_from_epoch(first_accept_at))
+    if not claimed:
+        return NO_LONGER_OPEN
+
+    # The selected application also refreshes the candidate's match
+    # summary through the JobApplication receivers in matching.signals
+    try:
+        with transaction.atomic():
+            JobApplication.objects.update_or_create(
+                profile=candidate, job=absence.active_job.job, defaults={'status': 'selected'}
+            )
+            AbsenceNotification.objects.filter(id=absence.id).update(
+                filled_at=timezone.now(), filled_by=candidate
+            )
+    except Exception:
+        try:
+            conn.eval(RELEASE_SCRIPT, 1, key, candidate.id)
+        except RedisError:
+            pass  # Surface the original error; the claim expires with the state
+        raise
+    try:
+        conn.hset(key, 'status', FILLED)
+    except RedisError:
+        # The claim already keeps the shift closed; only the final status is missing
+        pass
+    return FILLED
@@ -0,0 +1,105 @@
+"""
+Maintenance of the denormalized JobCard read model.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, F
+
+from .models import Job, JobCard
+
+
+# Working periods per year used to annualize a salary quoted per pay_unit
+ANNUALIZATION_FACTORS = {
+    'hourly': Decimal('2080'),    # 40 hours x 52 weeks
+    'daily': Decimal('260'),      # 5 days x 52 weeks
+    'per_shift': Decimal('260'),  # one shift per working day
+    'weekly': Decimal('52'),
+    'monthly': Decimal('12'),
+    'yearly': Decimal('1'),
+}
+
+CARD_FIELDS = [
+    'employer', 'hospital', 'title', 'location', 'department', 'job_type',
+    'start_date', 'salary', 'pay_unit', 'annual_salary', 'is_filled',
+    'is_active', 'auto_fill_enabled', 'created_at', 'hospital_name',
+    'hospital_contact_no', 'hospital_address', 'employer_position',
+    'employer_is_verified', 'applications_count',
+]
+
+
+def annualize_salary(salary, pay_unit):
+    """Convert a salary quoted per pay_unit into a yearly figure."""
+    factor = ANNUALIZATION_FACTORS.get(pay_unit, Decimal('1'))
+    return (Decimal(salary) * factor).quantize(Decimal('0.01'))
+
+
+def _card_for(job):
+    employer = job.employer
+    hospital = employer.hospital
+    verification = getattr(hospital, 'verification_record', None) if hospital else None
+    return JobCard(
+        job=job,
+        employer=employer,
+        hospital=hospital,
+        title=job.title,
+        location=job.location,
+        department=job.department,
+        job_type=job.job_type,
+        start_date=job.start_date,
+        salary=job.salary,
+        pay_unit=job.pay_unit,
+        annual_salary=annualize_salary(job.salary, job.pay_unit),
+        is_filled=job.is_filled,
+        is_active=job.is_active,
+        auto_fill_enabled=job.auto_fill_enabled,
+        created_at=job.created_at,
+        hospital_name=hospital.name if hospital else None,
+        hospital_contact_no=hospital.contact_no if hospital else None,
+        hospital_address=verification.address if verification else None,
+        employer_position=employer.position,
+        employer_is_verified=employer.is_verified,
+        applications_count=job.num_applications,
+    )
+
+
+def refresh_job_cards(jobs=None, batch_size=500):
+    """
+    Rebuild cards for the given Job queryset (all jobs by default).
+
+    Source rows are read in one joined pass and written back with a
+    single upsert per batch.
+    """
+    if jobs is None:
+        jobs = Job.objects.all()
+    jobs = jobs.select_related(
+        'employer__hospital__verification_record'
+    ).annotate(num_applications=Count('applications')).order_by('pk')
+
+    refreshed = 0
+    batch = []
+    for job in jobs.iterator(chunk_size=batch_size):
+        batch.append(_card_for(job))
+        if len(batch) >= batch_size:
+            refreshed += _upsert(batch)
+            batch = []
+    if batch:
+        refreshed += _upsert(batch)
+    return refreshed
+
+
+def _upsert(cards):
+    JobCard.objects.bulk_create(
+        cards,
+        update_conflicts=True,
+        unique_fields=['job'],
+        update_fields=CARD_FIELDS + ['refreshed_at'],
+    )
+    return len(cards)
+
+
+def adjust_applications_count(job_id, delta):
+    """Apply an application count delta to a card without recounting."""
+    JobCard.objects.filter(job_id=job_id).update(
+        applications_count=F('applications_count') + delta
+    )
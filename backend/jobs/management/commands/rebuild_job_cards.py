@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from jobs.job_cards import refresh_job_cards
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized JobCard read model from jobs, employers and hospitals'
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding job cards...")
+        refreshed = refresh_job_cards()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {refreshed} job cards"))
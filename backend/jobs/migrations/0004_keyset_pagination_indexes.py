@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_interview_feedback'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-created_at', '-id'], name='jobs_job_created_f3f2db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['employer', '-created_at', '-id'], name='jobs_job_employe_2b664b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-applied_on', '-id'], name='jobs_jobapp_job_id_9059f6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['profile', '-applied_on', '-id'], name='jobs_jobapp_profile_01de9e_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_keyset_pagination_indexes'),
+        ('profiles', '0007_candidateverification_hospitalverification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCard',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='jobs.job')),
+                ('title', models.CharField(max_length=255)),
+                ('location', models.CharField(max_length=255)),
+                ('department', models.CharField(max_length=100)),
+                ('job_type', models.CharField(choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('contract', 'Contract'), ('temporary', 'Temporary'), ('locum', 'Locum')], max_length=20)),
+                ('start_date', models.DateField()),
+                ('salary', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('pay_unit', models.CharField(choices=[('hourly', 'Hourly'), ('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly'), ('yearly', 'Yearly'), ('per_shift', 'Per Shift')], max_length=20)),
+                ('annual_salary', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('is_filled', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('auto_fill_enabled', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('hospital_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('hospital_contact_no', models.CharField(blank=True, max_length=15, null=True)),
+                ('hospital_address', models.TextField(blank=True, null=True)),
+                ('employer_position', models.CharField(blank=True, max_length=100)),
+                ('employer_is_verified', models.BooleanField(default=False)),
+                ('applications_count', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_cards', to='profiles.recruiterprofile')),
+                ('hospital', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_cards', to='profiles.hospital')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['is_active', '-created_at', '-job'], name='jobs_jobcar_is_acti_245d93_idx'), models.Index(fields=['employer', '-created_at', '-job'], name='jobs_jobcar_employe_8a85cf_idx')],
+            },
+        ),
+    ]
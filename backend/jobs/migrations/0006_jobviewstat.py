@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_jobcard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobViewStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='First day of the month the views belong to')),
+                ('view_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_stats', to='jobs.job')),
+            ],
+            options={
+                'unique_together': {('job', 'period')},
+            },
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:00
+
+from django.db import migrations
+from django.db.models import Count
+
+
+CARD_FIELDS = [
+    'employer', 'hospital', 'title', 'location', 'department', 'job_type',
+    'start_date', 'salary', 'pay_unit', 'annual_salary', 'is_filled',
+    'is_active', 'auto_fill_enabled', 'created_at', 'hospital_name',
+    'hospital_contact_no', 'hospital_address', 'employer_position',
+    'employer_is_verified', 'applications_count',
+]
+
+
+def build_cards(apps, schema_editor):
+    """Same rows as jobs.job_cards.refresh_job_cards, on historical models."""
+    from jobs.job_cards import annualize_salary
+
+    Job = apps.get_model('jobs', 'Job')
+    JobCard = apps.get_model('jobs', 'JobCard')
+
+    jobs = Job.objects.select_related(
+        'employer__hospital__verification_record'
+    ).annotate(num_applications=Count('applications')).order_by('pk')
+
+    def upsert(cards):
+        JobCard.objects.bulk_create(
+            cards,
+            update_conflicts=True,
+            unique_fields=['job'],
+            update_fields=CARD_FIELDS + ['refreshed_at'],
+        )
+
+    batch = []
+    for job in jobs.iterator(chunk_size=500):
+        employer = job.employer
+        hospital = employer.hospital
+        verification = getattr(hospital, 'verification_record', None) if hospital else None
+        batch.append(JobCard(
+            job=job,
+            employer=employer,
+            hospital=hospital,
+            title=job.title,
+            location=job.location,
+            department=job.department,
+            job_type=job.job_type,
+            start_date=job.start_date,
+            salary=job.salary,
+            pay_unit=job.pay_unit,
+            annual_salary=annualize_salary(job.salary, job.pay_unit),
+            is_filled=job.is_filled,
+            is_active=job.is_active,
+            auto_fill_enabled=job.auto_fill_enabled,
+            created_at=job.created_at,
+            hospital_name=hospital.name if hospital else None,
+            hospital_contact_no=hospital.contact_no if hospital else None,
+            hospital_address=verification.address if verification else None,
+            employer_position=employer.position,
+            employer_is_verified=employer.is_verified,
+            applications_count=job.num_applications,
+        ))
+        if len(batch) >= 500:
+            upsert(batch)
+            batch = []
+    if batch:
+        upsert(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_jobviewstat'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_cards, migrations.RunPython.noop),
+    ]
@@ -53,10 +53,96 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['employer', '-created_at', '-id']),
+        ]
+    
     def __str__(self):
         return self.title
 
 
+class JobCard(models.Model):
+    """
+    Denormalized read model for job list cards.
+    
+    Flattens the employer and hospital fields a card shows, together with
+    the application count and annualized salary, so job lists can be served
+    from one table. Rows are kept current by the signal handlers in
+    jobs.signals and can be rebuilt with the rebuild_job_cards command.
+    """
+    
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='card'
+    )
+    employer = models.ForeignKey(
+        RecruiterProfile,
+        on_delete=models.CASCADE,
+        related_name='job_cards'
+    )
+    hospital = models.ForeignKey(
+        'profiles.Hospital',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='job_cards'
+    )
+    title = models.CharField(max_length=255)
+    location = models.CharField(max_length=255)
+    department = models.CharField(max_length=100)
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPES)
+    start_date = models.DateField()
+    salary = models.DecimalField(max_digits=10, decimal_places=2)
+    pay_unit = models.CharField(max_length=20, choices=Job.PAY_UNITS)
+    annual_salary = models.DecimalField(max_digits=14, decimal_places=2)
+    is_filled = models.BooleanField(default=False)
+    is_active = models.BooleanField(default=True)
+    auto_fill_enabled = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    
+    # Flattened employer / hospital fields
+    hospital_name = models.CharField(max_length=255, null=True, blank=True)
+    hospital_contact_no = models.CharField(max_length=15, null=True, blank=True)
+    hospital_address = models.TextField(null=True, blank=True)
+    employer_position = models.CharField(max_length=100, blank=True)
+    employer_is_verified = models.BooleanField(default=False)
+    
+    applications_count = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active', '-created_at', '-job']),
+            models.Index(fields=['employer', '-created_at', '-job']),
+        ]
+    
+    def __str__(self):
+        return f"Card for {self.title}"
+
+
+class JobViewStat(models.Model):
+    """Monthly view totals per job, flushed in bulk from Redis counters."""
+    
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='view_stats'
+    )
+    period = models.DateField(help_text="First day of the month the views belong to")
+    view_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('job', 'period')
+    
+    def __str__(self):
+        return f"{self.job.title} - {self.period:%Y-%m}: {self.view_count} views"
+
+
 class JobApplication(models.Model):
     """Model for storing job application information."""
     
@@ -88,6 +174,10 @@ class JobApplication(models.Model):
     
     class Meta:
         unique_together = ('profile', 'job')
+        indexes = [
+            models.Index(fields=['job', '-applied_on', '-id']),
+            models.Index(fields=['profile', '-applied_on', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.profile} - {self.job.title}"
@@ -0,0 +1,79 @@
+"""
+Search helpers for the jobs app.
+"""
+
+import hashlib
+from urllib.parse import urlencode
+
+from django.db import connection
+
+
+FACET_FIELDS = ('department', 'job_type', 'location', 'pay_unit')
+
+# Query params that change paging or ordering but not the matching rows.
+NON_FILTER_PARAMS = {'page', 'page_size', 'cursor', 'pagination', 'ordering'}
+
+# Params matched case-insensitively: the free-text ``search`` (icontains)
+# and the ``use_preferences`` flag. The filterset fields are exact matches.
+CASE_INSENSITIVE_PARAMS = {'search', 'use_preferences'}
+
+
+def normalized_filter_key(query_params, prefix, extra=None):
+    """
+    Build a stable cache key for a set of search filters.
+
+    Params are stripped and sorted so that the same search typed in a
+    different order shares one cache entry. Only CASE_INSENSITIVE_PARAMS
+    are lower-cased; exact filters that differ in case match different rows.
+    """
+    items = []
+    for key in sorted(query_params.keys()):
+        if key in NON_FILTER_PARAMS:
+            continue
+        values = [v.strip() for v in query_params.getlist(key) if v.strip()]
+        if key in CASE_INSENSITIVE_PARAMS:
+            values = [v.lower() for v in values]
+        for value in sorted(values):
+            items.append((key, value))
+    if extra is not None:
+        items.append(('_', str(extra)))
+    digest = hashlib.md5(urlencode(items).encode('utf-8')).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def compute_job_facets(queryset):
+    """
+    Count jobs per department, job_type, location and pay_unit.
+
+    All facets come from a single GROUPING SETS pass over the filtered
+    queryset, so the sidebar costs one query regardless of facet count.
+    """
+    inner_sql, params = queryset.order_by().values(*FACET_FIELDS).query.sql_with_params()
+    columns = ', '.join(FACET_FIELDS)
+    grouping_columns = ', '.join(f'GROUPING({field})' for field in FACET_FIELDS)
+    grouping_sets = ', '.join(f'({field})' for field in FACET_FIELDS)
+    sql = (
+        f"SELECT {columns}, {grouping_columns}, COUNT(*) "
+        f"FROM ({inner_sql}) AS filtered_jobs "
+        f"GROUP BY GROUPING SETS ({grouping_sets})"
+    )
+
+    facets = {field: [] for field in FACET_FIELDS}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    field_count = len(FACET_FIELDS)
+    for row in rows:
+        values = row[:field_count]
+        grouping_flags = row[field_count:field_count * 2]
+        count = row[-1]
+        for field, value, flag in zip(FACET_FIELDS, values, grouping_flags):
+            # GROUPING(col) is 0 only for the set that grouped by col.
+            if flag == 0:
+                facets[field].append({'value': value, 'count': count})
+                break
+
+    for buckets in facets.values():
+        buckets.sort(key=lambda bucket: (-bucket['count'], str(bucket['value'])))
+    return facets
@@ -3,8 +3,9 @@ Serializers for the jobs app.
 """
 
 from rest_framework import serializers
-from .models import Job, JobApplication, JobMatch, ActiveJob, CompletedJob, Interview, Feedback
+from .models import Job, JobCard, JobApplication, JobMatch, ActiveJob, CompletedJob, Interview, Feedback
 from profiles.models import RecruiterProfile, CandidateProfile
+from .viewer import JobViewerContext
 
 
 class RecruiterProfileSerializer(serializers.ModelSerializer):
@@ -58,10 +59,80 @@ class JobSerializer(serializers.ModelSerializer):
     
     def get_applications_count(self, obj):
         """Get the number of applications for this job."""
+        card = getattr(obj, 'card', None)
+        if card is not None:
+            return card.applications_count
         return obj.applications.count()
 
 
-class JobDetailsSerializer(serializers.ModelSerializer):
+class JobCardSerializer(serializers.ModelSerializer):
+    """Serializer for job list cards, read from the denormalized JobCard table."""
+    
+    id = serializers.IntegerField(source='job_id', read_only=True)
+    employer_details = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = JobCard
+        fields = [
+            'id', 'title', 'employer', 'employer_details', 'location', 'department',
+            'job_type', 'start_date', 'salary', 'pay_unit', 'annual_salary',
+            'is_filled', 'is_active', 'auto_fill_enabled', 'created_at',
+            'applications_count'
+        ]
+        read_only_fields = fields
+    
+    def get_employer_details(self, obj):
+        """Mirror the employer_details shape of JobSerializer from flattened columns."""
+        return {
+            'id': obj.employer_id,
+            'hospital_name': obj.hospital_name,
+            'contact_no': obj.hospital_contact_no,
+            'address': obj.hospital_address,
+            'position': obj.employer_position,
+            'is_verified': obj.employer_is_verified,
+        }
+
+
+class JobViewerListSerializer(serializers.ListSerializer):
+    """List serializer that bulk-loads the viewer's applications and matches for the page."""
+    
+    def to_representation(self, data):
+        jobs = list(data.all() if hasattr(data, 'all') else data)
+        self.child.get_viewer().prefetch([job.id for job in jobs])
+        return super().to_representation(jobs)
+
+
+class JobViewerMixin:
+    """Personalised fields answered from a request-scoped JobViewerContext."""
+    
+    def get_viewer(self):
+        """Return the viewer context, creating it once from the 'user' context entry if needed."""
+        if getattr(self, '_viewer', None) is None:
+            viewer = self.context.get('viewer')
+            if viewer is None:
+                viewer = JobViewerContext(self.context.get('user'))
+                self.context['viewer'] = viewer
+            self._viewer = viewer
+        return self._viewer
+    
+    def get_has_applied(self, obj):
+        """Check if the current user has applied for this job."""
+        return self.get_viewer().has_applied(obj)
+    
+    def get_is_matched(self, obj):
+        """Check if the current user has been matched with this job."""
+        return self.get_viewer().is_matched(obj)
+    
+    def get_matching_score(self, obj):
+        """Get the matching score for the current user and this job."""
+        return self.get_viewer().matching_score(obj)
+    
+    def get_application_status(self, obj):
+        """Get the application status for the current user and this job."""
+        return self.get_viewer().application_status(obj)
+
+
+class JobDetailsSerializer(JobViewerMixin, serializers.ModelSerializer):
     """Detailed serializer for a single job."""
     
     employer_details = RecruiterProfileSerializer(source='employer', read_only=True)
@@ -81,59 +152,10 @@ class JobDetailsSerializer(serializers.ModelSerializer):
             'has_applied', 'is_matched', 'matching_score', 'application_status'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'employer']
-    
-    def get_has_applied(self, obj):
-        """Check if the current user has applied for this job."""
-        user = self.context.get('user')
-        if not user or not user.is_candidate:
-            return False
-            
-        try:
-            candidate_profile = CandidateProfile.objects.get(user=user)
-            return JobApplication.objects.filter(job=obj, profile=candidate_profile).exists()
-        except CandidateProfile.DoesNotExist:
-            return False
-    
-    def get_is_matched(self, obj):
-        """Check if the current user has been matched with this job."""
-        user = self.context.get('user')
-        if not user or not user.is_candidate:
-            return False
-            
-        try:
-            candidate_profile = CandidateProfile.objects.get(user=user)
-            return JobMatch.objects.filter(job=obj, candidate=candidate_profile).exists()
-        except CandidateProfile.DoesNotExist:
-            return False
-    
-    def get_matching_score(self, obj):
-        """Get the matching score for the current user and this job."""
-        user = self.context.get('user')
-        if not user or not user.is_candidate:
-            return None
-            
-        try:
-            candidate_profile = CandidateProfile.objects.get(user=user)
-            job_match = JobMatch.objects.filter(job=obj, candidate=candidate_profile).first()
-            return job_match.matching_score if job_match else None
-        except CandidateProfile.DoesNotExist:
-            return None
-    
-    def get_application_status(self, obj):
-        """Get the application status for the current user and this job."""
-        user = self.context.get('user')
-        if not user or not user.is_candidate:
-            return None
-            
-        try:
-            candidate_profile = CandidateProfile.objects.get(user=user)
-            job_application = JobApplication.objects.filter(job=obj, profile=candidate_profile).first()
-            return job_application.status if job_application else None
-        except CandidateProfile.DoesNotExist:
-            return None
-
-
-class JobSearchSerializer(serializers.ModelSerializer):
+        list_serializer_class = JobViewerListSerializer
+
+
+class JobSearchSerializer(JobViewerMixin, serializers.ModelSerializer):
     """Serializer for job search results."""
     employer_name = serializers.SerializerMethodField()
     matching_score = serializers.SerializerMethodField()
@@ -147,48 +169,12 @@ class JobSearchSerializer(serializers.ModelSerializer):
             'salary', 'pay_unit', 'start_date', 'employer_name',
             'matching_score', 'is_matched', 'has_applied'
         ]
+        list_serializer_class = JobViewerListSerializer
     
     def get_employer_name(self, obj):
         if obj.employer and obj.employer.hospital:
             return obj.employer.hospital.name
         return None
-    
-    def get_matching_score(self, obj):
-        """Get the matching score for the current user and this job."""
-        user = self.context.get('user')
-        if not user or not user.is_candidate:
-            return None
-            
-        try:
-            candidate_profile = CandidateProfile.objects.get(user=user)
-            job_match = JobMatch.objects.filter(job=obj, candidate=candidate_profile).first()
-            return job_match.matching_score if job_match else None
-        except CandidateProfile.DoesNotExist:
-            return None
-    
-    def get_is_matched(self, obj):
-        """Check if the current user has been matched with this job."""
-        user = self.context.get('user')
-        if not user or not user.is_candidate:
-            return False
-            
-        try:
-            candidate_profile = CandidateProfile.objects.get(user=user)
-            return JobMatch.objects.filter(job=obj, candidate=candidate_profile).exists()
-        except CandidateProfile.DoesNotExist:
-            return False
-    
-    def get_has_applied(self, obj):
-        """Check if the current user has applied for this job."""
-        user = self.context.get('user')
-        if not user or not user.is_candidate:
-            return False
-            
-        try:
-            candidate_profile = CandidateProfile.objects.get(user=user)
-            return JobApplication.objects.filter(job=obj, profile=candidate_profile).exists()
-        except CandidateProfile.DoesNotExist:
-            return False
 
 
 class JobApplicationSerializer(serializers.ModelSerializer):
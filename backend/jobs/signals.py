@@ -0,0 +1,110 @@
+"""
+Signal handlers for the jobs app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from documents.models import QualificationMaster, SkillMaster
+from profiles.models import Hospital, HospitalVerification, RecruiterProfile
+from .models import Job, JobApplication
+from .autocomplete import autocomplete_index
+from .job_cards import refresh_job_cards, adjust_applications_count
+
+
+def _schedule_autocomplete_rebuild(categories):
+    """Rebuild the given autocomplete categories once the transaction commits."""
+    from .tasks import rebuild_autocomplete_index
+    transaction.on_commit(lambda: rebuild_autocomplete_index.delay(list(categories)))
+
+
+@receiver(post_save, sender=Job)
+def update_job_autocomplete(sender, instance, created, **kwargs):
+    """
+    Keep job titles, departments and locations in the typeahead index current.
+    New open jobs are inserted in place; edits may remove terms, so they
+    trigger a rebuild of just the job categories.
+    """
+    if created and instance.is_active and not instance.is_filled:
+        def add_job_terms():
+            autocomplete_index.add_terms('titles', [instance.title])
+            autocomplete_index.add_terms('departments', [instance.department])
+            autocomplete_index.add_terms('locations', [instance.location])
+        transaction.on_commit(add_job_terms)
+    elif not created:
+        _schedule_autocomplete_rebuild(['titles', 'departments', 'locations'])
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_autocomplete(sender, instance, **kwargs):
+    """Drop terms that may no longer be used by any open job."""
+    _schedule_autocomplete_rebuild(['titles', 'departments', 'locations'])
+
+
+@receiver(post_save, sender=SkillMaster)
+def update_skill_autocomplete(sender, instance, created, **kwargs):
+    """Index new skills immediately and rebuild the category on renames."""
+    if created:
+        transaction.on_commit(lambda: autocomplete_index.add_terms('skills', [instance.name]))
+    else:
+        _schedule_autocomplete_rebuild(['skills'])
+
+
+@receiver(post_save, sender=QualificationMaster)
+def update_qualification_autocomplete(sender, instance, created, **kwargs):
+    """Index new qualifications immediately and rebuild the category on renames."""
+    if created:
+        transaction.on_commit(lambda: autocomplete_index.add_terms('qualifications', [instance.name]))
+    else:
+        _schedule_autocomplete_rebuild(['qualifications'])
+
+
+@receiver(post_delete, sender=SkillMaster)
+def remove_skill_autocomplete(sender, instance, **kwargs):
+    _schedule_autocomplete_rebuild(['skills'])
+
+
+@receiver(post_delete, sender=QualificationMaster)
+def remove_qualification_autocomplete(sender, instance, **kwargs):
+    _schedule_autocomplete_rebuild(['qualifications'])
+
+
+@receiver(post_save, sender=Job)
+def refresh_card_for_job(sender, instance, **kwargs):
+    """Rebuild the job's card whenever the job itself changes."""
+    job_id = instance.pk
+    transaction.on_commit(lambda: refresh_job_cards(Job.objects.filter(pk=job_id)))
+
+
+@receiver(post_save, sender=JobApplication)
+def count_card_application(sender, instance, created, **kwargs):
+    if created:
+        adjust_applications_count(instance.job_id, 1)
+
+
+@receiver(post_delete, sender=JobApplication)
+def uncount_card_application(sender, instance, **kwargs):
+    adjust_applications_count(instance.job_id, -1)
+
+
+@receiver(post_save, sender=RecruiterProfile)
+def refresh_cards_for_employer(sender, instance, created, **kwargs):
+    """Position, verification and hospital are copied onto every card of the employer."""
+    if created:
+        return
+    employer_id = instance.pk
+    transaction.on_commit(lambda: refresh_job_cards(Job.objects.filter(employer_id=employer_id)))
+
+
+@receiver(post_save, sender=Hospital)
+def refresh_cards_for_hospital(sender, instance, created, **kwargs):
+    if created:
+        return
+    hospital_id = instance.pk
+    transaction.on_commit(lambda: refresh_job_cards(Job.objects.filter(employer__hospital_id=hospital_id)))
+
+
+@receiver(post_save, sender=HospitalVerification)
+def refresh_cards_for_hospital_address(sender, instance, **kwargs):
+    hospital_id = instance.hospital_id
+    transaction.on_commit(lambda: refresh_job_cards(Job.objects.filter(employer__hospital_id=hospital_id)))
@@ -3,18 +3,18 @@ Celery tasks for the jobs app.
 """
 
 from celery import shared_task
+from django.apps import apps
 from django.db.models import Q
 from django.utils import timezone
+from redis.exceptions import RedisError
 from .models import Job, JobMatch
 from attendance.models import AbsenceNotification
-from notifications.models import Notification
 from django.contrib.auth import get_user_model
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 import json
 
 User = get_user_model()
-channel_layer = get_channel_layer()
 
 
 @shared_task
@@ -94,7 +94,7 @@ def auto_match_candidates_to_job(job_id):
         return f"Job with ID {job_id} not found"
 
 
-@shared_task
+@shared_task(autoretry_for=(RedisError,), retry_backoff=True, max_retries=5)
 def trigger_auto_fill(absence_notification_id):
     """
     Trigger auto-fill mechanism for an absence notification.
@@ -102,15 +102,11 @@ def trigger_auto_fill(absence_notification_id):
     """
     try:
         # Get the absence notification
-        absence = AbsenceNotification.objects.get(id=absence_notification_id)
+        absence = AbsenceNotification.objects.select_related('active_job__job').get(id=absence_notification_id)
         
         if absence.auto_fill_triggered:
             return f"Auto-fill already triggered for absence {absence_notification_id}"
         
-        # Mark as triggered
-        absence.auto_fill_triggered = True
-        absence.save()
-        
         # Get the job
         job = absence.active_job.job
         
@@ -118,43 +114,86 @@ def trigger_auto_fill(absence_notification_id):
         if not job.auto_fill_enabled:
             return f"Auto-fill not enabled for job {job.title}"
         
-        # Find the best matches for this job
-        matches = JobMatch.objects.filter(
-            job=job,
-            matching_score__gte=60,  # Only consider matches with 60% or higher score
-            candidate__job_applications__isnull=True  # Candidates who haven't already applied
-        ).order_by('-matching_score')[:5]  # Get top 5 matches
+        # Offer the shift in waves until someone accepts. The first wave is
+        # claimed in Redis, so a retry after a Redis error cannot send it twice;
+        # the absence is only marked as triggered once it went out.
+        from .escalation import send_wave, start_escalation
         
-        # Send notifications to these candidates
-        for match in matches:
-            create_auto_fill_notification(match.candidate.user, job, absence.date)
+        start_escalation(absence)
+        sent = send_wave(absence, 0, create_auto_fill_notification)
+        AbsenceNotification.objects.filter(
+            id=absence_notification_id, auto_fill_triggered=False
+        ).update(auto_fill_triggered=True)
+        # Also when a retry found the first wave already claimed: each wave
+        # is claimed once, and stops by itself when the escalation is over
+        schedule_next_auto_fill_wave(absence_notification_id, 0)
         
-        return f"Auto-fill triggered for job {job.title}, sent to {matches.count()} candidates"
+        return f"Auto-fill triggered for job {job.title}, sent to {sent or 0} candidates"
     
     except AbsenceNotification.DoesNotExist:
         return f"Absence notification with ID {absence_notification_id} not found"
 
 
-def create_match_notification(user, job, score):
-    """Create a notification for a job match."""
-    notification = Notification.objects.create(
-        user=user,
-        title="New Job Match",
-        message=f"You have a new job match: {job.title} at {job.employer.hospital_name} with a matching score of {score:.1f}%",
-        notification_type="job_match",
-        related_object_id=job.id,
-        related_object_type="jobs.Job"
-    )
+@shared_task
+def send_auto_fill_wave(absence_notification_id, wave):
+    """Send one escalation wave of auto-fill offers, then schedule the next."""
+    from .escalation import send_wave
     
-    # Send real-time notification via WebSocket
+    try:
+        absence = AbsenceNotification.objects.select_related('active_job__job').get(
+            id=absence_notification_id
+        )
+    except AbsenceNotification.DoesNotExist:
+        return f"Absence notification with ID {absence_notification_id} not found"
+    
+    sent = send_wave(absence, wave, create_auto_fill_notification)
+    if sent is None:
+        return f"Auto-fill for absence {absence_notification_id} stopped before wave {wave + 1}"
+    
+    schedule_next_auto_fill_wave(absence_notification_id, wave)
+    return f"Auto-fill wave {wave + 1} for absence {absence_notification_id} sent to {sent} candidates"
+
+
+def schedule_next_auto_fill_wave(absence_notification_id, wave):
+    """Queue the wave after ``wave``, if there is one, as an ETA task."""
+    from .escalation import WAVE_INTERVAL_SECONDS, WAVE_SIZES
+    
+    if wave + 1 < len(WAVE_SIZES):
+        send_auto_fill_wave.apply_async(
+            (absence_notification_id, wave + 1), countdown=WAVE_INTERVAL_SECONDS
+        )
+
+
+def send_notification(user, job, title, message, notification_type):
+    """
+    Notify ``user`` about ``job``: stored as a Notification when the
+    notifications app is installed, and pushed over the user's WebSocket
+    group when a channel layer is configured.
+    """
     content = {
-        'id': notification.id,
-        'title': notification.title,
-        'message': notification.message,
-        'type': notification.notification_type,
-        'created_at': notification.created_at.isoformat()
+        'title': title,
+        'message': message,
+        'type': notification_type,
+        'created_at': timezone.now().isoformat()
     }
     
+    if apps.is_installed('notifications'):
+        Notification = apps.get_model('notifications', 'Notification')
+        notification = Notification.objects.create(
+            user=user,
+            title=title,
+            message=message,
+            notification_type=notification_type,
+            related_object_id=job.id,
+            related_object_type="jobs.Job"
+        )
+        content['id'] = notification.id
+        content['created_at'] = notification.created_at.isoformat()
+    
+    # Send real-time notification via WebSocket
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
     async_to_sync(channel_layer.group_send)(
         f'notifications_{user.id}',
         {
@@ -164,43 +203,73 @@ def create_match_notification(user, job, score):
     )
 
 
+def create_match_notification(user, job, score):
+    """Create a notification for a job match."""
+    send_notification(
+        user, job,
+        title="New Job Match",
+        message=f"You have a new job match: {job.title} at {job.employer.hospital_name} with a matching score of {score:.1f}%",
+        notification_type="job_match",
+    )
+
+
 def create_auto_fill_notification(user, job, date):
     """Create a notification for an auto-fill request."""
-    notification = Notification.objects.create(
-        user=user,
+    send_notification(
+        user, job,
         title="Urgent Job Opportunity",
         message=f"Urgent opening for {job.title} at {job.employer.hospital_name} on {date}. Apply now if you're available.",
         notification_type="auto_fill",
-        related_object_id=job.id,
-        related_object_type="jobs.Job"
     )
+
+
+@shared_task
+def rebuild_autocomplete_index(categories=None):
+    """Rebuild the typeahead index from the database and publish a fresh snapshot."""
+    from .autocomplete import autocomplete_index, CATEGORIES
     
-    # Send real-time notification via WebSocket
-    content = {
-        'id': notification.id,
-        'title': notification.title,
-        'message': notification.message,
-        'type': notification.notification_type,
-        'created_at': notification.created_at.isoformat()
-    }
+    categories = categories or list(CATEGORIES)
+    autocomplete_index.rebuild(categories)
     
-    async_to_sync(channel_layer.group_send)(
-        f'notifications_{user.id}',
-        {
-            'type': 'notification_message',
-            'content': content
-        }
-    )
+    return f"Autocomplete index rebuilt for {', '.join(categories)}"
+
+
+def _periods_to_flush():
+    """The current month, plus the previous one for counts recorded just before it rolled over."""
+    from datetime import timedelta
+    from carechain.counters import current_period
+    
+    now = timezone.now()
+    return [current_period(now.replace(day=1) - timedelta(days=1)), current_period(now)]
 
 
 @shared_task
-def reset_monthly_quotas():
-    """Reset monthly application and job view quotas for all candidates."""
-    from profiles.models import CandidateProfile
+def flush_job_view_counters():
+    """Copy buffered job-view counters from Redis into Postgres."""
+    from .view_counters import flush_period
     
-    CandidateProfile.objects.all().update(
-        monthly_application_count=0,
-        monthly_job_viewed_count=0
-    )
+    candidates_updated = job_stats = 0
+    for period in _periods_to_flush():
+        candidates, stats = flush_period(period)
+        candidates_updated += candidates
+        job_stats += stats
+    
+    return f"Flushed job views: {candidates_updated} candidates, {job_stats} job stats"
+
+
+@shared_task
+def flush_application_quota_counters():
+    """Copy buffered application quota usage from Redis into Postgres."""
+    from profiles.quotas import APPLICATION_QUOTA
+    
+    candidates_updated = sum(APPLICATION_QUOTA.flush(period) for period in _periods_to_flush())
+    
+    return f"Flushed application quotas for {candidates_updated} candidates"
+
+
+@shared_task
+def rebuild_on_call_pools():
+    """Recompute the auto-fill on-call pools per job_type and location."""
+    from .auto_fill import rebuild_on_call_pools as rebuild
     
-    return "Monthly quotas reset successfully" 
\ No newline at end of file
+    return f"Rebuilt {rebuild()} on-call pools"
@@ -5,6 +5,7 @@ URL patterns for the jobs app.
 from django.urls import path
 from .views import (
     JobListCreateView,
+    JobCardListView,
     JobDetailView,
     JobApplicationListCreateView,
     JobApplicationDetailView,
@@ -13,6 +14,8 @@ from .views import (
     ActiveJobDetailView,
     CompletedJobListView,
     JobSearchView,
+    JobSearchFacetsView,
+    JobAutocompleteView,
     AdvancedJobSearchView,
     InterviewListCreateView,
     InterviewDetailView,
@@ -24,6 +27,7 @@ from .views import (
     InviteToApplyView,
     HospitalStatsView,
     JobCandidatesView,
+    AutoFillAcceptView,
 )
 
 app_name = 'jobs'
@@ -32,6 +36,7 @@ urlpatterns = [
     # Jobs
     path('', JobListCreateView.as_view(), name='job-list'),
     path('<int:pk>/', JobDetailView.as_view(), name='job-detail'),
+    path('cards/', JobCardListView.as_view(), name='job-card-list'),
     
     # Job Applications for specific job
     path('<int:job_id>/applications/', JobApplicationListCreateView.as_view(), name='job-applications-for-job'),
@@ -52,6 +57,8 @@ urlpatterns = [
     
     # Job Search
     path('search/', JobSearchView.as_view(), name='job-search'),
+    path('search/facets/', JobSearchFacetsView.as_view(), name='job-search-facets'),
+    path('autocomplete/', JobAutocompleteView.as_view(), name='job-autocomplete'),
     path('advanced-search/', AdvancedJobSearchView.as_view(), name='advanced-job-search'),
     
     # Interviews
@@ -73,4 +80,7 @@ urlpatterns = [
     
     # Job Candidates (for View Details)
     path('<int:job_id>/candidates/', JobCandidatesView.as_view(), name='job-candidates'),
+    
+    # Auto-fill offers
+    path('<int:pk>/auto-fill/accept/', AutoFillAcceptView.as_view(), name='auto-fill-accept'),
 ] 
\ No newline at end of file
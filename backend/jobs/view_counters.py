@@ -0,0 +1,120 @@
+"""
+Buffered job-view accounting.
+
+Views are counted in Redis: the candidate's monthly view quota
+(profiles.quotas.JOB_VIEW_QUOTA) and one hash per month holding per-job
+view totals. A periodic task (jobs.tasks.flush_job_view_counters) claims
+the hash and adds its totals to JobViewStat in bulk, so viewing a job
+never writes to the database on the request path. If Redis is
+unavailable the view is added to the month's JobViewStat row with an
+``F()`` update instead; flushes only ever add, so those views are kept.
+"""
+
+import uuid
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+from redis.exceptions import RedisError, ResponseError
+
+from carechain.counters import PERIOD_KEY_TTL, current_period, get_connection, period_start
+from profiles.quotas import JOB_VIEW_QUOTA
+
+
+# Put a claimed per-job hash back after a failed flush. KEYS: live hash,
+# claimed hash. ARGV: TTL. Views counted since the claim are kept.
+RESTORE_VIEWS_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[2])
+for i = 1, #entries, 2 do
+    redis.call('HINCRBY', KEYS[1], entries[i], entries[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+redis.call('DEL', KEYS[2])
+return #entries / 2
+"""
+
+
+def job_views_key(period):
+    return f'jobviews:jobs:{period}'
+
+
+def record_job_view(profile, job_id):
+    """
+    Count one view of ``job_id`` by ``profile``.
+
+    The candidate's monthly counter stops at the quota; the per-job total
+    always increases. Returns the candidate's view count for the month.
+    """
+    count, _ = JOB_VIEW_QUOTA.consume(profile)
+
+    period = current_period()
+    try:
+        pipe = get_connection().pipeline()
+        pipe.hincrby(job_views_key(period), job_id, 1)
+        pipe.expire(job_views_key(period), PERIOD_KEY_TTL)
+        pipe.execute()
+    except RedisError:
+        _record_in_database(job_id, period)
+    return count
+
+
+def _record_in_database(job_id, period):
+    from .models import JobViewStat
+
+    stat, _ = JobViewStat.objects.get_or_create(job_id=job_id, period=period_start(period))
+    JobViewStat.objects.filter(pk=stat.pk).update(
+        view_count=F('view_count') + 1, updated_at=timezone.now()
+    )
+
+
+def flush_period(period, batch_size=500):
+    """
+    Persist the Redis totals for one period.
+
+    Returns a ``(candidates_updated, job_stats_written)`` tuple.
+    """
+    candidates_updated = JOB_VIEW_QUOTA.flush(period, batch_size)
+    conn = get_connection()
+
+    # Claim the hash so views recorded meanwhile go to a fresh one
+    key = job_views_key(period)
+    claimed = f'{key}:flushing:{uuid.uuid4().hex}'
+    try:
+        conn.rename(key, claimed)
+    except ResponseError:
+        # No such key: nothing was viewed since the last flush
+        return candidates_updated, 0
+
+    totals = {int(job_id): int(views) for job_id, views in conn.hgetall(claimed).items()}
+    try:
+        with transaction.atomic():
+            written = _add_views(totals, period_start(period), batch_size)
+    except Exception:
+        conn.eval(RESTORE_VIEWS_SCRIPT, 2, key, claimed, PERIOD_KEY_TTL)
+        raise
+    conn.delete(claimed)
+    return candidates_updated, written
+
+
+def _add_views(totals, month, batch_size):
+    """Add ``{job_id: views}`` to the month's JobViewStat rows. Returns the rows touched."""
+    from .models import Job, JobViewStat
+
+    # Jobs deleted since they were viewed have nothing to attach stats to
+    job_ids = sorted(Job.objects.filter(id__in=totals.keys()).values_list('id', flat=True))
+    JobViewStat.objects.bulk_create(
+        [JobViewStat(job_id=job_id, period=month) for job_id in job_ids],
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    for offset in range(0, len(job_ids), batch_size):
+        batch = job_ids[offset:offset + batch_size]
+        JobViewStat.objects.filter(job_id__in=batch, period=month).update(
+            view_count=F('view_count') + Case(
+                *[When(job_id=job_id, then=Value(totals[job_id])) for job_id in batch],
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            updated_at=timezone.now(),
+        )
+    return len(job_ids)
@@ -0,0 +1,74 @@
+"""
+Request-scoped viewer context for personalised job serializers.
+"""
+
+from profiles.models import CandidateProfile
+from .models import JobApplication, JobMatch
+
+
+_UNRESOLVED = object()
+
+
+class JobViewerContext:
+    """
+    What the requesting user has done with a set of jobs.
+
+    The candidate profile is resolved once, and applications and matches
+    are bulk-loaded for every job on the page (two queries), so serializers
+    answer has_applied / is_matched / matching_score / application_status
+    with dict lookups instead of per-row queries.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._profile = _UNRESOLVED
+        self._loaded_job_ids = set()
+        self._application_status = {}
+        self._matching_score = {}
+
+    @property
+    def candidate_profile(self):
+        """The viewer's CandidateProfile, or None for anyone else."""
+        if self._profile is _UNRESOLVED:
+            self._profile = None
+            if self.user and getattr(self.user, 'is_candidate', False):
+                self._profile = CandidateProfile.objects.filter(user=self.user).first()
+        return self._profile
+
+    def prefetch(self, job_ids):
+        """Load applications and matches for any of ``job_ids`` not seen yet."""
+        missing = set(job_ids) - self._loaded_job_ids
+        if not missing:
+            return
+        self._loaded_job_ids.update(missing)
+
+        profile = self.candidate_profile
+        if profile is None:
+            return
+
+        self._application_status.update(
+            JobApplication.objects.filter(
+                profile=profile, job_id__in=missing
+            ).values_list('job_id', 'status')
+        )
+        self._matching_score.update(
+            JobMatch.objects.filter(
+                candidate=profile, job_id__in=missing
+            ).values_list('job_id', 'matching_score')
+        )
+
+    def application_status(self, job):
+        self.prefetch([job.id])
+        return self._application_status.get(job.id)
+
+    def has_applied(self, job):
+        self.prefetch([job.id])
+        return job.id in self._application_status
+
+    def matching_score(self, job):
+        self.prefetch([job.id])
+        return self._matching_score.get(job.id)
+
+    def is_matched(self, job):
+        self.prefetch([job.id])
+        return job.id in self._matching_score
@@ -3,6 +3,7 @@ Views for the jobs app.
 """
 
 from rest_framework import generics, permissions, status, filters
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
@@ -10,11 +11,13 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, F, Value, FloatField
 from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
-from .models import Job, JobApplication, JobMatch, ActiveJob, CompletedJob, Interview, Feedback
+from django.core.cache import cache
+from .models import Job, JobCard, JobApplication, JobMatch, ActiveJob, CompletedJob, Interview, Feedback
 from profiles.models import RecruiterProfile, CandidateProfile, JobPreference
 from profiles.serializers import CandidateProfileSerializer as ProfilesCandidateProfileSerializer
 from .serializers import (
     JobSerializer,
+    JobCardSerializer,
     JobApplicationSerializer,
     JobMatchSerializer,
     ActiveJobSerializer,
@@ -25,12 +28,20 @@ from .serializers import (
     FeedbackSerializer
 )
 from profiles.permissions import IsOwnerOrAdmin, IsRecruiterOrAdmin
+from profiles.quotas import APPLICATION_QUOTA
+from carechain.pagination import KeysetPaginationMixin, AppliedOnCursorPagination, JobCardCursorPagination
+from carechain.throttling import SearchThrottle
+from admin_api.stats import get_rollup
+from .search import compute_job_facets, normalized_filter_key
+from .autocomplete import autocomplete_index, CATEGORIES as AUTOCOMPLETE_CATEGORIES
+from .viewer import JobViewerContext
+from .view_counters import record_job_view
 import re
 from difflib import SequenceMatcher
 from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
 
 
-class JobListCreateView(generics.ListCreateAPIView):
+class JobListCreateView(KeysetPaginationMixin, generics.ListCreateAPIView):
     """View for listing and creating jobs."""
     
     serializer_class = JobSerializer
@@ -91,15 +102,17 @@ class JobListCreateView(generics.ListCreateAPIView):
         
         user = self.request.user
         
+        queryset = Job.objects.select_related('card', 'employer__hospital')
+        
         if hasattr(user, 'is_recruiter') and user.is_recruiter:
             # Recruiters see their own jobs
-            return Job.objects.filter(employer__user=user).order_by('-created_at')
+            return queryset.filter(employer__user=user).order_by('-created_at')
         elif hasattr(user, 'is_candidate') and user.is_candidate:
             # Candidates see all active jobs
-            return Job.objects.filter(is_active=True).order_by('-created_at')
+            return queryset.filter(is_active=True).order_by('-created_at')
         else:
             # For debugging, return all jobs
-            return Job.objects.all().order_by('-created_at')
+            return queryset.order_by('-created_at')
     
     def perform_create(self, serializer):
         """Save the job with the recruiter profile."""
@@ -107,16 +120,43 @@ class JobListCreateView(generics.ListCreateAPIView):
         serializer.save(employer=recruiter_profile)
 
 
+class JobCardListView(KeysetPaginationMixin, generics.ListAPIView):
+    """Join-free job list served from the denormalized JobCard read model."""
+    
+    serializer_class = JobCardSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    cursor_pagination_class = JobCardCursorPagination
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields = ['location', 'department', 'job_type', 'pay_unit', 'is_filled', 'is_active']
+    search_fields = ['title', 'location', 'department', 'hospital_name']
+    ordering_fields = ['created_at', 'start_date', 'annual_salary', 'applications_count']
+    
+    def get_queryset(self):
+        """Return job cards based on user type."""
+        user = self.request.user
+        
+        if user.is_recruiter:
+            # Recruiters see their own jobs
+            employer_id = RecruiterProfile.objects.filter(user=user).values_list('id', flat=True).first()
+            return JobCard.objects.filter(employer_id=employer_id).order_by('-created_at')
+        elif user.is_candidate:
+            # Candidates see all active jobs
+            return JobCard.objects.filter(is_active=True).order_by('-created_at')
+        else:
+            return JobCard.objects.all().order_by('-created_at')
+
+
 class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
     """View for retrieving, updating, or deleting a job."""
     
-    queryset = Job.objects.all()
+    queryset = Job.objects.select_related('employer__hospital')
     serializer_class = JobDetailsSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request, *args, **kwargs):
         """
-        Override get method to increment view counter for candidates
+        Override get method to count the view for candidates.
+        Counting happens in Redis; totals reach Postgres via a periodic flush.
         """
         job = self.get_object()
         
@@ -124,9 +164,7 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
         if request.user.is_candidate:
             try:
                 profile = CandidateProfile.objects.get(user=request.user)
-                if profile.monthly_job_viewed_count < profile.monthly_job_viewed_quota:
-                    profile.monthly_job_viewed_count += 1
-                    profile.save(update_fields=['monthly_job_viewed_count'])
+                record_job_view(profile, job.id)
             except CandidateProfile.DoesNotExist:
                 pass
                 
@@ -138,13 +176,15 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
         """
         context = super().get_serializer_context()
         context['user'] = self.request.user
+        context['viewer'] = JobViewerContext(self.request.user)
         return context
 
 
-class JobApplicationListCreateView(generics.ListCreateAPIView):
+class JobApplicationListCreateView(KeysetPaginationMixin, generics.ListCreateAPIView):
     """View for listing and creating job applications."""
     
     serializer_class = JobApplicationSerializer
+    cursor_pagination_class = AppliedOnCursorPagination
     permission_classes = [permissions.AllowAny]  # Temporarily open for debugging
     authentication_classes = []  # Disable authentication for debugging
     
@@ -206,18 +246,16 @@ class JobApplicationListCreateView(generics.ListCreateAPIView):
         """Save the application with the candidate profile."""
         candidate_profile = get_object_or_404(CandidateProfile, user=self.request.user)
         
-        # Check if candidate has reached monthly quota
-        if candidate_profile.monthly_application_count >= candidate_profile.monthly_application_quota:
-            return Response(
-                {"error": "Monthly application quota reached."},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        # Reserve a slot atomically so concurrent submissions cannot overshoot the quota
+        _, allowed = APPLICATION_QUOTA.consume(candidate_profile)
+        if not allowed:
+            raise PermissionDenied("Monthly application quota reached.")
         
-        # Increment application count
-        candidate_profile.monthly_application_count += 1
-        candidate_profile.save(update_fields=['monthly_application_count'])
-        
-        serializer.save(profile=candidate_profile)
+        try:
+            serializer.save(profile=candidate_profile)
+        except Exception:
+            APPLICATION_QUOTA.release(candidate_profile)
+            raise
 
 
 class JobApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -304,6 +342,7 @@ class JobSearchView(generics.ListAPIView):
     
     serializer_class = JobSearchSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [SearchThrottle]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['location', 'department', 'job_type', 'is_active']
     search_fields = ['title', 'description', 'location', 'department']
@@ -312,7 +351,9 @@ class JobSearchView(generics.ListAPIView):
     def get_queryset(self):
         """Return jobs based on search criteria and preferences."""
         # Base queryset for active jobs
-        queryset = Job.objects.filter(is_active=True, is_filled=False).order_by('-created_at')
+        queryset = Job.objects.filter(
+            is_active=True, is_filled=False
+        ).select_related('employer__hospital').order_by('-created_at')
         
         # Apply user's preferences if requested and available
         user = self.request.user
@@ -346,14 +387,74 @@ class JobSearchView(generics.ListAPIView):
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['user'] = self.request.user
+        context['viewer'] = JobViewerContext(self.request.user)
         return context 
 
 
+class JobSearchFacetsView(JobSearchView):
+    """Facet counts for the job search sidebar, using the same filters as JobSearchView."""
+    
+    facet_cache_timeout = 60  # seconds
+    
+    def get(self, request, *args, **kwargs):
+        """Return department, job_type, location and pay_unit buckets for the current search."""
+        # Preference-based filtering depends on who is asking
+        use_preferences = request.query_params.get('use_preferences', 'false').lower() == 'true'
+        cache_key = normalized_filter_key(
+            request.query_params,
+            'jobs:facets',
+            extra=request.user.pk if use_preferences else None
+        )
+        
+        facets = cache.get(cache_key)
+        if facets is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            facets = compute_job_facets(queryset)
+            cache.set(cache_key, facets, self.facet_cache_timeout)
+        
+        return Response({'facets': facets}, status=status.HTTP_200_OK)
+
+
+class JobAutocompleteView(APIView):
+    """Search-as-you-type suggestions for titles, skills, qualifications, departments and locations."""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            return Response(
+                {"error": "limit must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, 25))
+        requested = request.query_params.get('type')
+        
+        if requested:
+            categories = [c for c in requested.split(',') if c in AUTOCOMPLETE_CATEGORIES]
+            if not categories:
+                return Response(
+                    {"error": f"type must be one of: {', '.join(AUTOCOMPLETE_CATEGORIES)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            categories = AUTOCOMPLETE_CATEGORIES
+        
+        if not query:
+            return Response({"query": query, "results": {c: [] for c in categories}})
+        
+        results = autocomplete_index.search(query, categories=categories, limit=limit)
+        return Response({"query": query, "results": results}, status=status.HTTP_200_OK)
+
+
 class AdvancedJobSearchView(generics.ListAPIView):
     """Advanced job search with intelligent matching algorithms."""
     
     serializer_class = JobSearchSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [SearchThrottle]
     
     def get_queryset(self):
         """
@@ -368,7 +469,7 @@ class AdvancedJobSearchView(generics.ListAPIView):
         user = self.request.user
         
         # Base queryset for active jobs
-        queryset = Job.objects.filter(is_active=True, is_filled=False)
+        queryset = Job.objects.filter(is_active=True, is_filled=False).select_related('employer__hospital')
         
         # Get search parameters
         search_query = self.request.query_params.get('q', '')
@@ -565,6 +666,7 @@ class AdvancedJobSearchView(generics.ListAPIView):
         """Add user to serializer context for personalized data."""
         context = super().get_serializer_context()
         context['user'] = self.request.user
+        context['viewer'] = JobViewerContext(self.request.user)
         return context
 
 
@@ -863,33 +965,20 @@ class HospitalStatsView(APIView):
         
         try:
             recruiter_profile = RecruiterProfile.objects.get(user=request.user)
-            hospital = recruiter_profile.hospital
         except RecruiterProfile.DoesNotExist:
             return Response(
                 {"error": "Recruiter profile not found"}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get statistics
-        total_jobs = Job.objects.filter(employer=recruiter_profile).count()
-        active_jobs = Job.objects.filter(employer=recruiter_profile, is_active=True).count()
-        total_applications = JobApplication.objects.filter(job__employer=recruiter_profile).count()
-        
-        # Get total employees (assuming Employment model exists in employee_management)
-        try:
-            from employee_management.models import Employment
-            total_employees = Employment.objects.filter(
-                hospital=hospital, 
-                status='active'
-            ).count()
-        except ImportError:
-            total_employees = 0
+        # Get statistics from the recruiter's rollup
+        stats = get_rollup('recruiter', recruiter_profile.pk)['data']
         
         return Response({
-            "total_jobs": total_jobs,
-            "active_jobs": active_jobs,
-            "total_applications": total_applications,
-            "total_employees": total_employees
+            "total_jobs": stats['jobs']['total'],
+            "active_jobs": stats['jobs']['active'],
+            "total_applications": stats['applications']['total'],
+            "total_employees": stats['employees']
         }, status=status.HTTP_200_OK)
 
 
@@ -998,4 +1087,69 @@ class JobCandidatesView(APIView):
             'job_title': job.title,
             'total_applications': len(candidates_data),
             'candidates': candidates_data
-        }, status=status.HTTP_200_OK) 
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+
+class AutoFillAcceptView(APIView):
+    """
+    View for candidates to accept an urgent auto-fill offer for a job.
+    
+    The offer is identified by the job and the ``date`` from the auto-fill
+    notification. The first candidate to accept gets the shift and a
+    selected application; later acceptances get ``409``.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request, pk):
+        from attendance.models import AbsenceNotification
+        from django.utils.dateparse import parse_date
+        from .escalation import FILLED, NO_LONGER_OPEN, UNAVAILABLE, accept_offer
+        
+        if not request.user.is_candidate:
+            return Response(
+                {"error": "Only candidates can accept auto-fill offers"}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        job = get_object_or_404(Job, pk=pk)
+        date = request.data.get('date') if isinstance(request.data, dict) else None
+        try:
+            date = parse_date(date) if isinstance(date, str) else None
+        except ValueError:
+            date = None
+        if date is None:
+            return Response(
+                {"error": "date must be a YYYY-MM-DD date"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        candidate_profile = get_object_or_404(CandidateProfile, user=request.user)
+        absences = AbsenceNotification.objects.filter(
+            active_job__job=job, date=date, auto_fill_triggered=True, filled_at__isnull=True
+        ).select_related('active_job__job').order_by('created_at')
+        
+        results = set()
+        for absence in absences:
+            result = accept_offer(absence, candidate_profile)
+            if result == FILLED:
+                return Response({
+                    "message": f"You are covering {job.title} on {date}.",
+                    "absence": absence.id,
+                }, status=status.HTTP_200_OK)
+            if result == UNAVAILABLE:
+                return Response(
+                    {"error": "Auto-fill offers cannot be accepted right now, please try again"}, 
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            results.add(result)
+        
+        if NO_LONGER_OPEN in results:
+            return Response(
+                {"error": "This shift has already been filled"}, 
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(
+            {"error": "You have no open auto-fill offer for this job on that date"}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
@@ -5,3 +5,6 @@ class MatchingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'matching'
     verbose_name = 'Job Matching System'
+
+    def ready(self):
+        import matching.signals  # noqa
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from matching.stats import rebuild_matching_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the incremental matching statistics from all job matches'
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding matching statistics...")
+        written = rebuild_matching_stats()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} score buckets"))
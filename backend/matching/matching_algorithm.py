@@ -22,6 +22,7 @@ from .models import (
     JobMatch, MatchingCriteria, CandidatePreferences, 
     SearchHistory, RecommendationFeedback
 )
+from .summary import invalidate_match_summary
 from jobs.models import Job, JobApplication
 from profiles.models import CandidateProfile
 
@@ -110,6 +111,9 @@ class JobMatchingEngine:
                     )
                     matches_created += 1
         
+        if matches_created or matches_updated:
+            invalidate_match_summary(candidate.id)
+        
         return {
             'matches_created': matches_created,
             'matches_updated': matches_updated
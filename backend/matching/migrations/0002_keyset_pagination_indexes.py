@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobmatch',
+            index=models.Index(fields=['candidate', '-match_score', '-id'], name='matching_jo_candida_076634_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobmatch',
+            index=models.Index(fields=['-match_score', '-id'], name='matching_jo_match_s_2aa151_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchScoreBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(max_length=20)),
+                ('bucket', models.PositiveSmallIntegerField(help_text='Score band index: 0 covers 0-10, 9 covers 90-100')),
+                ('match_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('application_count', models.PositiveIntegerField(default=0, help_text='Matched candidates who went on to apply')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('job_type', 'bucket')},
+            },
+        ),
+    ]
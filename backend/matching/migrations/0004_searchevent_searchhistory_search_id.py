@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0003_matchscorebucket'),
+        ('profiles', '0008_candidatequotausage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchhistory',
+            name='search_id',
+            field=models.UUIDField(blank=True, help_text='Client-side id linking click and apply events to this search', null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='searchhistory',
+            name='search_date',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='SearchEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('search_id', models.UUIDField()),
+                ('event_type', models.CharField(choices=[('search', 'Search'), ('click', 'Click'), ('apply', 'Apply')], max_length=10)),
+                ('job_id', models.BigIntegerField(blank=True, help_text='Job clicked or applied to', null=True)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Search query and filters for search events')),
+                ('occurred_at', models.DateTimeField()),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='profiles.candidateprofile')),
+            ],
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:30
+
+from django.db import migrations
+from django.db.models import Count, Exists, F, FloatField, IntegerField, OuterRef, Q, Sum
+from django.db.models.functions import Cast, Floor, Least
+
+
+BUCKET_WIDTH = 10
+BUCKET_COUNT = 100 // BUCKET_WIDTH
+
+
+def rebuild_buckets(apps, schema_editor):
+    """Same computation as matching.stats.rebuild_matching_stats, on historical models."""
+    JobMatch = apps.get_model('matching', 'JobMatch')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    MatchScoreBucket = apps.get_model('matching', 'MatchScoreBucket')
+
+    JobMatch.objects.filter(is_applied=False).filter(
+        Exists(JobApplication.objects.filter(profile=OuterRef('candidate'), job=OuterRef('job')))
+    ).update(is_applied=True)
+
+    rows = (
+        JobMatch.objects
+        .annotate(band=Least(
+            Cast(Floor(F('match_score') / BUCKET_WIDTH), IntegerField()),
+            BUCKET_COUNT - 1
+        ))
+        .values('job__job_type', 'band')
+        .annotate(
+            match_count=Count('id'),
+            score_sum=Cast(Sum('match_score'), FloatField()),
+            application_count=Count('id', filter=Q(is_applied=True)),
+        )
+        .order_by()
+    )
+    MatchScoreBucket.objects.all().delete()
+    MatchScoreBucket.objects.bulk_create([
+        MatchScoreBucket(
+            job_type=row['job__job_type'],
+            bucket=row['band'],
+            match_count=row['match_count'],
+            score_sum=row['score_sum'] or 0.0,
+            application_count=row['application_count'],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0004_searchevent_searchhistory_search_id'),
+        ('jobs', '0006_jobviewstat'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_buckets, migrations.RunPython.noop),
+    ]
@@ -93,10 +93,48 @@ class JobMatch(models.Model):
             models.Index(fields=['candidate', '-match_score']),
             models.Index(fields=['job', '-match_score']),
             models.Index(fields=['match_score']),
+            models.Index(fields=['candidate', '-match_score', '-id']),
+            models.Index(fields=['-match_score', '-id']),
         ]
     
     def __str__(self):
         return f"{self.candidate} - {self.job.title} ({self.match_score:.1f}%)"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored score so statistics can move the match between buckets
+        instance._loaded_match_score = instance.__dict__.get('match_score')
+        return instance
+
+
+class MatchScoreBucket(models.Model):
+    """
+    Running match statistics for one job type and one 10-point score band.
+    
+    Rows are adjusted in place as matches are created, rescored or deleted and
+    as matched candidates apply (see matching.stats), so matching statistics
+    are read from a handful of rows instead of scanning JobMatch.
+    """
+    
+    BUCKET_WIDTH = 10
+    
+    job_type = models.CharField(max_length=20)
+    bucket = models.PositiveSmallIntegerField(help_text="Score band index: 0 covers 0-10, 9 covers 90-100")
+    match_count = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    application_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Matched candidates who went on to apply"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('job_type', 'bucket')
+    
+    def __str__(self):
+        low = self.bucket * self.BUCKET_WIDTH
+        return f"{self.job_type} {low}-{low + self.BUCKET_WIDTH}: {self.match_count} matches"
 
 
 class CandidatePreferences(models.Model):
@@ -182,7 +220,13 @@ class SearchHistory(models.Model):
     results_count = models.IntegerField(default=0)
     clicked_jobs = models.JSONField(default=list, help_text="List of job IDs clicked")
     applied_jobs = models.JSONField(default=list, help_text="List of job IDs applied to")
-    search_date = models.DateTimeField(auto_now_add=True)
+    search_id = models.UUIDField(
+        null=True,
+        blank=True,
+        unique=True,
+        help_text="Client-side id linking click and apply events to this search"
+    )
+    search_date = models.DateTimeField(default=timezone.now)
     
     class Meta:
         ordering = ['-search_date']
@@ -193,6 +237,32 @@ class SearchHistory(models.Model):
         return f"{self.candidate} searched: {self.search_query}"
 
 
+class SearchEvent(models.Model):
+    """
+    Append-only log of search analytics events.
+    
+    Searches, clicks and applications are queued in Redis by the request and
+    written here in batches (see matching.search_events); a periodic
+    compaction rolls them into SearchHistory rows and removes them.
+    """
+    
+    EVENT_TYPES = (
+        ('search', 'Search'),
+        ('click', 'Click'),
+        ('apply', 'Apply'),
+    )
+    
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE)
+    search_id = models.UUIDField()
+    event_type = models.CharField(max_length=10, choices=EVENT_TYPES)
+    job_id = models.BigIntegerField(null=True, blank=True, help_text="Job clicked or applied to")
+    payload = models.JSONField(default=dict, blank=True, help_text="Search query and filters for search events")
+    occurred_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.event_type} event for search {self.search_id}"
+
+
 class RecommendationFeedback(models.Model):
     """Model to collect feedback on job recommendations for ML improvement."""
     
@@ -0,0 +1,169 @@
+"""
+Asynchronous search analytics.
+
+The request path only appends an event to a Redis list. Two periodic tasks
+do the rest:
+
+* ``persist_queued_events`` drains the list in batches into the
+  append-only SearchEvent table with ``bulk_create``;
+* ``compact_search_events`` rolls SearchEvent rows into SearchHistory
+  summaries (one row per search, with clicked and applied job lists) and
+  deletes the events it consumed.
+
+If Redis is unavailable events are inserted into SearchEvent directly.
+"""
+
+import json
+import uuid
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from redis.exceptions import RedisError, ResponseError
+
+from carechain.counters import get_connection
+from .models import SearchEvent, SearchHistory
+
+
+QUEUE_KEY = 'matching:search_events'
+
+# Clicks can reach the table before their search; keep them this long
+ORPHAN_GRACE = timedelta(minutes=30)
+
+SEARCH_PAYLOAD_FIELDS = ('search_query', 'job_type', 'location', 'filters_applied', 'results_count')
+
+# Put what is left of a claimed queue back in front of the live one after a
+# failed persist, keeping the order. KEYS: live list, claimed list.
+RESTORE_QUEUE_SCRIPT = """
+local events = redis.call('LRANGE', KEYS[2], 0, -1)
+for i = #events, 1, -1 do
+    redis.call('LPUSH', KEYS[1], events[i])
+end
+redis.call('DEL', KEYS[2])
+return #events
+"""
+
+
+def queue_event(candidate_id, search_id, event_type, job_id=None, payload=None):
+    """Append one analytics event without touching the database."""
+    event = {
+        'candidate_id': candidate_id,
+        'search_id': str(search_id),
+        'event_type': event_type,
+        'job_id': job_id,
+        'payload': payload or {},
+        'occurred_at': timezone.now(),
+    }
+    try:
+        get_connection().rpush(QUEUE_KEY, json.dumps(event, cls=DjangoJSONEncoder))
+    except RedisError:
+        SearchEvent.objects.bulk_create([_event_row(event)])
+
+
+def _event_row(event):
+    occurred_at = event['occurred_at']
+    if isinstance(occurred_at, str):
+        occurred_at = parse_datetime(occurred_at)
+    return SearchEvent(
+        candidate_id=event['candidate_id'],
+        search_id=event['search_id'],
+        event_type=event['event_type'],
+        job_id=event.get('job_id'),
+        payload=event.get('payload') or {},
+        occurred_at=occurred_at,
+    )
+
+
+def persist_queued_events(batch_size=1000):
+    """
+    Move queued events from Redis into SearchEvent. Returns the number written.
+
+    The queue is claimed with RENAME first, so overlapping runs never read
+    the same events and one run only drains what was queued when it started.
+    """
+    conn = get_connection()
+    claimed = f'{QUEUE_KEY}:persisting:{uuid.uuid4().hex}'
+    try:
+        conn.rename(QUEUE_KEY, claimed)
+    except ResponseError:
+        # No such key: nothing was queued since the last run
+        return 0
+
+    written = 0
+    try:
+        while True:
+            raw_events = conn.lrange(claimed, 0, batch_size - 1)
+            if not raw_events:
+                break
+            SearchEvent.objects.bulk_create([_event_row(json.loads(raw)) for raw in raw_events])
+            conn.ltrim(claimed, len(raw_events), -1)
+            written += len(raw_events)
+    except Exception:
+        conn.eval(RESTORE_QUEUE_SCRIPT, 2, QUEUE_KEY, claimed)
+        raise
+    conn.delete(claimed)
+    return written
+
+
+def _append_unique(values, new_values):
+    for value in new_values:
+        if value not in values:
+            values.append(value)
+
+
+def compact_search_events(batch_size=5000):
+    """
+    Roll the oldest SearchEvent rows into SearchHistory.
+
+    Returns a ``(searches_written, events_consumed)`` tuple.
+    """
+    events = list(SearchEvent.objects.order_by('id')[:batch_size])
+    if not events:
+        return 0, 0
+
+    search_ids = {event.search_id for event in events}
+    histories = SearchHistory.objects.in_bulk(search_ids, field_name='search_id')
+    created = {}
+    changed = set()
+    consumed = []
+    orphan_cutoff = timezone.now() - ORPHAN_GRACE
+
+    for event in events:
+        if event.event_type == 'search':
+            if event.search_id not in histories:
+                history = SearchHistory(
+                    candidate_id=event.candidate_id,
+                    search_id=event.search_id,
+                    search_date=event.occurred_at,
+                    **{field: event.payload[field] for field in SEARCH_PAYLOAD_FIELDS if field in event.payload}
+                )
+                histories[event.search_id] = created[event.search_id] = history
+            consumed.append(event.id)
+            continue
+
+        history = histories.get(event.search_id)
+        if history is None:
+            # Its search may still be queued; give up on it after the grace period
+            if event.occurred_at < orphan_cutoff:
+                consumed.append(event.id)
+            continue
+        if history.candidate_id != event.candidate_id:
+            # Another candidate's search; drop the event
+            consumed.append(event.id)
+            continue
+        target = history.clicked_jobs if event.event_type == 'click' else history.applied_jobs
+        _append_unique(target, [event.job_id])
+        if event.search_id not in created:
+            changed.add(event.search_id)
+        consumed.append(event.id)
+
+    with transaction.atomic():
+        SearchHistory.objects.bulk_create(created.values())
+        SearchHistory.objects.bulk_update(
+            [histories[search_id] for search_id in changed], ['clicked_jobs', 'applied_jobs']
+        )
+        SearchEvent.objects.filter(id__in=consumed).delete()
+
+    return len(created) + len(changed), len(consumed)
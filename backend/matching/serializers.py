@@ -161,6 +161,7 @@ class MatchingStatsSerializer(serializers.Serializer):
     average_match_score = serializers.FloatField()
     top_job_types = serializers.ListField(child=serializers.CharField())
     matching_success_rate = serializers.FloatField()
+    score_histogram = serializers.ListField(child=serializers.DictField(), required=False)
 
 
 class CandidateMatchSummarySerializer(serializers.Serializer):
@@ -0,0 +1,75 @@
+"""
+Signal handlers for the matching app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from jobs.models import Job, JobApplication
+from .models import JobMatch
+from .summary import invalidate_match_summary
+from . import stats
+
+
+@receiver(post_save, sender=JobMatch)
+def update_stats_for_match(sender, instance, created, **kwargs):
+    """Count new matches and move rescored ones between score bands."""
+    if created:
+        stats.record_match_created(instance.job.job_type, instance.match_score)
+    else:
+        previous = getattr(instance, '_loaded_match_score', None)
+        if previous is not None and previous != instance.match_score:
+            stats.record_match_rescored(
+                instance.job.job_type, previous, instance.match_score, instance.is_applied
+            )
+    instance._loaded_match_score = instance.match_score
+
+
+@receiver(post_delete, sender=JobMatch)
+def remove_stats_for_match(sender, instance, **kwargs):
+    # The job may already be gone when matches are deleted in a cascade
+    job_type = Job.objects.filter(pk=instance.job_id).values_list('job_type', flat=True).first()
+    if job_type is not None:
+        stats.record_match_deleted(job_type, instance.match_score, instance.is_applied)
+
+
+@receiver(post_save, sender=JobApplication)
+def update_stats_for_application(sender, instance, created, **kwargs):
+    """Flag the candidate's match for this job as applied and count the conversion."""
+    if not created:
+        return
+    matches = JobMatch.objects.filter(
+        candidate_id=instance.profile_id, job_id=instance.job_id, is_applied=False
+    )
+    match = matches.values('id', 'match_score').first()
+    if match and matches.filter(pk=match['id']).update(is_applied=True):
+        stats.record_match_applied(instance.job.job_type, match['match_score'])
+
+
+@receiver(post_delete, sender=JobApplication)
+def remove_stats_for_application(sender, instance, origin=None, **kwargs):
+    """Clear the applied flag on the candidate's match when the application is withdrawn."""
+    # Deleting the job or the candidate removes their matches in the same
+    # cascade, and those deletions already take the application count back
+    if not (isinstance(origin, JobApplication) or getattr(origin, 'model', None) is JobApplication):
+        return
+    matches = JobMatch.objects.filter(
+        candidate_id=instance.profile_id, job_id=instance.job_id, is_applied=True
+    )
+    match = matches.values('id', 'match_score', 'job__job_type').first()
+    if match and matches.filter(pk=match['id']).update(is_applied=False):
+        stats.record_match_unapplied(match['job__job_type'], match['match_score'])
+
+
+@receiver(post_save, sender=JobApplication)
+def invalidate_summary_for_application(sender, instance, created, **kwargs):
+    """``applications_made`` counts the candidate's applications, so new ones invalidate it."""
+    if created:
+        profile_id = instance.profile_id
+        transaction.on_commit(lambda: invalidate_match_summary(profile_id))
+
+
+@receiver(post_delete, sender=JobApplication)
+def invalidate_summary_for_removed_application(sender, instance, **kwargs):
+    profile_id = instance.profile_id
+    transaction.on_commit(lambda: invalidate_match_summary(profile_id))
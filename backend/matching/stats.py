@@ -0,0 +1,147 @@
+"""
+Incrementally maintained matching statistics.
+
+MatchScoreBucket keeps running counts per job type and 10-point score band.
+The matching write path (via matching.signals) adjusts one row at a time
+with F() expressions, so MatchingStatsView reads a few dozen rows instead
+of scanning JobMatch and JobApplication.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, FloatField, IntegerField, OuterRef, Q, Sum
+from django.db.models.functions import Cast, Floor, Greatest, Least
+from django.utils import timezone
+
+from jobs.models import JobApplication
+from .models import JobMatch, MatchScoreBucket
+
+
+HIGH_QUALITY_SCORE = 80
+BUCKET_COUNT = 100 // MatchScoreBucket.BUCKET_WIDTH
+
+
+def score_bucket(score):
+    """Map a 0-100 score to its band; a perfect score falls in the top band."""
+    return max(0, min(int(score // MatchScoreBucket.BUCKET_WIDTH), BUCKET_COUNT - 1))
+
+
+def _adjust(job_type, bucket, **deltas):
+    """
+    Add ``deltas`` to one bucket row, creating the row on first use.
+    Decrements stop at zero, so a row that missed an increment cannot
+    violate the unsigned counter columns.
+    """
+    updates = {
+        field: F(field) + delta if delta >= 0 else Greatest(
+            F(field) + delta, 0, output_field=MatchScoreBucket._meta.get_field(field)
+        )
+        for field, delta in deltas.items()
+    }
+    rows = MatchScoreBucket.objects.filter(job_type=job_type, bucket=bucket)
+    if rows.update(updated_at=timezone.now(), **updates):
+        return
+    try:
+        with transaction.atomic():
+            MatchScoreBucket.objects.create(
+                job_type=job_type,
+                bucket=bucket,
+                **{field: max(delta, 0) for field, delta in deltas.items()}
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        rows.update(updated_at=timezone.now(), **updates)
+
+
+def record_match_created(job_type, score):
+    _adjust(job_type, score_bucket(score), match_count=1, score_sum=score)
+
+
+def record_match_rescored(job_type, old_score, new_score, applied):
+    old_bucket, new_bucket = score_bucket(old_score), score_bucket(new_score)
+    if old_bucket == new_bucket:
+        _adjust(job_type, new_bucket, score_sum=new_score - old_score)
+        return
+    _adjust(job_type, old_bucket, match_count=-1, score_sum=-old_score, application_count=-int(applied))
+    _adjust(job_type, new_bucket, match_count=1, score_sum=new_score, application_count=int(applied))
+
+
+def record_match_deleted(job_type, score, applied):
+    _adjust(job_type, score_bucket(score), match_count=-1, score_sum=-score, application_count=-int(applied))
+
+
+def record_match_applied(job_type, score):
+    _adjust(job_type, score_bucket(score), application_count=1)
+
+
+def record_match_unapplied(job_type, score):
+    _adjust(job_type, score_bucket(score), application_count=-1)
+
+
+def get_matching_stats():
+    """Summarise the bucket table into the MatchingStatsView payload."""
+    buckets = list(MatchScoreBucket.objects.filter(match_count__gt=0))
+
+    total_matches = sum(b.match_count for b in buckets)
+    applications = sum(b.application_count for b in buckets)
+    score_sum = sum(b.score_sum for b in buckets)
+    high_quality_bucket = score_bucket(HIGH_QUALITY_SCORE)
+
+    matches_by_type = {}
+    histogram = [0] * BUCKET_COUNT
+    for b in buckets:
+        matches_by_type[b.job_type] = matches_by_type.get(b.job_type, 0) + b.match_count
+        histogram[b.bucket] += b.match_count
+
+    return {
+        'total_matches': total_matches,
+        'high_quality_matches': sum(b.match_count for b in buckets if b.bucket >= high_quality_bucket),
+        'applications_from_matches': applications,
+        'average_match_score': round(score_sum / total_matches, 2) if total_matches else 0,
+        'top_job_types': sorted(matches_by_type, key=matches_by_type.get, reverse=True)[:5],
+        'matching_success_rate': round(applications / total_matches * 100, 2) if total_matches else 0,
+        'score_histogram': [
+            {'min_score': i * MatchScoreBucket.BUCKET_WIDTH, 'count': count}
+            for i, count in enumerate(histogram)
+        ],
+    }
+
+
+def rebuild_matching_stats():
+    """
+    Recompute every bucket from JobMatch in one grouped query.
+
+    Also flags matches whose candidate has already applied, so the
+    incremental counts and a rebuild agree. Returns the number of rows written.
+    """
+    JobMatch.objects.filter(is_applied=False).filter(
+        Exists(JobApplication.objects.filter(profile=OuterRef('candidate'), job=OuterRef('job')))
+    ).update(is_applied=True)
+
+    rows = (
+        JobMatch.objects
+        .annotate(band=Least(
+            Cast(Floor(F('match_score') / MatchScoreBucket.BUCKET_WIDTH), IntegerField()),
+            BUCKET_COUNT - 1
+        ))
+        .values('job__job_type', 'band')
+        .annotate(
+            match_count=Count('id'),
+            score_sum=Cast(Sum('match_score'), FloatField()),
+            application_count=Count('id', filter=Q(is_applied=True)),
+        )
+        .order_by()
+    )
+    buckets = [
+        MatchScoreBucket(
+            job_type=row['job__job_type'],
+            bucket=row['band'],
+            match_count=row['match_count'],
+            score_sum=row['score_sum'] or 0.0,
+            application_count=row['application_count'],
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        MatchScoreBucket.objects.all().delete()
+        MatchScoreBucket.objects.bulk_create(buckets)
+    return len(buckets)
@@ -0,0 +1,73 @@
+"""
+Cached per-candidate match summary.
+
+The summary is computed with a single query and cached per candidate. It is
+invalidated by the code paths that write the rows it depends on (matches,
+viewed flags and preferences) via ``invalidate_match_summary``, and by the
+JobApplication receivers in matching.signals for applications, so every
+way of creating or deleting one is covered.
+"""
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, Exists, FloatField, IntegerField, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from jobs.models import JobApplication
+from profiles.models import CandidateProfile
+from .models import JobMatch, CandidatePreferences
+
+
+SUMMARY_CACHE_TIMEOUT = 10 * 60  # seconds
+
+SUMMARY_FIELDS = (
+    'total_recommendations',
+    'new_recommendations',
+    'applications_made',
+    'average_match_score',
+    'last_recommendation_date',
+    'preferences_updated',
+)
+
+
+def summary_cache_key(candidate_id):
+    return f'matching:summary:{candidate_id}'
+
+
+def _summary_annotations():
+    matches = JobMatch.objects.filter(candidate=OuterRef('pk')).order_by().values('candidate')
+    applications = JobApplication.objects.filter(profile=OuterRef('pk')).order_by().values('profile')
+    return {
+        'total_recommendations': Coalesce(
+            Subquery(matches.annotate(n=Count('id')).values('n')), Value(0), output_field=IntegerField()
+        ),
+        'new_recommendations': Coalesce(
+            Subquery(matches.annotate(n=Count('id', filter=Q(is_viewed=False))).values('n')),
+            Value(0), output_field=IntegerField()
+        ),
+        'average_match_score': Coalesce(
+            Subquery(matches.annotate(a=Avg('match_score')).values('a')), Value(0.0), output_field=FloatField()
+        ),
+        'last_recommendation_date': Subquery(matches.annotate(m=Max('created_at')).values('m')),
+        'applications_made': Coalesce(
+            Subquery(applications.annotate(n=Count('id')).values('n')), Value(0), output_field=IntegerField()
+        ),
+        'preferences_updated': Exists(CandidatePreferences.objects.filter(candidate=OuterRef('pk'))),
+    }
+
+
+def get_candidate_match_summary(profile):
+    """Return the summary figures for ``profile``, from cache when possible."""
+    key = summary_cache_key(profile.id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = CandidateProfile.objects.filter(pk=profile.pk).annotate(
+            **_summary_annotations()
+        ).values(*SUMMARY_FIELDS).get()
+        summary['average_match_score'] = round(summary['average_match_score'], 2)
+        cache.set(key, summary, SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_match_summary(*candidate_ids):
+    """Drop cached summaries; call after writing a candidate's matches, applications or preferences."""
+    cache.delete_many([summary_cache_key(candidate_id) for candidate_id in candidate_ids])
@@ -0,0 +1,42 @@
+"""
+Celery tasks for the matching app.
+"""
+
+from celery import shared_task
+
+
+@shared_task
+def flush_recommendation_interactions():
+    """Apply buffered viewed flags and recommendation feedback in bulk."""
+    from .write_behind import flush_viewed, flush_feedback
+    
+    viewed = flush_viewed()
+    feedback = flush_feedback()
+    
+    return f"Flushed {viewed} viewed flags and {feedback} feedback entries"
+
+
+@shared_task
+def persist_search_events():
+    """Write queued search analytics events to the SearchEvent table."""
+    from .search_events import persist_queued_events
+    
+    written = persist_queued_events()
+    
+    return f"Persisted {written} search events"
+
+
+@shared_task
+def compact_search_events():
+    """Roll persisted search events into SearchHistory summaries."""
+    from .search_events import compact_search_events as compact
+    
+    searches = events = 0
+    while True:
+        written, consumed = compact()
+        searches += written
+        events += consumed
+        if not consumed:
+            break
+    
+    return f"Compacted {events} search events into {searches} search histories"
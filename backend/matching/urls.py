@@ -9,8 +9,10 @@ from .views import (
     CandidatePreferencesView,
     JobMatchListView,
     MarkJobViewedView,
+    MarkJobsViewedBatchView,
     RecommendationFeedbackView,
     SearchHistoryView,
+    SearchEventView,
     MatchingStatsView,
     AutoMatchingSettingsView,
     candidate_match_summary,
@@ -27,6 +29,7 @@ urlpatterns = [
     path('run-matching/', RunJobMatchingView.as_view(), name='run-matching'),
     path('matches/', JobMatchListView.as_view(), name='job-matches'),
     path('jobs/<int:job_id>/viewed/', MarkJobViewedView.as_view(), name='mark-job-viewed'),
+    path('jobs/viewed/', MarkJobsViewedBatchView.as_view(), name='mark-jobs-viewed'),
     
     # Candidate preferences
     path('preferences/', CandidatePreferencesView.as_view(), name='candidate-preferences'),
@@ -34,6 +37,7 @@ urlpatterns = [
     # Feedback and history
     path('feedback/', RecommendationFeedbackView.as_view(), name='recommendation-feedback'),
     path('search-history/', SearchHistoryView.as_view(), name='search-history'),
+    path('search-history/events/', SearchEventView.as_view(), name='search-events'),
     
     # Statistics and settings
     path('stats/', MatchingStatsView.as_view(), name='matching-stats'),
@@ -3,9 +3,10 @@ Views for job matching and recommendation system.
 """
 
 import json
+import uuid
 from datetime import timedelta
 from django.utils import timezone
-from django.db.models import Q, Avg, Count, F
+from django.db.models import Q, F
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status, filters
 from rest_framework.decorators import api_view, permission_classes
@@ -22,8 +23,14 @@ from .serializers import (
     SearchHistorySerializer, RecommendationFeedbackSerializer, AutoMatchingSettingsSerializer,
     JobRecommendationSerializer, MatchingStatsSerializer, CandidateMatchSummarySerializer
 )
-from jobs.models import Job, JobApplication
+from jobs.models import Job
 from profiles.models import CandidateProfile, RecruiterProfile
+from carechain.pagination import KeysetPaginationMixin, MatchScoreCursorPagination
+from carechain.throttling import RecommendationsThrottle
+from .stats import get_matching_stats
+from .summary import get_candidate_match_summary, invalidate_match_summary
+from .write_behind import queue_viewed, queue_feedback
+from .search_events import queue_event, SEARCH_PAYLOAD_FIELDS
 
 
 class JobRecommendationsView(APIView):
@@ -31,6 +38,7 @@ class JobRecommendationsView(APIView):
     
     permission_classes = [permissions.AllowAny]  # Temporarily open for debugging
     authentication_classes = []  # Disable authentication for debugging
+    throttle_classes = [RecommendationsThrottle]
     
     def get(self, request):
         """Get job recommendations for the authenticated candidate."""
@@ -175,6 +183,8 @@ class CandidatePreferencesView(APIView):
             preferences, created = CandidatePreferences.objects.get_or_create(
                 candidate=candidate_profile
             )
+            if created:
+                invalidate_match_summary(candidate_profile.id)
             serializer = CandidatePreferencesSerializer(preferences)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except CandidateProfile.DoesNotExist:
@@ -200,6 +210,7 @@ class CandidatePreferencesView(APIView):
             serializer = CandidatePreferencesSerializer(preferences, data=request.data, partial=True)
             if serializer.is_valid():
                 serializer.save()
+                invalidate_match_summary(candidate_profile.id)
                 
                 # Trigger new matching after preferences update
                 from .matching_algorithm import JobMatchingEngine
@@ -216,10 +227,11 @@ class CandidatePreferencesView(APIView):
             )
 
 
-class JobMatchListView(generics.ListAPIView):
+class JobMatchListView(KeysetPaginationMixin, generics.ListAPIView):
     """View for listing job matches."""
     
     serializer_class = JobMatchSerializer
+    cursor_pagination_class = MatchScoreCursorPagination
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['is_viewed', 'is_applied', 'is_recommended']
@@ -257,25 +269,55 @@ class MarkJobViewedView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        try:
-            candidate_profile = CandidateProfile.objects.get(user=request.user)
-            job_match = JobMatch.objects.get(
-                candidate=candidate_profile,
-                job_id=job_id
+        candidate_profile = get_object_or_404(CandidateProfile, user=request.user)
+        # Applied in bulk by matching.tasks.flush_recommendation_interactions
+        queue_viewed(candidate_profile.id, [job_id])
+        
+        return Response({
+            "message": "Job marked as viewed"
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class MarkJobsViewedBatchView(APIView):
+    """View for marking many job recommendations as viewed at once."""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    max_job_ids = 500
+    
+    def post(self, request):
+        """Mark every job in ``job_ids`` as viewed by the candidate."""
+        if not request.user.is_candidate:
+            return Response(
+                {"error": "Only candidates can mark jobs as viewed"}, 
+                status=status.HTTP_403_FORBIDDEN
             )
-            
-            job_match.is_viewed = True
-            job_match.save()
-            
-            return Response({
-                "message": "Job marked as viewed"
-            }, status=status.HTTP_200_OK)
-            
-        except JobMatch.DoesNotExist:
+        
+        job_ids = request.data.get('job_ids')
+        if not isinstance(job_ids, list) or not job_ids:
             return Response(
-                {"error": "Job match not found"}, 
-                status=status.HTTP_404_NOT_FOUND
+                {"error": "job_ids must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(job_ids) > self.max_job_ids:
+            return Response(
+                {"error": f"At most {self.max_job_ids} job_ids per request"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            job_ids = {int(job_id) for job_id in job_ids}
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "job_ids must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
             )
+        
+        candidate_profile = get_object_or_404(CandidateProfile, user=request.user)
+        queue_viewed(candidate_profile.id, job_ids)
+        
+        return Response({
+            "message": "Jobs marked as viewed",
+            "count": len(job_ids)
+        }, status=status.HTTP_202_ACCEPTED)
 
 
 class RecommendationFeedbackView(generics.CreateAPIView):
@@ -284,13 +326,36 @@ class RecommendationFeedbackView(generics.CreateAPIView):
     serializer_class = RecommendationFeedbackSerializer
     permission_classes = [permissions.IsAuthenticated]
     
-    def perform_create(self, serializer):
-        """Create feedback and update matching algorithm."""
-        if not self.request.user.is_candidate:
-            raise PermissionError("Only candidates can provide feedback")
+    def create(self, request, *args, **kwargs):
+        """Validate feedback and buffer it for a bulk write."""
+        if not request.user.is_candidate:
+            return Response(
+                {"error": "Only candidates can provide feedback"},
+                status=status.HTTP_403_FORBIDDEN
+            )
         
-        candidate_profile = CandidateProfile.objects.get(user=self.request.user)
-        serializer.save(candidate=candidate_profile)
+        candidate_profile = get_object_or_404(CandidateProfile, user=request.user)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        data = serializer.validated_data
+        # Applied in bulk by matching.tasks.flush_recommendation_interactions
+        queue_feedback(
+            candidate_profile.id,
+            data['job'].id,
+            job_match_id=data['job_match'].id,
+            feedback_rating=data['feedback_rating'],
+            feedback_comments=data.get('feedback_comments', ''),
+            is_interested=data.get('is_interested', False),
+            will_apply=data.get('will_apply', False),
+            reasons_not_interested=data.get('reasons_not_interested', []),
+        )
+        
+        return Response({
+            "message": "Feedback received",
+            "job": data['job'].id,
+            "feedback_rating": data['feedback_rating']
+        }, status=status.HTTP_202_ACCEPTED)
 
 
 class SearchHistoryView(generics.ListCreateAPIView):
@@ -307,13 +372,81 @@ class SearchHistoryView(generics.ListCreateAPIView):
         candidate_profile = CandidateProfile.objects.get(user=self.request.user)
         return SearchHistory.objects.filter(candidate=candidate_profile)
     
-    def perform_create(self, serializer):
-        """Create search history record."""
-        if not self.request.user.is_candidate:
-            raise PermissionError("Only candidates can create search history")
+    def create(self, request, *args, **kwargs):
+        """Queue a search event; it reaches SearchHistory after compaction."""
+        if not request.user.is_candidate:
+            return Response(
+                {"error": "Only candidates can create search history"},
+                status=status.HTTP_403_FORBIDDEN
+            )
         
-        candidate_profile = CandidateProfile.objects.get(user=self.request.user)
-        serializer.save(candidate=candidate_profile)
+        candidate_profile = get_object_or_404(CandidateProfile, user=request.user)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        search_id = request.data.get('search_id')
+        try:
+            search_id = uuid.UUID(str(search_id)) if search_id else uuid.uuid4()
+        except ValueError:
+            return Response(
+                {"error": "search_id must be a UUID"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        payload = {
+            field: serializer.validated_data[field]
+            for field in SEARCH_PAYLOAD_FIELDS
+            if field in serializer.validated_data
+        }
+        queue_event(candidate_profile.id, search_id, 'search', payload=payload)
+        
+        return Response({"search_id": str(search_id)}, status=status.HTTP_202_ACCEPTED)
+
+
+class SearchEventView(APIView):
+    """View for recording clicks and applications that follow a search."""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    max_events = 100
+    
+    def post(self, request):
+        """Queue one event, or a list of them under ``events``."""
+        if not request.user.is_candidate:
+            return Response(
+                {"error": "Only candidates can record search events"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        events = request.data.get('events', [request.data])
+        if not isinstance(events, list) or not events or len(events) > self.max_events:
+            return Response(
+                {"error": f"events must be a list of 1 to {self.max_events} events"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        parsed = []
+        for index, event in enumerate(events):
+            try:
+                search_id = uuid.UUID(str(event['search_id']))
+                job_id = int(event['job_id'])
+                event_type = event['event_type']
+            except (KeyError, TypeError, ValueError):
+                return Response(
+                    {"error": f"Event {index} needs search_id, event_type and job_id"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if event_type not in ('click', 'apply'):
+                return Response(
+                    {"error": f"Event {index}: event_type must be 'click' or 'apply'"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            parsed.append((search_id, event_type, job_id))
+        
+        candidate_profile = get_object_or_404(CandidateProfile, user=request.user)
+        for search_id, event_type, job_id in parsed:
+            queue_event(candidate_profile.id, search_id, event_type, job_id=job_id)
+        
+        return Response({"queued": len(parsed)}, status=status.HTTP_202_ACCEPTED)
 
 
 class MatchingStatsView(APIView):
@@ -329,39 +462,8 @@ class MatchingStatsView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Calculate statistics
-        total_matches = JobMatch.objects.count()
-        high_quality_matches = JobMatch.objects.filter(match_score__gte=80).count()
-        
-        # Get applications from matches
-        applications_from_matches = JobApplication.objects.filter(
-            job__in=JobMatch.objects.values('job')
-        ).count()
-        
-        # Average match score
-        avg_match_score = JobMatch.objects.aggregate(
-            avg_score=Avg('match_score')
-        )['avg_score'] or 0
-        
-        # Top job types
-        top_job_types = list(
-            JobMatch.objects.values('job__job_type')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:5]
-            .values_list('job__job_type', flat=True)
-        )
-        
-        # Success rate (applications / matches)
-        success_rate = (applications_from_matches / total_matches * 100) if total_matches > 0 else 0
-        
-        stats = {
-            'total_matches': total_matches,
-            'high_quality_matches': high_quality_matches,
-            'applications_from_matches': applications_from_matches,
-            'average_match_score': round(avg_match_score, 2),
-            'top_job_types': top_job_types,
-            'matching_success_rate': round(success_rate, 2)
-        }
+        # Running totals maintained by matching.signals
+        stats = get_matching_stats()
         
         serializer = MatchingStatsSerializer(stats)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -402,41 +504,9 @@ def candidate_match_summary(request):
     try:
         candidate_profile = CandidateProfile.objects.get(user=request.user)
         
-        # Get match statistics
-        matches = JobMatch.objects.filter(candidate=candidate_profile)
-        total_recommendations = matches.count()
-        new_recommendations = matches.filter(is_viewed=False).count()
-        
-        # Get applications made
-        applications_made = JobApplication.objects.filter(
-            candidate=candidate_profile
-        ).count()
-        
-        # Average match score
-        avg_match_score = matches.aggregate(
-            avg_score=Avg('match_score')
-        )['avg_score'] or 0
-        
-        # Last recommendation date
-        last_recommendation = matches.order_by('-created_at').first()
-        last_recommendation_date = last_recommendation.created_at if last_recommendation else None
-        
-        # Check if preferences are updated
-        try:
-            preferences = CandidatePreferences.objects.get(candidate=candidate_profile)
-            preferences_updated = True
-        except CandidatePreferences.DoesNotExist:
-            preferences_updated = False
-        
-        summary = {
-            'candidate': candidate_profile,
-            'total_recommendations': total_recommendations,
-            'new_recommendations': new_recommendations,
-            'applications_made': applications_made,
-            'average_match_score': round(avg_match_score, 2),
-            'last_recommendation_date': last_recommendation_date,
-            'preferences_updated': preferences_updated
-        }
+        # One query on a cache miss; invalidated by the writers of matches and applications
+        summary = get_candidate_match_summary(candidate_profile)
+        summary = {'candidate': candidate_profile, **summary}
         
         serializer = CandidateMatchSummarySerializer(summary)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,192 @@
+"""
+Write-behind buffer for recommendation interactions.
+
+Scrolling through recommendations marks many matches as viewed and may
+leave feedback on several of them. Instead of one small transaction per
+interaction, requests record them in Redis and a periodic task
+(matching.tasks.flush_recommendation_interactions) applies them in bulk:
+
+* viewed flags go into a set of ``candidate_id:job_id`` pairs, so repeated
+  views of the same match collapse into one update;
+* feedback goes into a hash keyed by ``candidate_id:job_id``, so only the
+  latest feedback per job is written, matching the model's unique
+  constraint.
+
+If Redis is unavailable the interaction is written straight to the database.
+"""
+
+import json
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+from redis.exceptions import RedisError, ResponseError
+
+from carechain.counters import get_connection
+from .models import JobMatch, RecommendationFeedback
+from .summary import invalidate_match_summary
+
+
+VIEWED_KEY = 'matching:pending:viewed'
+FEEDBACK_KEY = 'matching:pending:feedback'
+
+FEEDBACK_FIELDS = (
+    'job_match_id', 'feedback_rating', 'feedback_comments',
+    'is_interested', 'will_apply', 'reasons_not_interested',
+)
+FEEDBACK_UPDATE_FIELDS = [
+    'job_match', 'feedback_rating', 'feedback_comments',
+    'is_interested', 'will_apply', 'reasons_not_interested',
+]
+
+
+def queue_viewed(candidate_id, job_ids):
+    """Buffer viewed flags for the candidate's matches on ``job_ids``."""
+    job_ids = set(job_ids)
+    if not job_ids:
+        return
+    try:
+        get_connection().sadd(VIEWED_KEY, *[f'{candidate_id}:{job_id}' for job_id in job_ids])
+    except RedisError:
+        _apply_viewed({candidate_id: job_ids})
+
+
+def queue_feedback(candidate_id, job_id, **fields):
+    """Buffer feedback on one recommendation; later feedback on the same job replaces it."""
+    payload = {field: fields.get(field) for field in FEEDBACK_FIELDS}
+    try:
+        get_connection().hset(FEEDBACK_KEY, f'{candidate_id}:{job_id}', json.dumps(payload))
+    except RedisError:
+        _apply_feedback({(candidate_id, job_id): payload})
+
+
+def _take(key):
+    """
+    Atomically move the buffer at ``key`` aside and return its temporary
+    name, or None when there is nothing buffered. Requests keep writing to
+    a fresh ``key`` while the old contents are flushed.
+    """
+    claimed = f'{key}:flushing:{uuid.uuid4().hex}'
+    try:
+        get_connection().rename(key, claimed)
+    except ResponseError:
+        # No such key: nothing was buffered since the last flush
+        return None
+    return claimed
+
+
+# Put a claimed feedback hash back after a failed flush. KEYS: live hash,
+# claimed hash. Feedback queued since the claim is newer and wins.
+RESTORE_FEEDBACK_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[2])
+for i = 1, #entries, 2 do
+    redis.call('HSETNX', KEYS[1], entries[i], entries[i + 1])
+end
+redis.call('DEL', KEYS[2])
+return #entries / 2
+"""
+
+
+def _restore_viewed(claimed):
+    """Merge a claimed viewed set back into the live buffer."""
+    pipe = get_connection().pipeline()
+    pipe.sunionstore(VIEWED_KEY, [VIEWED_KEY, claimed])
+    pipe.delete(claimed)
+    pipe.execute()
+
+
+def _restore_feedback(claimed):
+    """Merge a claimed feedback hash back into the live buffer."""
+    get_connection().eval(RESTORE_FEEDBACK_SCRIPT, 2, FEEDBACK_KEY, claimed)
+
+
+def _parse_pair(member):
+    if isinstance(member, bytes):
+        member = member.decode()
+    candidate_id, job_id = member.split(':')
+    return int(candidate_id), int(job_id)
+
+
+def _apply_viewed(job_ids_by_candidate):
+    """Flag the given matches as viewed with one bulk_update. Returns the number changed."""
+    wanted = {
+        (candidate_id, job_id)
+        for candidate_id, job_ids in job_ids_by_candidate.items()
+        for job_id in job_ids
+    }
+    job_ids = {job_id for _, job_id in wanted}
+    now = timezone.now()
+    matches = [
+        match for match in JobMatch.objects.filter(
+            candidate_id__in=job_ids_by_candidate.keys(), job_id__in=job_ids, is_viewed=False
+        ).only('id', 'candidate_id', 'job_id')
+        if (match.candidate_id, match.job_id) in wanted
+    ]
+    for match in matches:
+        match.is_viewed = True
+        match.updated_at = now
+    JobMatch.objects.bulk_update(matches, ['is_viewed', 'updated_at'], batch_size=1000)
+    invalidate_match_summary(*{match.candidate_id for match in matches})
+    return len(matches)
+
+
+def _apply_feedback(payloads):
+    """Upsert feedback keyed by (candidate_id, job_id) with one bulk_create."""
+    # Matches are deleted along with their job or candidate; drop feedback on those
+    existing_match_ids = set(
+        JobMatch.objects.filter(
+            id__in=[payload['job_match_id'] for payload in payloads.values()]
+        ).values_list('id', flat=True)
+    )
+    rows = [
+        RecommendationFeedback(candidate_id=candidate_id, job_id=job_id, **payload)
+        for (candidate_id, job_id), payload in payloads.items()
+        if payload['job_match_id'] in existing_match_ids
+    ]
+    RecommendationFeedback.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['candidate', 'job'],
+        update_fields=FEEDBACK_UPDATE_FIELDS,
+    )
+    return len(rows)
+
+
+def flush_viewed():
+    claimed = _take(VIEWED_KEY)
+    if claimed is None:
+        return 0
+    conn = get_connection()
+    job_ids_by_candidate = {}
+    for member in conn.smembers(claimed):
+        candidate_id, job_id = _parse_pair(member)
+        job_ids_by_candidate.setdefault(candidate_id, set()).add(job_id)
+    try:
+        with transaction.atomic():
+            updated = _apply_viewed(job_ids_by_candidate)
+    except Exception:
+        # Keep the flags for the next flush instead of orphaning the claim
+        _restore_viewed(claimed)
+        raise
+    conn.delete(claimed)
+    return updated
+
+
+def flush_feedback():
+    claimed = _take(FEEDBACK_KEY)
+    if claimed is None:
+        return 0
+    conn = get_connection()
+    payloads = {
+        _parse_pair(member): json.loads(payload)
+        for member, payload in conn.hgetall(claimed).items()
+    }
+    try:
+        with transaction.atomic():
+            written = _apply_feedback(payloads)
+    except Exception:
+        _restore_feedback(claimed)
+        raise
+    conn.delete(claimed)
+    return written
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_current_month_usage(apps, schema_editor):
+    """Carry this month's counts over from the profile columns being removed."""
+    CandidateProfile = apps.get_model('profiles', 'CandidateProfile')
+    CandidateQuotaUsage = apps.get_model('profiles', 'CandidateQuotaUsage')
+    period = timezone.now().date().replace(day=1)
+
+    rows = []
+    for quota, field in (('applications', 'monthly_application_count'), ('job_views', 'monthly_job_viewed_count')):
+        for candidate_id, used in CandidateProfile.objects.filter(**{f'{field}__gt': 0}).values_list('id', field).iterator():
+            rows.append(CandidateQuotaUsage(candidate_id=candidate_id, quota=quota, period=period, used=used))
+    CandidateQuotaUsage.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0007_candidateverification_hospitalverification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateQuotaUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quota', models.CharField(choices=[('applications', 'Applications'), ('job_views', 'Job Views')], max_length=20)),
+                ('period', models.DateField(help_text='First day of the month the usage belongs to')),
+                ('used', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quota_usage', to='profiles.candidateprofile')),
+            ],
+            options={
+                'unique_together': {('candidate', 'quota', 'period')},
+            },
+        ),
+        migrations.RunPython(copy_current_month_usage, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='candidateprofile',
+            name='monthly_application_count',
+        ),
+        migrations.RemoveField(
+            model_name='candidateprofile',
+            name='monthly_job_viewed_count',
+        ),
+    ]
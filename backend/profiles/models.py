@@ -68,11 +68,9 @@ class CandidateProfile(models.Model):
     )
     rejection_reason = models.TextField(null=True, blank=True)
     
-    # Application quota tracking
+    # Application quota tracking (usage per month lives in CandidateQuotaUsage)
     experience_years = models.PositiveIntegerField(default=0, help_text="Years of industrial experience")
-    monthly_application_count = models.PositiveIntegerField(default=0)
     monthly_application_quota = models.PositiveIntegerField(default=50)
-    monthly_job_viewed_count = models.PositiveIntegerField(default=0)
     monthly_job_viewed_quota = models.PositiveIntegerField(default=100)
     
     created_at = models.DateTimeField(auto_now_add=True)
@@ -133,6 +131,36 @@ class JobPreference(models.Model):
         return f"Job Preference for {self.profile}"
 
 
+class CandidateQuotaUsage(models.Model):
+    """
+    How much of one monthly quota a candidate has used.
+    
+    Each month gets its own row, so usage starts from zero on the first
+    request of a new month without any global reset.
+    """
+    
+    QUOTA_CHOICES = (
+        ('applications', 'Applications'),
+        ('job_views', 'Job Views'),
+    )
+    
+    candidate = models.ForeignKey(
+        CandidateProfile,
+        on_delete=models.CASCADE,
+        related_name='quota_usage'
+    )
+    quota = models.CharField(max_length=20, choices=QUOTA_CHOICES)
+    period = models.DateField(help_text="First day of the month the usage belongs to")
+    used = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('candidate', 'quota', 'period')
+    
+    def __str__(self):
+        return f"{self.candidate} - {self.quota} {self.period:%Y-%m}: {self.used}"
+
+
 class Hospital(models.Model):
     """Minimal model for hospital login/registration."""
     name = models.CharField(max_length=255)
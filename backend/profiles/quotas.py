@@ -0,0 +1,149 @@
+"""
+Atomic monthly quotas for candidate profiles.
+"""
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from carechain.counters import (
+    PERIOD_KEY_TTL, current_period, decrement_counter, get_connection,
+    increment_with_limit, period_start, raise_counter
+)
+from .models import CandidateProfile, CandidateQuotaUsage
+
+
+class MonthlyQuota:
+    """
+    A per-candidate monthly counter capped at a quota stored on the profile.
+
+    Usage is counted in Redis under a key that includes the month, with an
+    increment-with-limit script, so concurrent requests can never push a
+    candidate past the quota and nothing is written to Postgres on the
+    request path. A new month simply starts a new key (seeded from
+    CandidateQuotaUsage on first access), so there is no global reset.
+    Changed counters are tracked in a dirty set and upserted into
+    CandidateQuotaUsage in bulk by ``flush``. If Redis is unavailable the
+    quota falls back to a conditional ``UPDATE ... WHERE used < quota`` on
+    the usage row; ``flush`` never lowers a stored count, and raises the
+    Redis counter to it, so usage recorded during an outage is kept.
+    """
+
+    def __init__(self, name, quota_field):
+        self.name = name
+        self.quota_field = quota_field
+
+    def counter_key(self, period, candidate_id):
+        return f'quota:{self.name}:{period}:{candidate_id}'
+
+    def dirty_key(self, period):
+        return f'quota:{self.name}:dirty:{period}'
+
+    def consume(self, profile):
+        """
+        Use one unit of the candidate's quota for the current month.
+
+        Returns a ``(used, allowed)`` tuple; ``allowed`` is False when the
+        quota was already exhausted and nothing was counted.
+        """
+        period = current_period()
+        try:
+            used, allowed = increment_with_limit(
+                self.counter_key(period, profile.id),
+                getattr(profile, self.quota_field),
+                PERIOD_KEY_TTL,
+                seed=lambda: self._stored_usage(profile.id, period),
+            )
+            if allowed:
+                self._mark_dirty(period, profile.id)
+            return used, allowed
+        except RedisError:
+            return self._consume_in_database(profile, period)
+
+    def release(self, profile):
+        """Give back one unit, e.g. when the action that used it failed."""
+        period = current_period()
+        try:
+            decrement_counter(self.counter_key(period, profile.id))
+            self._mark_dirty(period, profile.id)
+        except RedisError:
+            CandidateQuotaUsage.objects.filter(
+                candidate_id=profile.id, quota=self.name,
+                period=period_start(period), used__gt=0
+            ).update(used=F('used') - 1, updated_at=timezone.now())
+
+    def flush(self, period, batch_size=500):
+        """Upsert the period's Redis counters into CandidateQuotaUsage. Returns the rows written."""
+        conn = get_connection()
+        written = 0
+        while True:
+            candidate_ids = conn.spop(self.dirty_key(period), batch_size)
+            if not candidate_ids:
+                break
+            try:
+                written += self._flush_batch(period, [int(candidate_id) for candidate_id in candidate_ids])
+            except Exception:
+                # Keep them dirty for the next flush
+                conn.sadd(self.dirty_key(period), *candidate_ids)
+                raise
+        return written
+
+    def _flush_batch(self, period, candidate_ids):
+        conn = get_connection()
+        month = period_start(period)
+        counts = conn.mget([self.counter_key(period, cid) for cid in candidate_ids])
+        # Skip candidates deleted since they used the quota
+        existing_ids = set(
+            CandidateProfile.objects.filter(id__in=candidate_ids).values_list('id', flat=True)
+        )
+        with transaction.atomic():
+            # Usage counted in the database while Redis was down may be ahead
+            # of the counter; lock it so the fallback cannot move it meanwhile
+            stored = dict(
+                CandidateQuotaUsage.objects.select_for_update().filter(
+                    candidate_id__in=candidate_ids, quota=self.name, period=month
+                ).values_list('candidate_id', 'used')
+            )
+            rows = []
+            for cid, count in zip(candidate_ids, counts):
+                if count is None or cid not in existing_ids:
+                    continue
+                used = int(count)
+                if stored.get(cid, 0) > used:
+                    used = raise_counter(self.counter_key(period, cid), stored[cid], PERIOD_KEY_TTL)
+                rows.append(CandidateQuotaUsage(candidate_id=cid, quota=self.name, period=month, used=used))
+            CandidateQuotaUsage.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['candidate', 'quota', 'period'],
+                update_fields=['used', 'updated_at'],
+            )
+        return len(rows)
+
+    def _stored_usage(self, candidate_id, period):
+        return CandidateQuotaUsage.objects.filter(
+            candidate_id=candidate_id, quota=self.name, period=period_start(period)
+        ).values_list('used', flat=True).first() or 0
+
+    def _mark_dirty(self, period, candidate_id):
+        pipe = get_connection().pipeline()
+        pipe.sadd(self.dirty_key(period), candidate_id)
+        pipe.expire(self.dirty_key(period), PERIOD_KEY_TTL)
+        pipe.execute()
+
+    def _consume_in_database(self, profile, period):
+        usage, _ = CandidateQuotaUsage.objects.get_or_create(
+            candidate_id=profile.id, quota=self.name, period=period_start(period)
+        )
+        allowed = bool(
+            CandidateQuotaUsage.objects.filter(
+                pk=usage.pk, used__lt=getattr(profile, self.quota_field)
+            ).update(used=F('used') + 1, updated_at=timezone.now())
+        )
+        usage.refresh_from_db(fields=['used'])
+        return usage.used, allowed
+
+
+APPLICATION_QUOTA = MonthlyQuota('applications', 'monthly_application_quota')
+JOB_VIEW_QUOTA = MonthlyQuota('job_views', 'monthly_job_viewed_quota')